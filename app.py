@@ -1,43 +1,70 @@
 import os
 import json
+import logging
 import re
 from dotenv import load_dotenv
 import sys
 import traceback
-import PyPDF2
-import requests
+import uuid
 from datetime import datetime  # Fixed: Use this instead of import datetime
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, current_app, Response
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, current_app, Response, make_response, session
 from flask_login import login_required, current_user, LoginManager, login_user, logout_user, UserMixin
 from werkzeug.utils import secure_filename
-from sqlalchemy import text
+from sqlalchemy import func, text
+from sqlalchemy.orm import defer
 from jinja2 import ChoiceLoader, FileSystemLoader
-from flask_migrate import Migrate
 from werkzeug.security import generate_password_hash, check_password_hash
 from flask_sqlalchemy import SQLAlchemy
 from local_config import NARRETEX_API_URL, check_environment, LOCAL_DATABASE_URL, DEVELOPMENT_MODE
+from course_catalog import (FACETS, CatalogJSONProvider, LEVEL_ADVANCED, LEVEL_BEGINNER, LEVEL_INTERMEDIATE,
+                            get_catalog)
+from quiz_cache import QuizDefinitionCache
+from search_cache import SearchCache
+from skill_aliases import get_aliases
+from quiz_jobs import CLAIM_LEASE, QuizJobManager
+from pagination import InvalidCursor, keyset_page, parse_page_size
+from startup import StartupTimer, ensure_schema, get_boot_mode, lazy_import, running_from_cli
+import http_client
+import log_setup
+import metrics
+import profiler
+import query_monitor
+import suggest
+import tracing
+from query_monitor import budgeted
+from tracing import span
 
-load_dotenv()
+logger = logging.getLogger(__name__)
 
-# Global helper to load course catalog for use by functions outside create_app
-def load_course_catalog():
-    try:
-        catalog_path = os.path.join(os.path.dirname(__file__), 'static', 'data', 'course_catalog.json')
-        with open(catalog_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except Exception:
-        return {'categories': []}
-    
+# Heavy modules are only loaded on first use to keep worker boot fast
+PyPDF2 = lazy_import('PyPDF2')
+
+load_dotenv()
 
 # Production detection
 is_production = os.environ.get('RENDER', False) or os.environ.get('FLASK_ENV') == 'production'
 
 # API configurations
 GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY')
-GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1/models/gemini-2.0-flash:generateContent"
+GEMINI_API_URL = os.environ.get("GEMINI_API_URL", "https://generativelanguage.googleapis.com/v1/models/gemini-2.0-flash:generateContent")
 QUIZ_API_BASE_URL = os.environ.get('QUIZ_API_BASE_URL', 'http://localhost:8081')
 QUIZ_API_ACCESS_TOKEN = os.environ.get('QUIZ_API_ACCESS_TOKEN', 'kJ9mP2vL8xQ5nR3tY7wZ6cB4dF2gH8jK9lM3nP5qR7sT2uV6wX8yZ9aB3cD5eF7gH2iJ4kL6mN8oP9qR2sT4uV6wX8yZ1aB3cD5eF7gH9iJ2kL')
 
+# Maximum number of courses accepted by /enroll/bulk
+MAX_BULK_ENROLL = 100
+
+# Quiz attempts shown per page on the course page
+COURSE_ATTEMPTS_PAGE_SIZE = 5
+
+# Quiz definitions are immutable, so they are cached for the life of the worker
+quiz_definition_cache = QuizDefinitionCache.from_env()
+
+# Repeated searches reuse results until the catalog or alias file changes
+search_cache = SearchCache.from_env()
+
+# Quiz generation runs off the request thread, one in-flight job per course
+quiz_jobs = QuizJobManager()
+
 def get_url_for(*args, **kwargs):
     """Wrapper around Flask's url_for function"""
     from flask import url_for
@@ -45,7 +72,7 @@ def get_url_for(*args, **kwargs):
     
 
 # Import models after db is defined
-from models import Company, Student, Category, ContentPage, Course, CourseContentPage, UserProfile, SkillsTownCourse, CourseDetail, CourseQuiz, CourseQuizAttempt, UserCourse, db
+from models import Company, Student, Category, ContentPage, Course, CourseContentPage, UserProfile, SkillsTownCourse, CourseDetail, CourseQuiz, CourseQuizAttempt, QuizGeneration, UserCourse, db, SCHEMA_VERSION
 
 def get_quiz_api_headers():
     return {
@@ -71,18 +98,100 @@ def generate_podcast_for_course(course_name, course_description):
 def get_detailed_course_info(course_name):
     """
     Get detailed course information from the course catalog
+    
+    Returns the shared CourseRecord for the course, or None if it is not listed.
     """
-    try:
-        catalog = load_course_catalog()
-        for category in catalog.get('categories', []):
-            for course in category.get('courses', []):
-                if course.get('name', '').lower() == course_name.lower():
-                    return course
-        return {}
-        
-    except Exception as e:
-        print(f"Error getting course info: {e}")
-        return {}
+    return get_catalog().find(course_name)
+
+
+def search_courses(query, catalog=None):
+    """Search the catalog; returns SearchResult objects that reference shared records"""
+    if catalog is None: 
+        catalog = get_catalog()
+    return catalog.search(query)
+
+
+def find_ready_quiz(user_course_id):
+    """
+    Return the newest quiz for a course that has not been attempted yet, if any
+    """
+    return CourseQuiz.query.filter(
+        CourseQuiz.user_course_id == user_course_id,
+        ~CourseQuiz.attempts.any()
+    ).order_by(CourseQuiz.id.desc()).first()
+
+
+def create_course_quiz(user_course_id, user_id):
+    """
+    Ask the quiz API for a new quiz on a course and record it.
+    
+    Runs inside an app context but outside any request, so the user is passed
+    by id. Returns the quiz summary; raises RuntimeError if the API fails.
+    """
+    course = UserCourse.query.filter_by(id=user_course_id, user_id=user_id).first()
+    if not course:
+        raise RuntimeError('Course not found or not authorized')
+    student = db.session.get(Student, user_id)
+    
+    # Get or create quiz UUID for the user
+    quiz_user_uuid = student.get_quiz_uuid()
+    
+    # Get course details to send to quiz API
+    course_details = CourseDetail.query.filter_by(user_course_id=user_course_id).first()
+    description = course_details.description if course_details else f"Learn {course.course_name} with practical examples and real-world applications."
+    
+    # Get course info from catalog for more details
+    catalog_info = get_detailed_course_info(course.course_name)
+    
+    # Prepare the request payload for quiz API
+    quiz_payload = {
+        "user_id": quiz_user_uuid,
+        "course": {
+            "name": course.course_name,
+            "description": description,
+            "duration"
+            "level": catalog_info.level if catalog_info else 'Intermediate',
+            "skills": list(catalog_info.skills) if catalog_info else [],
+            "projects": list(catalog_info.projects) if catalog_info else [],
+            "career_paths": list(catalog_info.career_paths) if catalog_info else []
+        }
+    }
+    
+    # Lazy %-formatting: the payload is only rendered if DEBUG is enabled and sampled
+    logger.debug("Sending quiz payload: %s", quiz_payload)
+    
+    # Call the quiz API to create quiz
+    with span('quiz_api'):
+        response = http_client.post(
+            f"{QUIZ_API_BASE_URL}/quiz/create-ai-from-course",
+            service='quiz_api',
+            json=quiz_payload,
+            headers=get_quiz_api_headers(),
+            timeout=30
+        )
+    
+    logger.debug("Quiz API response: %s - %s", response.status_code, response.text)
+    
+    if response.status_code != 201:
+        # Keep a newly assigned quiz UUID even when generation fails
+        db.session.commit()
+        raise RuntimeError(f'Quiz API error: {response.status_code} - {response.text}')
+    
+    quiz_data = response.json()
+    db.session.add(CourseQuiz(
+        user_course_id=course.id,
+        quiz_api_id=quiz_data['quizId'],
+        quiz_title=quiz_data['title']
+    ))
+    # One commit persists a newly assigned quiz UUID together with the quiz
+    db.session.commit()
+    
+    return {
+        'quiz_id': quiz_data['quizId'],
+        'title': quiz_data['title'],
+        'description': quiz_data.get('description'),
+        'questions_count': quiz_data.get('questionsCount')
+    }
         
 
 def format_course_details(course_details):
@@ -179,12 +288,14 @@ Please provide a JSON response with: current_skills, skill_categories, experienc
     }
     
     try:
-        response = requests.post(
-            f"{GEMINI_API_URL}?key={GEMINI_API_KEY}",
-            json=payload,
-            headers={'Content-Type': 'application/json'},
-            timeout=30
-        )
+        with span('gemini'):
+            response = http_client.post(
+                f"{GEMINI_API_URL}?key={GEMINI_API_KEY}",
+                service='gemini',
+                json=payload,
+                headers={'Content-Type': 'application/json'},
+                timeout=30
+            )
         
         if response.status_code == 200:
             result = response.json()
@@ -204,6 +315,9 @@ Please provide a JSON response with: current_skills, skill_categories, experienc
 def create_app(config_name=None):
     global is_production
     
+    log_setup.configure_logging()
+    timer = StartupTimer()
+    
     # Check environment in development mode
     if DEVELOPMENT_MODE:
         check_environment()
@@ -214,8 +328,11 @@ def create_app(config_name=None):
         elif config_name is not None: 
             is_production = False
             
+    boot_mode = get_boot_mode(is_production)
 
     app = Flask(__name__)
+    # Catalog records in responses are serialized at the boundary, not copied up front
+    app.json = CatalogJSONProvider(app)
 
     # Templates - Fixed path resolution
     tpl_dirs = [FileSystemLoader(os.path.join(os.path.dirname(__file__), 'templates'))]
@@ -241,9 +358,26 @@ def create_app(config_name=None):
             db_url = db_url.replace('postgres://', 'postgresql://')
         app.config['SQLALCHEMY_DATABASE_URI'] = db_url or 'sqlite:///skillstown.db'
 
+    app.config['BOOT_MODE'] = boot_mode
+    app.config['QUIZ_PREGENERATE_ON_ENROLL'] = os.environ.get('QUIZ_PREGENERATE_ON_ENROLL', 'false').lower() == 'true'
+    timer.mark('config')
+
     # Initialize extensions
-    db.init_app(app)
-    migrate = Migrate(app, db)
+    with timer.phase('extensions'):
+        db.init_app(app)
+        # Flask-Migrate pulls in alembic; workers in fast mode only need it for the CLI
+        if boot_mode != 'fast' or running_from_cli():
+            from flask_migrate import Migrate
+            Migrate(app, db)
+        # Server-Timing headers and timing logs, only when REQUEST_TIMING=true
+        tracing.init_app(app)
+        metrics.init_app(app)
+        # Record/replay fixtures are loaded now so a bad setting fails the boot
+        http_client.init_from_env()
+        # Slow-query log and per-route statement budgets
+        query_monitor.init_app(app)
+        # Admin-triggered cProfile capture for PROFILE_ROUTES
+        profiler.init_app(app)
 
     @app.context_processor
     def inject(): 
@@ -254,6 +388,9 @@ def create_app(config_name=None):
 
     @app.template_filter('from_json')
     def from_json_filter(json_str):
+        # JSON columns already come back decoded; only legacy text needs parsing
+        if isinstance(json_str, (dict, list)):
+            return json_str
         try:
             return json.loads(json_str) if json_str else {}
         except:
@@ -266,49 +403,27 @@ def create_app(config_name=None):
         return quote(str(s)) if s else ''
 
     # Stats function
+    @budgeted('get_skillstown_stats')
     def get_skillstown_stats(uid):
         try:
-            total = UserCourse.query.filter_by(user_id=uid).count()
-            enrolled = UserCourse.query.filter_by(user_id=uid, status='enrolled').count()
-            in_p = UserCourse.query.filter_by(user_id=uid, status='in_progress').count()
-            comp = UserCourse.query.filter_by(user_id=uid, status='completed').count()
+            # One grouped count instead of a query per status
+            counts = dict(db.session.query(UserCourse.status, func.count(UserCourse.id))
+                          .filter(UserCourse.user_id == uid)
+                          .group_by(UserCourse.status).all())
+            total = sum(counts.values())
+            enrolled = counts.get('enrolled', 0)
+            in_p = counts.get('in_progress', 0)
+            comp = counts.get('completed', 0)
             pct = (comp/total*100) if total else 0
             return {'total':total,'enrolled':enrolled,'in_progress':in_p,'completed':comp,'completion_percentage':pct}
         except:
             return {'total':0,'enrolled':0,'in_progress':0,'completed':0,'completion_percentage':0}    # Initialize auth
     init_auth(app, get_url_for, get_skillstown_stats)
 
-    with app.app_context(): 
-        db.create_all()
+    with timer.phase('schema'), app.app_context():
+        app.config['SCHEMA_STATUS'] = ensure_schema(db, SCHEMA_VERSION, boot_mode)
 
     # Helpers
-    COURSE_CATALOG_PATH = os.path.join(os.path.dirname(__file__), 'static', 'data', 'course_catalog.json')
-    
-    def load_course_catalog():        
-        try:
-            with open(COURSE_CATALOG_PATH, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except:
-            return {'categories': []}
-    
-    def calc_score(q, t, d): 
-        return sum(3 for w in q.split() if w in t.lower()) + sum(1 for w in q.split() if w in d.lower())
-    
-    def search_courses(query, catalog=None):
-        if not catalog: 
-            catalog = load_course_catalog()
-        q = query.lower().strip()
-        res = []        
-        for cat in catalog.get('categories', []):
-            for c in cat.get('courses', []):
-                score = calc_score(q, c.get('title', ''), c.get('description', ''))
-                if score > 0:
-                    course_result = c.copy()
-                    course_result['relevance_score'] = score
-                    course_result['category'] = cat.get('name', '')
-                    res.append(course_result)
-        return sorted(res, key=lambda x: x['relevance_score'], reverse=True)
-    
     def allowed_file(fn): 
         return '.' in fn and fn.rsplit('.', 1)[1].lower() == 'pdf'
     
@@ -320,14 +435,16 @@ def create_app(config_name=None):
                 for page in reader.pages:
                     txt += page.extract_text() + '\n'
         except Exception as e:
-            print(f"Error reading PDF: {e}")
+            logger.error(f"Error reading PDF: {e}")
         return txt.strip()
 
     # Helper functions for quiz recommendations
-    def generate_course_recommendations_from_quiz(attempt, api_attempts):
-        """Generate course recommendations based on quiz performance"""
+    def generate_course_recommendations_from_quiz(attempt, api_attempts, course_name=None):
+        """Generate course recommendations based on quiz performance, the quizzed
+        course's category and skills, and the skills the quiz feedback names"""
         score = attempt.score or 0
-        catalog = load_course_catalog()
+        catalog = get_catalog()
+        improvements = attempt.feedback_improvements
         
         recommendations = {
             'remedial_courses': [],
@@ -340,21 +457,21 @@ def create_app(config_name=None):
         if score < 60:
             # Low score - recommend foundational courses
             recommendations['specific_advice'] = "Focus on strengthening your foundation in this subject area. The recommended courses will help you build core competencies."
-            recommendations['remedial_courses'] = get_foundational_courses(catalog)
+            recommendations['remedial_courses'] = catalog.recommend(LEVEL_BEGINNER, course_name, improvements)
         elif score < 80:
             # Medium score - recommend intermediate courses
             recommendations['specific_advice'] = "You have a good foundation! Continue building your skills with these intermediate courses."
-            recommendations['next_courses'] = get_intermediate_courses(catalog)
+            recommendations['next_courses'] = catalog.recommend(LEVEL_INTERMEDIATE, course_name, improvements)
         else:
             # High score - recommend advanced courses
             recommendations['specific_advice'] = "Excellent work! You're ready for advanced topics that will set you apart."
-            recommendations['advanced_courses'] = get_advanced_courses(catalog)
+            recommendations['advanced_courses'] = catalog.recommend(LEVEL_ADVANCED, course_name, improvements)
         
         return recommendations
 
     def generate_basic_recommendations_from_score(score):
         """Generate basic recommendations when API is unavailable"""
-        catalog = load_course_catalog()
+        catalog = get_catalog()
         
         recommendations = {
             'remedial_courses': [],
@@ -377,36 +494,15 @@ def create_app(config_name=None):
 
     def get_foundational_courses(catalog):
         """Get beginner/foundational courses from catalog"""
-        courses = []
-        for category in catalog.get('categories', []):
-            for course in category.get('courses', []):                
-                if course.get('level', '').lower() in ['beginner', 'basic', 'foundational']:
-                    courses.append(course)
-            if len(courses) >= 4:
-                break
-        return courses
+        return list(catalog.foundational)
 
     def get_intermediate_courses(catalog):
         """Get intermediate courses from catalog"""
-        courses = []
-        for category in catalog.get('categories', []):
-            for course in category.get('courses', []):                
-                if course.get('level', '').lower() in ['intermediate', 'medium']:
-                    courses.append(course)
-            if len(courses) >= 4:
-                break
-        return courses
+        return list(catalog.intermediate)
 
     def get_advanced_courses(catalog):
         """Get advanced courses from catalog"""
-        courses = []
-        for category in catalog.get('categories', []):
-            for course in category.get('courses', []):                
-                if course.get('level', '').lower() in ['advanced', 'expert', 'professional']:
-                    courses.append(course)
-            if len(courses) >= 4:
-                break
-        return courses
+        return list(catalog.advanced)
 
     # Routes
     @app.route('/')
@@ -491,9 +587,11 @@ def create_app(config_name=None):
                 file.save(filepath)
                 
                 # Extract text and analyze
-                cv_text = extract_text_from_pdf(filepath)
+                with span('pdf_parse'):
+                    cv_text = extract_text_from_pdf(filepath)
                 if cv_text:
-                    analysis = analyze_skills_with_gemini(cv_text)
+                    with span('skill_analysis'):
+                        analysis = analyze_skills_with_gemini(cv_text)
                     return render_template('assessment/results.html', analysis=analysis)
                 else:
                     flash('Could not extract text from PDF', 'error')
@@ -505,54 +603,131 @@ def create_app(config_name=None):
     @app.route('/search')
     def search():
         query = request.args.get('query', '')
-        results = []
+        filters = {facet: request.args.getlist(facet) for facet in FACETS if request.args.getlist(facet)}
+        catalog = get_catalog()
+        key = search_cache.key(query, filters, catalog, get_aliases())
         
-        if query:
-            catalog = load_course_catalog()
-            results = search_courses(query, catalog)
+        # The page also shows who is logged in, and pending flash messages must not be skipped by a 304
+        etag = None if '_flashes' in session else search_cache.etag(key, current_user.get_id() or '')
+        if etag and request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            results, facet_counts = search_cache.get_or_search(key, lambda: catalog.faceted_search(query, filters))
+            if not query and not filters:
+                results = []
+            response = make_response(render_template('courses/search.html', query=query, results=results,
+                                                     filters=filters, facet_counts=facet_counts))
         
-        return render_template('courses/search.html', query=query, results=results)    
+        if etag:
+            response.set_etag(etag)
+            visibility = 'private' if current_user.is_authenticated else 'public'
+            response.headers['Cache-Control'] = f"{visibility}, max-age={search_cache.max_age}"
+            response.vary.add('Cookie')
+        else:
+            response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+    def course_enrollment_counts():
+        """Enrollments per lower-cased course name, for suggestion ranking; runs on a background thread"""
+        with app.app_context():
+            rows = db.session.query(UserCourse.course_name, func.count(UserCourse.id)).group_by(UserCourse.course_name).all()
+        counts = {}
+        for course_name, count in rows:
+            counts[course_name.lower()] = counts.get(course_name.lower(), 0) + count
+        return counts
+
+    @app.route('/search/suggest')
+    def search_suggest():
+        """Autocomplete for the search box: top course, skill and career path matches for a prefix"""
+        query = request.args.get('q', '')
+        limit = request.args.get('limit', suggest.TOP_K, type=int)
+        index = suggest.get_suggest_index(get_catalog(), course_enrollment_counts)
+        
+        response = jsonify({
+            'query': query,
+            'suggestions': [suggestion.to_dict() for suggestion in index.lookup(query, max(1, limit))]
+        })
+        response.headers['Cache-Control'] = 'public, max-age=60'
+        return response
+
     @app.route('/my-courses')
     @login_required
     def my_courses():
-        user_courses = UserCourse.query.filter_by(user_id=current_user.id).all()
+        cursor = request.args.get('cursor')
+        limit = parse_page_size(request.args.get('limit'))
+        try:
+            user_courses, next_cursor = keyset_page(
+                UserCourse.query.filter_by(user_id=current_user.id),
+                UserCourse.created_at, UserCourse.id, cursor, limit
+            )
+        except InvalidCursor:
+            return redirect(get_url_for('my_courses', limit=limit))
         
         stats = get_skillstown_stats(current_user.id)
-        return render_template('courses/my_courses.html', courses=user_courses, stats=stats)
+        return render_template('courses/my_courses.html', courses=user_courses, stats=stats,
+                               cursor=cursor, next_cursor=next_cursor, limit=limit)
+
+    def wants_json():
+        """True for fetch()/API callers, False for plain browser form posts"""
+        return request.accept_mimetypes.best_match(['application/json', 'text/html']) == 'application/json'
 
     @app.route('/enroll', methods=['POST'])
     @login_required
     def enroll_course():
-        course_name = request.form.get('course_name')
-        course_description = request.form.get('course_description', '')
+        course_name = request.form.get('course_name') or request.form.get('course')
+        category = request.form.get('category') or 'General'
         
         if not course_name:
+            if wants_json():
+                return jsonify({'success': False, 'message': 'Course name is required'}), 400
             flash('Course name is required', 'error')
             return redirect(get_url_for('search'))
         
-        # Check if user is already enrolled
-        existing_enrollment = UserCourse.query.filter_by(
-            user_id=current_user.id,
-            course_name=course_name
-        ).first()
+        # Single INSERT ... ON CONFLICT DO NOTHING; no pre-check, no race window
+        created = UserCourse.enroll_many(current_user.id, [{'category': category, 'course_name': course_name}])
+        db.session.commit()
         
-        if existing_enrollment:
-            flash('You are already enrolled in this course', 'info')
-            return redirect(get_url_for('my_courses'))
+        # Optionally have a quiz ready before the user opens the course
+        if created and app.config['QUIZ_PREGENERATE_ON_ENROLL']:
+            start_quiz_job(created[course_name], current_user.id)
         
-        # Create new enrollment
-        user_course = UserCourse(
-            user_id=current_user.id,
-            course_name=course_name,
-            course_description=course_description,
-            status='enrolled'
-        )
+        if created:
+            message = f'Successfully enrolled in {course_name}!'
+        else:
+            message = 'You are already enrolled in this course'
+        
+        if wants_json():
+            return jsonify({'success': bool(created), 'message': message})
+        flash(message, 'success' if created else 'info')
+        return redirect(get_url_for('my_courses'))
+
+    @app.route('/enroll/bulk', methods=['POST'])
+    @login_required
+    def bulk_enroll_courses():
+        """Enroll in many courses in one transaction: {"courses": [{"category", "course_name"}]}"""
+        payload = request.get_json(silent=True) or {}
+        courses = payload.get('courses')
+        if not isinstance(courses, list) or not courses:
+            return jsonify({'success': False, 'error': 'A non-empty "courses" list is required'}), 400
+        if len(courses) > MAX_BULK_ENROLL:
+            return jsonify({'success': False, 'error': f'At most {MAX_BULK_ENROLL} courses per request'}), 400
+        
+        # De-duplicate by name; later entries win, like a repeated form submission
+        requested = {}
+        for course in courses:
+            name = (course.get('course_name') or course.get('course')) if isinstance(course, dict) else None
+            if not name:
+                return jsonify({'success': False, 'error': 'Every course needs a course_name'}), 400
+            requested[name] = {'category': course.get('category') or 'General', 'course_name': name}
         
-        db.session.add(user_course)
+        created = UserCourse.enroll_many(current_user.id, list(requested.values()))
         db.session.commit()
         
-        flash(f'Successfully enrolled in {course_name}!', 'success')
-        return redirect(get_url_for('my_courses'))
+        return jsonify({
+            'success': True,
+            'enrolled': list(created),
+            'already_enrolled': [name for name in requested if name not in created]
+        })
 
     @app.route('/profile')
     @login_required
@@ -575,33 +750,43 @@ def create_app(config_name=None):
             flash('Course not found', 'error')
             return redirect(get_url_for('my_courses'))
         
-        # Get course details
-        course_details = CourseDetail.query.filter_by(user_course_id=course_id).first()
+        # Get course details; the JSON blobs are not needed in full
+        course_details = CourseDetail.query.options(
+            defer(CourseDetail.materials), defer(CourseDetail.quiz_results)
+        ).filter_by(user_course_id=course_id).first()
         
-        # Default empty materials if none exists
+        # Only the materials list is rendered, so extract it on the database side
         materials = {'materials': []}
-        if course_details and course_details.materials:
+        if course_details:
             try:
-                materials = json.loads(course_details.materials)
-            except:
-                pass  # Use the default empty materials
+                materials['materials'] = CourseDetail.get_json_field(course_id, 'materials', 'materials') or []
+            except Exception:
+                db.session.rollback()  # Unmigrated, malformed JSON; use the default empty materials
         
-        return render_template('courses/course_detail.html', course=course, course_details=course_details, materials=materials)
+        # Quiz history and recommendations are rendered with the page instead of fetched after it
+        try:
+            dashboard = build_course_dashboard(course, COURSE_ATTEMPTS_PAGE_SIZE)
+        except Exception as e:
+            logger.error(f"Error building course dashboard: {e}")
+            db.session.rollback()
+            dashboard = {'attempts': [], 'next_cursor': None, 'recommendations': None}
+        return render_template('courses/course_detail.html', course=course, course_details=course_details,
+                               materials=materials, dashboard=dashboard, attempts_page_size=COURSE_ATTEMPTS_PAGE_SIZE)
 
     @app.route('/course/<int:course_id>/update-status', methods=['POST'])
     @login_required
     def update_course_status(course_id):
-        course = UserCourse.query.filter_by(id=course_id, user_id=current_user.id).first()
-        if not course:
+        new_status = request.form.get('status')
+        if new_status not in ['enrolled', 'in_progress', 'completed']:
+            return redirect(get_url_for('course_detail', course_id=course_id))
+        
+        # One UPDATE scoped to the owner doubles as the ownership check
+        if not UserCourse.set_status(course_id, current_user.id, new_status):
             flash('Course not found', 'error')
             return redirect(get_url_for('my_courses'))
         
-        new_status = request.form.get('status')
-        if new_status in ['enrolled', 'in_progress', 'completed']:
-            course.status = new_status
-            db.session.commit()
-            flash(f'Course status updated to {new_status}', 'success')
-        
+        db.session.commit()
+        flash(f'Course status updated to {new_status}', 'success')
         return redirect(get_url_for('course_detail', course_id=course_id))
 
     @app.route('/reset-skillstown-tables', methods=['POST'])
@@ -628,80 +813,105 @@ def create_app(config_name=None):
     @app.route('/course/<int:course_id>/generate-quiz', methods=['POST'])
     @login_required
     def generate_quiz(course_id):
-        """Generate a new quiz for a course"""
-        try:
-            # Get the course from UserCourse table
-            course = UserCourse.query.filter_by(id=course_id, user_id=current_user.id).first()
-            if not course:
-                return jsonify({'error': 'Course not found or not authorized'}), 404
-            
-            # Get or create quiz UUID for the user
-            quiz_user_uuid = current_user.get_quiz_uuid()
-            
-            # Get course details to send to quiz API
-            course_details = CourseDetail.query.filter_by(user_course_id=course_id).first()
-            description = course_details.description if course_details else f"Learn {course.course_name} with practical examples and real-world applications."
-            
-            # Get course info from catalog for more details
-            catalog_info = get_detailed_course_info(course.course_name)
-            
-            # Prepare the request payload for quiz API
-            quiz_payload = {
-                "user_id": quiz_user_uuid,
-                "course": {
-                    "name": course.course_name,
-                    "description": description,
-                    "duration"
-                    "level": catalog_info.get('level', 'Intermediate'),
-                    "skills": catalog_info.get('skills', []),
-                    "projects": catalog_info.get('projects', []),
-                    "career_paths": catalog_info.get('career_paths', [])
-                }
-            }
-            
-            print(f"[DEBUG] Sending quiz payload: {quiz_payload}")
-            
-            # Call the quiz API to create quiz
-            response = requests.post(
-                f"{QUIZ_API_BASE_URL}/quiz/create-ai-from-course",
-                json=quiz_payload,
-                headers=get_quiz_api_headers(),
-                timeout=30
-            )
-            
-            print(f"[DEBUG] Quiz API response: {response.status_code} - {response.text}")
-            
-            if response.status_code == 201:
-                quiz_data = response.json()
-                course_quiz = CourseQuiz(
-                    user_course_id=course.id,
-                    quiz_api_id=quiz_data['quizId'],
-                    quiz_title=quiz_data['title']
-                )
-                db.session.add(course_quiz)
-                db.session.commit()
-                
-                return jsonify({
-                    'success': True,
-                    'quiz_id': quiz_data['quizId'],
-                    'title': quiz_data['title'],
-                    'description': quiz_data['description'],
-                    'questions_count': quiz_data['questionsCount'],
-                    'message': 'Quiz generated successfully!'
-                })
-            else:
-                print(f"Quiz API error: {response.status_code} - {response.text}")
-                return jsonify({
-                    'success': False, 
-                    'error': f'Quiz API error: {response.status_code} - {response.text}'
-                }), 500
-                    
-        except Exception as e:
-            print(f"Error generating quiz: {e}")
+        """Start generating a quiz for a course in the background"""
+        course = UserCourse.query.filter_by(id=course_id, user_id=current_user.id).first()
+        if not course:
+            return jsonify({'error': 'Course not found or not authorized'}), 404
+        
+        # A quiz generated ahead of time (or by an earlier request) is served as-is
+        ready = find_ready_quiz(course.id)
+        if ready:
             return jsonify({
-                'success': False,
-                'error': f'Internal error: {str(e)}'
-            }), 500
+                'success': True,
+                'status': 'done',
+                'quiz_id': ready.quiz_api_id,
+                'title': ready.quiz_title,
+                'message': 'Quiz generated successfully!'
+            })
+        
+        # Concurrent requests for the same course join the job already running
+        job, created = start_quiz_job(course.id, current_user.id)
+        return jsonify({
+            'success': True,
+            'job_id': job.id if job else None,
+            'status': job.status if job else 'running',
+            'status_url': get_url_for('quiz_generation_status', course_id=course.id),
+            'message': 'Quiz generation started' if created else 'Quiz generation already in progress'
+        }), 202
+
+    @app.route('/course/<int:course_id>/quiz-status')
+    @login_required
+    def quiz_generation_status(course_id):
+        """Poll the background quiz generation for a course"""
+        course = UserCourse.query.filter_by(id=course_id, user_id=current_user.id).first()
+        if not course:
+            return jsonify({'error': 'Course not found or not authorized'}), 404
+        
+        job = quiz_jobs.get(course.id)
+        if job and job.user_id == current_user.id and job.status != 'done':
+            return jsonify(job.to_dict())
+        
+        # Finished jobs, and jobs run by another worker process, are visible in the database
+        ready = find_ready_quiz(course.id)
+        if ready:
+            data = job.to_dict() if job and job.result and job.result['quiz_id'] == ready.quiz_api_id else {}
+            data.update({'status': 'done', 'quiz_id': ready.quiz_api_id, 'title': ready.quiz_title})
+            return jsonify(data)
+        if QuizGeneration.in_progress(course.id, CLAIM_LEASE):
+            return jsonify({'status': 'running'})
+        return jsonify({'status': 'idle'})
+
+    def start_quiz_job(course_id, user_id):
+        """
+        Start generating a quiz for a course unless any worker process already is.
+        
+        Returns (job, created); job is None when another process holds the claim.
+        """
+        job = quiz_jobs.get(course_id)
+        if job is not None and not job.finished:
+            return job, False
+        
+        # The claim row is the cross-process guard; it commits on its own session
+        token = uuid.uuid4().hex
+        with app.app_context():
+            claimed = QuizGeneration.claim(course_id, token, CLAIM_LEASE)
+            db.session.commit()
+        if not claimed:
+            return None, False
+        job, created = quiz_jobs.submit(course_id, user_id, run_quiz_job, course_id, user_id, token)
+        if not created:
+            with app.app_context():
+                QuizGeneration.release(course_id, token)
+                db.session.commit()
+        return job, created
+
+    def run_quiz_job(course_id, user_id, token):
+        """Generate a quiz on a worker thread with its own app context and session"""
+        with app.app_context():
+            try:
+                return create_course_quiz(course_id, user_id)
+            finally:
+                db.session.rollback()
+                QuizGeneration.release(course_id, token)
+                db.session.commit()
+
+    def get_owned_quiz(quiz_id):
+        """
+        Load a quiz and its owner with one joined query.
+        
+        Returns (course_quiz, None) when the current user owns the quiz,
+        otherwise (None, error_response).
+        """
+        row = db.session.query(CourseQuiz, UserCourse.user_id).join(
+            UserCourse, CourseQuiz.user_course_id == UserCourse.id
+        ).filter(CourseQuiz.quiz_api_id == quiz_id).first()
+        if not row:
+            return None, (jsonify({'error': 'Quiz not found'}), 404)
+        
+        course_quiz, owner_id = row
+        if owner_id != current_user.id:
+            return None, (jsonify({'error': 'User not authorized for this quiz'}), 403)
+        return course_quiz, None
 
     @app.route('/quiz/<quiz_id>/details')
     @login_required
@@ -709,32 +919,30 @@ def create_app(config_name=None):
         """Get quiz details for taking the quiz"""
         try:
             # Verify user owns this quiz
-            course_quiz = CourseQuiz.query.filter_by(quiz_api_id=quiz_id).first()
-            if not course_quiz:
-                return jsonify({'error': 'Quiz not found'}), 404
-                    
-            user_course = UserCourse.query.filter_by(
-                id=course_quiz.user_course_id, 
-                user_id=current_user.id
-            ).first()
-            if not user_course:
-                return jsonify({'error': 'User not authorized for this quiz'}), 403
+            course_quiz, error = get_owned_quiz(quiz_id)
+            if error:
+                return error
             
-            # Call the quiz API with correct endpoint
-            response = requests.get(
-                f"{QUIZ_API_BASE_URL}/quiz/{quiz_id}/from-course",
-                headers=get_quiz_api_headers(),
-                timeout=30
-            )
-            
-            if response.status_code == 200:
+            # Definitions never change, so only the first open goes upstream
+            quiz_data = quiz_definition_cache.get(quiz_id)
+            if quiz_data is None:
+                with span('quiz_api'):
+                    response = http_client.get(
+                        f"{QUIZ_API_BASE_URL}/quiz/{quiz_id}/from-course",
+                        service='quiz_api',
+                        headers=get_quiz_api_headers(),
+                        timeout=30
+                    )
+                if response.status_code != 200:
+                    return jsonify({'error': f'Quiz API error: {response.status_code} - {response.text}'}), 500
+                
                 quiz_data = response.json()
-                return jsonify(quiz_data)
-            else:
-                return jsonify({'error': f'Quiz API error: {response.status_code} - {response.text}'}), 500
+                quiz_definition_cache.set(quiz_id, quiz_data)
+            
+            return jsonify(quiz_data)
                         
         except Exception as e:
-            print(f"Exception in get_quiz_details: {e}")
+            logger.error(f"Exception in get_quiz_details: {e}")
             return jsonify({'error': str(e)}), 500
             
     @app.route('/quiz/<quiz_id>/start', methods=['POST'])
@@ -743,41 +951,34 @@ def create_app(config_name=None):
         """Start a new quiz attempt"""
         try:
             # Verify user owns this quiz
-            course_quiz = CourseQuiz.query.filter_by(quiz_api_id=quiz_id).first()
-            if not course_quiz:
-                return jsonify({'error': 'Quiz not found'}), 404
-                    
-            user_course = UserCourse.query.filter_by(
-                id=course_quiz.user_course_id,
-                user_id=current_user.id
-            ).first()
-            if not user_course:
-                return jsonify({'error': 'User not authorized for this quiz'}), 403
+            course_quiz, error = get_owned_quiz(quiz_id)
+            if error:
+                return error
             
             # Call the quiz API with correct endpoint
-            response = requests.post(
-                f"{QUIZ_API_BASE_URL}/quiz/{quiz_id}/attempt-from-course",
-                headers=get_quiz_api_headers(),
-                timeout=30
-            )
+            with span('quiz_api'):
+                response = http_client.post(
+                    f"{QUIZ_API_BASE_URL}/quiz/{quiz_id}/attempt-from-course",
+                    service='quiz_api',
+                    headers=get_quiz_api_headers(),
+                    timeout=30
+                )
             
             if response.status_code in [200, 201]:
                 attempt_data = response.json()
                 
-                # Save attempt to our database
-                quiz_attempt = CourseQuizAttempt(
-                    user_id=current_user.id,
-                    course_quiz_id=course_quiz.id,
-                    attempt_api_id=attempt_data.get('attemptId', attempt_data.get('id', 'unknown'))
+                # Save attempt to our database; a retried start for the same attempt is a no-op
+                CourseQuizAttempt.record_start(
+                    current_user.id, course_quiz.id,
+                    attempt_data.get('attemptId', attempt_data.get('id', 'unknown'))
                 )
-                db.session.add(quiz_attempt)
                 db.session.commit()
                 return jsonify(attempt_data)
             else:
                 return jsonify({'error': f'Quiz API error: {response.status_code} - {response.text}'}), 500
                         
         except Exception as e:
-            print(f"Exception in start_quiz_attempt: {e}")
+            logger.error(f"Exception in start_quiz_attempt: {e}")
             return jsonify({'error': str(e)}), 500
 
     @app.route('/quiz/attempt/<attempt_id>/complete', methods=['POST'])
@@ -797,12 +998,14 @@ def create_app(config_name=None):
             user_answers = request.json
             
             # Call the quiz API with correct endpoint
-            response = requests.post(
-                f"{QUIZ_API_BASE_URL}/quiz/attempt/{attempt_id}/complete-from-course",
-                json=user_answers,
-                headers=get_quiz_api_headers(),
-                timeout=30
-            )
+            with span('quiz_api'):
+                response = http_client.post(
+                    f"{QUIZ_API_BASE_URL}/quiz/attempt/{attempt_id}/complete-from-course",
+                    service='quiz_api',
+                    json=user_answers,
+                    headers=get_quiz_api_headers(),
+                    timeout=30
+                )
             
             if response.status_code == 200:
                 result_data = response.json()
@@ -815,7 +1018,7 @@ def create_app(config_name=None):
                     quiz_attempt.correct_answers = results.get('correct', 0)
                     quiz_attempt.feedback_strengths = results.get('strengths', '')                    
                     quiz_attempt.feedback_improvements = results.get('improvements', '')
-                    quiz_attempt.user_answers = json.dumps(user_answers)
+                    quiz_attempt.user_answers = user_answers
                     quiz_attempt.completed_at = datetime.utcnow()
                     
                     db.session.commit()
@@ -825,9 +1028,43 @@ def create_app(config_name=None):
                 return jsonify({'error': f'Quiz API error: {response.status_code} - {response.text}'}), 500
                         
         except Exception as e:
-            print(f"Exception in complete_quiz_attempt: {e}")
+            logger.error(f"Exception in complete_quiz_attempt: {e}")
             return jsonify({'error': str(e)}), 500
 
+    @app.route('/metrics')
+    def metrics_endpoint():
+        """Prometheus metrics for the METRICS_TOKEN bearer or an admin; METRICS_PUBLIC=true opens it"""
+        token = os.environ.get('METRICS_TOKEN')
+        allowed = (
+            os.environ.get('METRICS_PUBLIC', 'false').lower() == 'true'
+            or (token and request.headers.get('Authorization') == f'Bearer {token}')
+            or profiler.is_admin_request()
+        )
+        if not allowed:
+            return Response('Unauthorized\n', status=401, mimetype='text/plain')
+        return Response(metrics.exposition(), content_type=metrics.CONTENT_TYPE)
+
+    @app.route('/admin/profile')
+    def admin_profile():
+        """Sample this worker's threads: ?seconds=10&interval_ms=10&format=svg|collapsed&idle=1"""
+        if not profiler.is_admin_request():
+            return jsonify({'error': 'Not found'}), 404
+        
+        try:
+            seconds = float(request.args.get('seconds', 10))
+            interval = float(request.args.get('interval_ms', profiler.DEFAULT_INTERVAL * 1000)) / 1000
+        except ValueError:
+            return jsonify({'error': 'seconds and interval_ms must be numbers'}), 400
+        
+        try:
+            stacks = profiler.sample(seconds, max(interval, 0.001), include_idle=request.args.get('idle') == '1')
+        except profiler.ProfilerBusy as e:
+            return jsonify({'error': str(e)}), 409
+        
+        if request.args.get('format') == 'svg':
+            return Response(profiler.flamegraph_svg(stacks, f'Worker {os.getpid()} - {seconds:g}s'), mimetype='image/svg+xml')
+        return Response(profiler.collapsed(stacks), mimetype='text/plain')
+
     # Add this test route to check your quiz API connectivity
     @app.route('/test-quiz-api')
     @login_required
@@ -835,7 +1072,7 @@ def create_app(config_name=None):
             """Test route to check quiz API connectivity"""
             try:
                 # Test basic connectivity
-                response = requests.get(f"{QUIZ_API_BASE_URL}/health", timeout=10)
+                response = http_client.get(f"{QUIZ_API_BASE_URL}/health", service='quiz_api', timeout=10)
                 
                 api_status = {
                     'quiz_api_base_url': QUIZ_API_BASE_URL,
@@ -884,41 +1121,89 @@ def create_app(config_name=None):
         except Exception as e:
             return jsonify({'error': str(e)}), 500
 
+    def serialize_attempt(attempt, quiz_title):
+        """JSON shape of a quiz attempt in the course history"""
+        return {
+            'id': attempt.id,
+            'attempt_api_id': attempt.attempt_api_id,
+            'score': attempt.score,
+            'total_questions': attempt.total_questions,
+            'correct_answers': attempt.correct_answers,
+            'feedback_strengths': attempt.feedback_strengths,
+            'feedback_improvements': attempt.feedback_improvements,
+            'completed_at': attempt.completed_at.isoformat() if attempt.completed_at else None,
+            'quiz_title': quiz_title
+        }
+
+    def course_attempts_page(course_id, cursor=None, limit=COURSE_ATTEMPTS_PAGE_SIZE):
+        """
+        One page of the current user's attempts on a course, newest first,
+        as (attempt, quiz_title) rows. Raises InvalidCursor for a bad cursor.
+        """
+        # Seek to the requested page; the quiz title comes from the same join
+        query = db.session.query(CourseQuizAttempt, CourseQuiz.quiz_title).join(
+            CourseQuiz, CourseQuizAttempt.course_quiz_id == CourseQuiz.id
+        ).filter(
+            CourseQuiz.user_course_id == course_id,
+            CourseQuizAttempt.user_id == current_user.id
+        )
+        return keyset_page(query, CourseQuizAttempt.completed_at, CourseQuizAttempt.id, cursor, limit)
+
+    def build_course_dashboard(course, limit):
+        """
+        Everything the course page shows below the course details, for a course
+        whose ownership the caller has already checked: the first page of quiz
+        attempts and the recommendations for the latest one.
+        """
+        rows, next_cursor = course_attempts_page(course.id, limit=limit)
+        
+        # The first row of the newest-first page is the latest attempt
+        recommendations = generate_course_recommendations_from_quiz(rows[0][0], [], course.course_name) if rows else None
+        
+        return {
+            'course': {'id': course.id, 'course_name': course.course_name, 'status': course.status},
+            'attempts': [serialize_attempt(attempt, quiz_title) for attempt, quiz_title in rows],
+            'next_cursor': next_cursor,
+            'recommendations': recommendations
+        }
+
+    @app.route('/course/<int:course_id>/dashboard')
+    @login_required
+    def get_course_dashboard(course_id):
+        """Quiz history and recommendations for the course page in one request"""
+        try:
+            # Verify user owns this course
+            course = UserCourse.query.filter_by(id=course_id, user_id=current_user.id).first()
+            if not course:
+                return jsonify({'error': 'Course not found'}), 404
+            
+            limit = parse_page_size(request.args.get('limit'), COURSE_ATTEMPTS_PAGE_SIZE)
+            return jsonify(build_course_dashboard(course, limit))
+        except Exception as e:
+            logger.error(f"Error getting course dashboard: {e}")
+            return jsonify({'error': str(e)}), 500
+
     @app.route('/course/<int:course_id>/quiz-attempts')
     @login_required
     def get_course_quiz_attempts(course_id):
-        """Get all quiz attempts for a course"""
+        """Get one page of quiz attempts for a course, newest first"""
         try:
             # Verify user owns this course
             course = UserCourse.query.filter_by(id=course_id, user_id=current_user.id).first()
             if not course:
                 return jsonify({'error': 'Course not found'}), 404
             
-            # Get all quiz attempts for this course
-            quiz_attempts = db.session.query(CourseQuizAttempt).join(
-                CourseQuiz, CourseQuizAttempt.course_quiz_id == CourseQuiz.id
-            ).filter(
-                CourseQuiz.user_course_id == course_id,
-                CourseQuizAttempt.user_id == current_user.id
-            ).order_by(CourseQuizAttempt.completed_at.desc()).all()
-            
-            attempts_data = []
-            for attempt in quiz_attempts:
-                attempts_data.append({
-                    'id': attempt.id,
-                    'attempt_api_id': attempt.attempt_api_id,
-                    'score': attempt.score,
-                    'total_questions': attempt.total_questions,
-                    'correct_answers': attempt.correct_answers,
-                    'feedback_strengths': attempt.feedback_strengths,
-                    'feedback_improvements': attempt.feedback_improvements,
-                    'completed_at': attempt.completed_at.isoformat() if attempt.completed_at else None,
-                    'quiz_title': attempt.course_quiz.quiz_title
-                })
+            try:
+                quiz_attempts, next_cursor = course_attempts_page(
+                    course_id, request.args.get('cursor'), parse_page_size(request.args.get('limit'))
+                )
+            except InvalidCursor as e:
+                return jsonify({'error': str(e)}), 400
             
-            return jsonify({'attempts': attempts_data})
+            attempts_data = [serialize_attempt(attempt, quiz_title) for attempt, quiz_title in quiz_attempts]
+            return jsonify({'attempts': attempts_data, 'next_cursor': next_cursor})
         except Exception as e:
-            print(f"Error getting quiz attempts: {e}")
+            logger.error(f"Error getting quiz attempts: {e}")
             return jsonify({'error': str(e)}), 500
 
     @app.route('/course/<int:course_id>/quiz-recommendations')
@@ -932,20 +1217,15 @@ def create_app(config_name=None):
                 return jsonify({'error': 'Course not found'}), 404
             
             # Fetch latest quiz attempt
-            latest = (CourseQuizAttempt.query
-                      .join(CourseQuiz, CourseQuizAttempt.course_quiz_id == CourseQuiz.id)
-                      .filter(CourseQuiz.user_course_id == course_id,
-                              CourseQuizAttempt.user_id == current_user.id)
-                      .order_by(CourseQuizAttempt.completed_at.desc())
-                      .first())
-            if not latest:
+            rows, _ = course_attempts_page(course_id, limit=1)
+            if not rows:
                 return jsonify({'error': 'No quiz attempts found'}), 404
             
             # Generate recommendations from latest attempt
-            recs = generate_course_recommendations_from_quiz(latest, [])
+            recs = generate_course_recommendations_from_quiz(rows[0][0], [], course.course_name)
             return jsonify(recs)
         except Exception as e:
-             print(f"Error getting quiz recommendations: {e}")
+             logger.error(f"Error getting quiz recommendations: {e}")
              return jsonify({'error': str(e)}), 500
 
     @app.route('/course/<int:course_id>/generate-podcast', methods=['POST'])
@@ -966,9 +1246,11 @@ def create_app(config_name=None):
             result = generate_podcast_for_course(uc.course_name, desc)
             return jsonify(result)
         except Exception as e:
-            print(f"Error generating podcast: {e}")
+            logger.error(f"Error generating podcast: {e}")
             return jsonify({'error': str(e)}), 500
 
+    timer.mark('routes')
+    app.config['STARTUP_TIMINGS'] = timer.report()
     return app
 
 
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the CV analysis and course search hot paths.
+
+Each case is timed with ``timeit`` on synthetic data from ``synthetic_data``
+at several sizes, so scaling problems show up as well as constant costs.
+
+    python benchmark.py                         # run everything, print a table
+    python benchmark.py --output results.json   # also save the results
+    python benchmark.py --compare baseline.json # exit 1 on regressions
+    python benchmark.py --filter search --quick
+"""
+
+import argparse
+import atexit
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+
+import synthetic_data
+
+CATALOG_SIZES = [45, 500, 5000]
+CV_SIZES = [1000, 10000, 50000]
+SKILL_LIST_SIZES = [25, 250, 2500]
+FILE_CV_SIZES = [5000, 50000]
+DEFAULT_THRESHOLD = 0.25
+
+WORK_DIR = tempfile.mkdtemp(prefix='skillstown-bench-')
+atexit.register(shutil.rmtree, WORK_DIR, ignore_errors=True)
+JOB_DESCRIPTION = "We are hiring a backend engineer with Python, Django, PostgreSQL, Docker and AWS experience. " * 10
+
+CASES = []
+
+
+def case(name, **params):
+    """Register a benchmark; the decorated function returns the callable to time."""
+    def decorator(setup):
+        CASES.append((name, params, setup))
+        return setup
+    return decorator
+
+
+def _extractor():
+    from skill_extractor import SkillExtractor
+    return SkillExtractor()
+
+
+def _skill_list(size):
+    # Mixed case, padding and duplicates, like model output
+    skills = synthetic_data.SKILLS
+    return [f"  {skills[i % len(skills)].lower() if i % 3 else skills[i % len(skills)]} " for i in range(size)]
+
+
+for size in CV_SIZES:
+    @case('skill_extractor.extract_fallback', cv_chars=size)
+    def _(size=size):
+        extractor = _extractor()
+        text = synthetic_data.make_cv_text(size)
+        return lambda: extractor._extract_fallback(text)
+
+for size in SKILL_LIST_SIZES:
+    @case('skill_extractor.clean_skills_list', skills=size)
+    def _(size=size):
+        extractor = _extractor()
+        skills = _skill_list(size)
+        return lambda: extractor._clean_skills_list(skills)
+
+    @case('skill_extractor.categorize_skills', skills=size)
+    def _(size=size):
+        extractor = _extractor()
+        skills = [skill.strip() for skill in _skill_list(size)]
+        return lambda: extractor._categorize_skills(skills)
+
+for size in CV_SIZES:
+    @case('skill_extractor.get_analysis_prompt', cv_chars=size, job_description=False)
+    def _(size=size):
+        from skill_extractor import get_analysis_prompt
+        text = synthetic_data.make_cv_text(size)
+        return lambda: get_analysis_prompt(text)
+
+    @case('skill_extractor.get_analysis_prompt', cv_chars=size, job_description=True)
+    def _(size=size):
+        from skill_extractor import get_analysis_prompt
+        text = synthetic_data.make_cv_text(size)
+        return lambda: get_analysis_prompt(text, JOB_DESCRIPTION)
+
+for size in CATALOG_SIZES:
+    @case('course_recommender.recommend', courses=size)
+    def _(size=size):
+        from course_recommender import CourseRecommender
+        path = os.path.join(WORK_DIR, f"catalog_{size}.json")
+        with open(path, 'w') as f:
+            json.dump(synthetic_data.make_catalog(size), f)
+        recommender = CourseRecommender(path)
+        skills = [skill.lower() for skill in synthetic_data.SKILLS[:10]]
+        return lambda: recommender.recommend(skills)
+
+    @case('app.search_courses', courses=size)
+    def _(size=size):
+        from app import search_courses
+        from course_catalog import Catalog
+        catalog = Catalog(synthetic_data.make_catalog(size))
+        return lambda: search_courses('python machine learning docker', catalog)
+
+    @case('app.search_courses', courses=size, typos=True)
+    def _(size=size):
+        from app import search_courses
+        from course_catalog import Catalog
+        catalog = Catalog(synthetic_data.make_catalog(size))
+        return lambda: search_courses('pyhton machne lerning dockr', catalog)
+
+    @case('course_catalog.faceted_search', courses=size)
+    def _(size=size):
+        from course_catalog import Catalog
+        catalog = Catalog(synthetic_data.make_catalog(size))
+        filters = {'level': ['intermediate'], 'duration': ['5-8 weeks', '9-12 weeks']}
+        return lambda: catalog.faceted_search('python machine learning docker', filters)
+
+    @case('suggest.lookup', courses=size)
+    def _(size=size):
+        import suggest
+        from course_catalog import Catalog
+        index = suggest.SuggestIndex(suggest.build_suggestions(Catalog(synthetic_data.make_catalog(size)), {}))
+        return lambda: index.lookup('mastering py')
+
+    @case('course_catalog.load', courses=size)
+    def _(size=size):
+        from course_catalog import Catalog
+        data = synthetic_data.make_catalog(size)
+        return lambda: Catalog(data)
+
+for extension in sorted(synthetic_data.FILE_WRITERS):
+    for size in FILE_CV_SIZES:
+        @case('file_handler.extract_text', format=extension.lstrip('.'), cv_chars=size)
+        def _(extension=extension, size=size):
+            from file_handler import FileHandler
+            handler = FileHandler(tempfile.gettempdir(), set(synthetic_data.FILE_WRITERS))
+            path = os.path.join(WORK_DIR, f"cv_{size}{extension}")
+            if not os.path.exists(path):
+                synthetic_data.FILE_WRITERS[extension](path, synthetic_data.make_cv_text(size))
+            return lambda: handler.extract_text(path)
+
+
+def time_case(fn, repeat, min_time):
+    """
+    Time ``fn`` like ``timeit``: calibrate the loop count, then repeat.
+
+    Returns:
+        dict: loops and per-call min/median/mean in microseconds.
+    """
+    timer = timeit.Timer(fn)
+    number, elapsed = timer.autorange()
+    if elapsed < min_time:
+        number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+    runs = [t / number * 1e6 for t in timer.repeat(repeat=repeat, number=number)]
+    return {
+        'loops': number,
+        'min_us': round(min(runs), 3),
+        'median_us': round(statistics.median(runs), 3),
+        'mean_us': round(statistics.fmean(runs), 3),
+    }
+
+
+def case_key(name, params):
+    """Stable identifier for a case, used to match results against a baseline."""
+    return name + ''.join(f" {key}={value}" for key, value in sorted(params.items()))
+
+
+def run(pattern=None, repeat=5, min_time=0.2):
+    """Run every case whose key contains ``pattern`` and return the results document."""
+    results = []
+    for name, params, setup in CASES:
+        key = case_key(name, params)
+        if pattern and pattern not in key:
+            continue
+        try:
+            timing = time_case(setup(), repeat, min_time)
+        except ImportError as e:
+            print(f"⚠️  Skipping {key}: {e}")
+            continue
+        results.append({'name': name, 'params': params, 'key': key, **timing})
+        print(f"   {key:<70} {timing['median_us']:>14,.1f} µs")
+
+    return {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare median timings against a baseline.
+
+    Args:
+        current (dict): Results document from ``run``.
+        baseline (dict): A previously saved results document.
+        threshold (float): Allowed slowdown, e.g. 0.25 for 25%.
+
+    Returns:
+        list: Keys of cases slower than the baseline by more than ``threshold``.
+    """
+    previous = {result['key']: result for result in baseline.get('results', [])}
+    regressions = []
+    print(f"\n{'case':<70} {'baseline µs':>14} {'current µs':>14} {'change':>8}")
+    for result in current['results']:
+        before = previous.get(result['key'])
+        if before is None:
+            print(f"{result['key']:<70} {'-':>14} {result['median_us']:>14,.1f} {'new':>8}")
+            continue
+        change = result['median_us'] / before['median_us'] - 1 if before['median_us'] else 0.0
+        flag = ''
+        if change > threshold:
+            regressions.append(result['key'])
+            flag = ' ❌'
+        elif change < -threshold:
+            flag = ' 🚀'
+        print(f"{result['key']:<70} {before['median_us']:>14,.1f} {result['median_us']:>14,.1f} {change:>+7.0%}{flag}")
+    return regressions
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run SkillsTown micro-benchmarks')
+    parser.add_argument('--filter', help='Only run cases whose name contains this text')
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    parser.add_argument('--compare', metavar='BASELINE', help='Compare against a saved results file')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Slowdown that counts as a regression (default: 0.25 = 25%%)')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.2, help='Minimum seconds per timing run')
+    parser.add_argument('--quick', action='store_true', help='Fewer, shorter runs for a smoke check')
+    args = parser.parse_args()
+
+    if args.quick:
+        args.repeat, args.min_time = 2, 0.02
+
+    # Keep per-call log lines out of the timings and the report
+    logging.basicConfig(level=logging.ERROR)
+    print("⏱️  Running benchmarks...")
+    print("=" * 50)
+    document = run(args.filter, args.repeat, args.min_time)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(document, f, indent=2)
+        print(f"\n💾 Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(document, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) above {args.threshold:.0%}")
+            sys.exit(1)
+        print("\n✅ No regressions")
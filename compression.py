@@ -0,0 +1,131 @@
+"""
+Transparent compression for large text columns.
+
+Values are stored as a one-byte codec header followed by the payload, so the
+codec can change over time without rewriting old rows. zstd is used when the
+optional ``zstandard`` package is installed, zlib otherwise.
+"""
+
+import os
+import zlib
+
+from sqlalchemy.types import LargeBinary, TypeDecorator
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency
+    zstandard = None
+
+CODEC_RAW = 0x00
+CODEC_ZLIB = 0x01
+CODEC_ZSTD = 0x02
+
+CODEC_NAMES = {'raw': CODEC_RAW, 'zlib': CODEC_ZLIB, 'zstd': CODEC_ZSTD}
+
+# Values shorter than this are not worth compressing
+MIN_COMPRESS_SIZE = 256
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+def preferred_codec():
+    """
+    Codec used for new writes, from ``BLOB_COMPRESSION`` (zstd/zlib/raw).
+
+    Returns:
+        int: One of the ``CODEC_*`` header bytes.
+    """
+    default = 'zstd' if zstandard else 'zlib'
+    codec = CODEC_NAMES.get(os.environ.get('BLOB_COMPRESSION', default).lower(), CODEC_ZLIB)
+    if codec == CODEC_ZSTD and not zstandard:
+        return CODEC_ZLIB
+    return codec
+
+
+def compress_text(value, codec=None):
+    """
+    Encode text and prefix it with its codec header.
+
+    Args:
+        value (str): Text to store.
+        codec (int, optional): Codec to use; defaults to ``preferred_codec()``.
+
+    Returns:
+        bytes: Header byte followed by the (possibly compressed) payload.
+    """
+    data = value.encode('utf-8')
+    codec = preferred_codec() if codec is None else codec
+
+    if codec == CODEC_RAW or len(data) < MIN_COMPRESS_SIZE:
+        return bytes([CODEC_RAW]) + data
+    if codec == CODEC_ZSTD:
+        return bytes([CODEC_ZSTD]) + zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return bytes([CODEC_ZLIB]) + zlib.compress(data, ZLIB_LEVEL)
+
+
+def stored_codec(value):
+    """
+    Return the codec header of a stored value, or None for legacy plain text.
+
+    Args:
+        value (bytes | memoryview | str): Raw column value.
+
+    Returns:
+        int | None: The ``CODEC_*`` byte, or None if the value has no header.
+    """
+    if isinstance(value, str):
+        return None
+    value = bytes(value)
+    if value and value[0] in (CODEC_RAW, CODEC_ZLIB, CODEC_ZSTD):
+        return value[0]
+    return None
+
+
+def decompress_text(value):
+    """
+    Decode a stored value back to text.
+
+    Legacy rows written before compression (plain ``str`` or UTF-8 bytes
+    without a header) are returned as-is.
+
+    Args:
+        value (bytes | memoryview | str): Raw column value.
+
+    Returns:
+        str: The original text.
+    """
+    if isinstance(value, str):
+        return value
+
+    value = bytes(value)
+    codec = stored_codec(value)
+    if codec is None:
+        return value.decode('utf-8', errors='replace')
+
+    payload = value[1:]
+    if codec == CODEC_ZLIB:
+        payload = zlib.decompress(payload)
+    elif codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd-compressed values")
+        payload = zstandard.ZstdDecompressor().decompress(payload)
+    return payload.decode('utf-8')
+
+
+class CompressedText(TypeDecorator):
+    """
+    A text column stored as compressed binary with a codec header byte.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return compress_text(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return decompress_text(value)
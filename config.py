@@ -5,7 +5,7 @@ Configuration settings for the SkillsTown CV Analyzer application.
 import os
 
 GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY')
-GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1/models/gemini-2.0-flash:generateContent"
+GEMINI_API_URL = os.environ.get("GEMINI_API_URL", "https://generativelanguage.googleapis.com/v1/models/gemini-2.0-flash:generateContent")
 
 # Gemini API settings for different use cases
 GEMINI_CONFIGS = {
@@ -76,8 +76,7 @@ DEBUG = True
 UPLOAD_FOLDER = 'uploads'
 ALLOWED_EXTENSIONS = {'.pdf', '.docx', '.txt'}
 
-# Create upload directory if it doesn't exist
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+# The upload directory is created lazily by FileHandler / the upload route
 
 # Paths to data files
 SKILLS_JSON_PATH = 'static/data/skills.json'
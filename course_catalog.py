@@ -0,0 +1,549 @@
+"""
+In-memory course catalog for the SkillsTown CV Analyzer application.
+
+``static/data/course_catalog.json`` is parsed once per worker (and again only
+when the file changes) into immutable, slotted ``CourseRecord`` objects with
+lower-cased and tokenized fields precomputed. Searches and recommendation
+lists hand out references to these shared records instead of copying dicts;
+they are turned into JSON only at the response boundary, via
+``CatalogJSONProvider``.
+"""
+
+import json
+import logging
+import os
+import re
+import sys
+import threading
+
+from flask.json.provider import DefaultJSONProvider
+
+from skill_aliases import content_digest, get_aliases
+from trigram_index import TrigramIndex
+
+logger = logging.getLogger(__name__)
+
+CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'data', 'course_catalog.json')
+
+FOUNDATIONAL_LEVELS = frozenset(['beginner', 'basic', 'foundational'])
+INTERMEDIATE_LEVELS = frozenset(['intermediate', 'medium'])
+ADVANCED_LEVELS = frozenset(['advanced', 'expert', 'professional'])
+# Tier lists stop after the first category that brings them to this size
+TIER_MIN_COURSES = 4
+# Alias names this short ("go", "ai", "ui") occur inside other words, so they only match whole words
+SHORT_ALIAS_LENGTH = 3
+
+LEVEL_BEGINNER = 'beginner'
+LEVEL_INTERMEDIATE = 'intermediate'
+LEVEL_ADVANCED = 'advanced'
+LEVEL_ALIASES = {
+    'beginner': LEVEL_BEGINNER, 'basic': LEVEL_BEGINNER, 'foundational': LEVEL_BEGINNER,
+    'intermediate': LEVEL_INTERMEDIATE, 'medium': LEVEL_INTERMEDIATE,
+    'advanced': LEVEL_ADVANCED, 'expert': LEVEL_ADVANCED, 'professional': LEVEL_ADVANCED,
+}
+LEVEL_ORDER = (LEVEL_BEGINNER, LEVEL_INTERMEDIATE, LEVEL_ADVANCED)
+
+# Recommendation scoring weights
+IMPROVEMENT_MATCH = 3
+IMPROVEMENT_WORD_MATCH = 1
+SAME_CATEGORY = 2
+SHARED_SKILL = 1
+
+# Facets the search page filters on, in sidebar order
+FACETS = ('category', 'level', 'duration', 'skill')
+# (upper bound in weeks, label); None is unbounded
+DURATION_BUCKETS = ((4, 'Up to 4 weeks'), (8, '5-8 weeks'), (12, '9-12 weeks'), (None, 'Over 12 weeks'))
+WEEKS_PER_UNIT = {'hour': 1 / 40, 'day': 1 / 7, 'week': 1, 'month': 52 / 12}
+
+# Quiz feedback that names no skill
+NO_IMPROVEMENT_FEEDBACK = frozenset(['none - great job', 'keep practising', 'none'])
+SKILL_STOPWORDS = frozenset(['and', 'the', 'for', 'with', 'from', 'into', 'using', 'basics', 'fundamentals'])
+
+_WORD = re.compile(r"[a-z0-9+#.]+")
+_FEEDBACK_SEPARATOR = re.compile(r"[,;\n]+")
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)\s*(hour|day|week|month)")
+
+
+def _intern(value):
+    return sys.intern(value) if value else value
+
+
+def normalize_levels(level):
+    """
+    Map a catalog level to the normalized levels it covers.
+
+    Args:
+        level (str): e.g. ``Beginner``, ``Intermediate to Advanced``.
+
+    Returns:
+        tuple: Normalized levels in ascending order; a range such as
+        ``Beginner to Advanced`` covers every level in between.
+    """
+    found = [LEVEL_ALIASES[word] for word in _WORD.findall(level.lower()) if word in LEVEL_ALIASES]
+    if not found:
+        return ()
+    low, high = LEVEL_ORDER.index(min(found, key=LEVEL_ORDER.index)), LEVEL_ORDER.index(max(found, key=LEVEL_ORDER.index))
+    return LEVEL_ORDER[low:high + 1]
+
+
+def duration_bucket(duration):
+    """
+    Bucket a catalog duration such as ``8 weeks`` or ``3 months``.
+
+    Returns:
+        str: A ``DURATION_BUCKETS`` label, or None if the duration cannot be parsed.
+    """
+    match = _DURATION.search(duration.lower())
+    if not match:
+        return None
+    weeks = float(match.group(1)) * WEEKS_PER_UNIT[match.group(2)]
+    for limit, label in DURATION_BUCKETS:
+        if limit is None or weeks <= limit:
+            return label
+
+
+def iter_bits(bits):
+    """Yield the positions of the set bits of ``bits``, lowest first."""
+    for position, bit in enumerate(reversed(bin(bits)[2:])):
+        if bit == '1':
+            yield position
+
+
+def bits_from_positions(positions, size):
+    """Bitset with the given bit positions set, built in linear time."""
+    buffer = bytearray((size + 7) // 8)
+    for position in positions:
+        buffer[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(buffer, 'little')
+
+
+def skill_words(skill):
+    """Significant lower-cased words of a skill name, for partial matching."""
+    return [word for word in _WORD.findall(skill.lower()) if len(word) > 2 and word not in SKILL_STOPWORDS]
+
+
+def parse_feedback(text):
+    """Split quiz ``feedback_improvements`` text into lower-cased skill phrases."""
+    phrases = (phrase.strip().lower() for phrase in _FEEDBACK_SEPARATOR.split(text or ''))
+    return [phrase for phrase in phrases if phrase and phrase not in NO_IMPROVEMENT_FEEDBACK]
+
+
+class CourseRecord:
+    """
+    One catalog course. Instances are shared and must not be modified.
+    """
+
+    __slots__ = ('name', 'category', 'description', 'duration', 'level', 'skills', 'projects',
+                 'career_paths', 'name_lower', 'description_lower', 'level_lower', 'levels', 'tokens',
+                 'skills_lower')
+
+    def __init__(self, data, category):
+        """
+        Build a record from one course entry of the catalog JSON.
+
+        Args:
+            data (dict): The course entry.
+            category (str): Name of the category it is listed under.
+        """
+        name = data.get('name', '')
+        description = data.get('description', '')
+        level = data.get('level', '')
+        values = {
+            'name': name,
+            'category': _intern(category),
+            'description': description,
+            'duration': _intern(data.get('duration', '')),
+            'level': _intern(level),
+            'skills': tuple(map(_intern, data.get('skills', []))),
+            'projects': tuple(map(_intern, data.get('projects', []))),
+            'career_paths': tuple(map(_intern, data.get('career_paths', []))),
+            'name_lower': name.lower(),
+            'description_lower': description.lower(),
+            'level_lower': _intern(level.lower()),
+            'levels': normalize_levels(level),
+            # Sorted distinct words; interned, so the vocabulary is shared by all records
+            'tokens': tuple(sorted(set(map(sys.intern, _WORD.findall(f"{name} {description}".lower()))))),
+            'skills_lower': frozenset(_intern(skill.lower()) for skill in data.get('skills', [])),
+        }
+        for slot, value in values.items():
+            object.__setattr__(self, slot, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __repr__(self):
+        return f'<CourseRecord {self.name}>'
+
+    def to_dict(self):
+        """The course in catalog JSON form, plus its category."""
+        return {
+            'name': self.name,
+            'category': self.category,
+            'description': self.description,
+            'duration': self.duration,
+            'level': self.level,
+            'skills': list(self.skills),
+            'projects': list(self.projects),
+            'career_paths': list(self.career_paths),
+        }
+
+
+class SearchResult:
+    """
+    A search hit: a shared record plus the query-specific relevance score.
+
+    Attribute reads fall through to the record, so templates can use
+    ``result.name`` and ``result.relevance_score`` alike.
+    """
+
+    __slots__ = ('record', 'relevance_score')
+
+    def __init__(self, record, relevance_score):
+        self.record = record
+        self.relevance_score = relevance_score
+
+    def __getattr__(self, name):
+        # Only called for names that are not slots of this object
+        return getattr(object.__getattribute__(self, 'record'), name)
+
+    def to_dict(self):
+        data = self.record.to_dict()
+        data['relevance_score'] = self.relevance_score
+        return data
+
+
+def _alternative_pattern(option):
+    """Regex for one side of a skill alias; short names only match whole words."""
+    if len(option) <= SHORT_ALIAS_LENGTH:
+        return rf'\b{re.escape(option)}\b'
+    return re.escape(option)
+
+
+class Catalog:
+    """
+    All courses, grouped by category, with lookups built once at load time.
+    """
+
+    __slots__ = ('categories', 'records', 'by_name', 'foundational', 'intermediate', 'advanced',
+                 'by_category_level', 'by_level', 'by_skill', 'by_skill_word', 'positions',
+                 'facets', 'all_bits', 'terms', 'content_hash')
+
+    def __init__(self, data, content_hash=None):
+        """
+        Args:
+            data (dict): Parsed catalog JSON: ``{'categories': [{'name', 'courses'}]}``.
+            content_hash (str, optional): Hash of the catalog file; computed
+                from ``data`` when not given.
+        """
+        self.content_hash = content_hash or content_digest(json.dumps(data, sort_keys=True).encode('utf-8'))
+        self.categories = tuple(
+            (_intern(category.get('name', '')),
+             tuple(CourseRecord(course, category.get('name', '')) for course in category.get('courses', [])))
+            for category in data.get('categories', [])
+        )
+        self.records = tuple(record for _, records in self.categories for record in records)
+        self.by_name = {}
+        for record in self.records:
+            self.by_name.setdefault(record.name_lower, record)
+        self.foundational = self._tier(FOUNDATIONAL_LEVELS)
+        self.intermediate = self._tier(INTERMEDIATE_LEVELS)
+        self.advanced = self._tier(ADVANCED_LEVELS)
+
+        # Facet indexes; every value lists records in catalog order
+        self.positions = {id(record): position for position, record in enumerate(self.records)}
+        by_category_level, by_level, by_skill, by_skill_word = {}, {}, {}, {}
+        for record in self.records:
+            for level in record.levels:
+                by_category_level.setdefault((record.category, level), []).append(record)
+                by_level.setdefault(level, []).append(record)
+            for skill in record.skills_lower:
+                by_skill.setdefault(skill, []).append(record)
+                for word in skill_words(skill):
+                    words = by_skill_word.setdefault(word, [])
+                    if not words or words[-1] is not record:
+                        words.append(record)
+        self.by_category_level = {key: tuple(records) for key, records in by_category_level.items()}
+        self.by_level = {key: tuple(records) for key, records in by_level.items()}
+        self.by_skill = {key: tuple(records) for key, records in by_skill.items()}
+        self.by_skill_word = {key: tuple(records) for key, records in by_skill_word.items()}
+
+        # Facet bitsets: bit i is set when self.records[i] has the value
+        self.all_bits = (1 << len(self.records)) - 1
+        self.facets = {facet: {} for facet in FACETS}
+        skill_labels = {}
+        for position, record in enumerate(self.records):
+            bit = 1 << position
+            values = {
+                'category': (record.category,),
+                'level': record.levels,
+                'duration': (duration_bucket(record.duration),),
+                'skill': tuple(skill_labels.setdefault(skill.lower(), skill) for skill in record.skills),
+            }
+            for facet, facet_values in values.items():
+                bitsets = self.facets[facet]
+                for value in facet_values:
+                    if value is not None:
+                        bitsets[value] = bitsets.get(value, 0) | bit
+        # Vocabulary of names, descriptions and skills for typo correction
+        vocabulary = set()
+        for record in self.records:
+            vocabulary.update(token.strip('.') for token in record.tokens)
+            for skill in record.skills_lower:
+                vocabulary.update(word.strip('.') for word in _WORD.findall(skill))
+        vocabulary.discard('')
+        self.terms = TrigramIndex(vocabulary)
+
+        # Fixed sidebar order for the ordinal facets
+        self.facets['level'] = {level: self.facets['level'][level] for level in LEVEL_ORDER if level in self.facets['level']}
+        self.facets['duration'] = {label: self.facets['duration'][label]
+                                   for _, label in DURATION_BUCKETS if label in self.facets['duration']}
+
+    def __len__(self):
+        return len(self.records)
+
+    def _tier(self, levels):
+        courses = []
+        for _, records in self.categories:
+            courses.extend(record for record in records if record.level_lower in levels)
+            if len(courses) >= TIER_MIN_COURSES:
+                break
+        return tuple(courses)
+
+    def find(self, course_name):
+        """Return the record named ``course_name`` (case-insensitive), or None."""
+        return self.by_name.get(course_name.lower()) if course_name else None
+
+    def recommend(self, level, course_name=None, improvements=None, limit=TIER_MIN_COURSES):
+        """
+        Recommend courses at ``level`` after a quiz on ``course_name``.
+
+        Candidates come from index lookups only: the quizzed course's category
+        at that level, and courses teaching the skills named in the quiz
+        feedback. They are ranked by feedback matches, then same category, then
+        skills shared with the quizzed course. If that yields fewer than
+        ``limit`` courses, the rest are filled from the level across all
+        categories.
+
+        Args:
+            level (str): Normalized level, e.g. ``LEVEL_BEGINNER``.
+            course_name (str, optional): Course the quiz was for.
+            improvements (str, optional): The attempt's ``feedback_improvements``.
+            limit (int): Maximum number of courses.
+
+        Returns:
+            list: ``CourseRecord`` objects, best first.
+        """
+        quizzed = self.find(course_name)
+        scores = {}
+
+        def add(record, points):
+            if record is not quizzed and level in record.levels:
+                scores[record] = scores.get(record, 0) + points
+
+        if quizzed is not None:
+            for record in self.by_category_level.get((quizzed.category, level), ()):
+                add(record, SAME_CATEGORY + len(record.skills_lower & quizzed.skills_lower) * SHARED_SKILL)
+
+        for phrase in parse_feedback(improvements):
+            exact = self.by_skill.get(phrase)
+            if exact:
+                for record in exact:
+                    add(record, IMPROVEMENT_MATCH)
+                continue
+            for word in skill_words(phrase):
+                for record in self.by_skill_word.get(word, ()):
+                    add(record, IMPROVEMENT_WORD_MATCH)
+
+        ranked = sorted(scores, key=lambda record: (-scores[record], self.positions[id(record)]))[:limit]
+        if len(ranked) < limit:
+            chosen = set(map(id, ranked))
+            for record in self.by_level.get(level, ()):
+                if record is not quizzed and id(record) not in chosen:
+                    ranked.append(record)
+                    if len(ranked) == limit:
+                        break
+        return ranked
+
+    def filter_bits(self, filters, skip=None):
+        """
+        Bitset of the courses matching ``filters``.
+
+        Values of one facet are OR-ed, facets are AND-ed. Unknown values match
+        nothing.
+
+        Args:
+            filters (dict): Facet name to a list of selected values.
+            skip (str, optional): Facet to leave out, for its own counts.
+
+        Returns:
+            int: Bitset over ``records``.
+        """
+        bits = self.all_bits
+        for facet, values in (filters or {}).items():
+            if facet == skip or facet not in self.facets or not values:
+                continue
+            bitsets = self.facets[facet]
+            selected = 0
+            for value in values:
+                selected |= bitsets.get(value, 0)
+            bits &= selected
+        return bits
+
+    def facet_counts(self, query_bits, filters=None):
+        """
+        Count the courses behind every facet value.
+
+        Each facet is counted against the query and the *other* facets'
+        filters, so picking one category still shows how many hits the others
+        would give.
+
+        Args:
+            query_bits (int): Bitset of the courses matching the query.
+            filters (dict, optional): Selected facet values.
+
+        Returns:
+            dict: Facet name to ``[(value, count), ...]`` with non-zero counts
+            (or selected values) only. Skills are ordered by count, levels and
+            durations from shortest/easiest, categories in catalog order.
+        """
+        filters = filters or {}
+        counts = {}
+        for facet in FACETS:
+            base = query_bits & self.filter_bits(filters, skip=facet)
+            selected = filters.get(facet) or ()
+            values = [(value, (base & bits).bit_count()) for value, bits in self.facets[facet].items()]
+            values = [(value, count) for value, count in values if count or value in selected]
+            if facet == 'skill':
+                values.sort(key=lambda item: -item[1])
+            counts[facet] = values
+        return counts
+
+    def search(self, query, aliases=None):
+        """
+        Score every course against ``query``: 3 points per query word found in
+        the name, 1 per word found in the description.
+
+        A query word that is a skill alias also matches its canonical name
+        ("k8s" matches "kubernetes"; alias names of ``SHORT_ALIAS_LENGTH``
+        characters or fewer, like "go" or "ai", must appear as whole words). Other words that are not in the catalog
+        vocabulary (nor the start of a term) are looked up in the trigram
+        index, so "pyhton" finds Python courses. Either way a course matches
+        the word if it contains the word or one of its alternatives, and the
+        alternatives are folded into one pattern per word, so expansion does
+        not add passes over the catalog.
+
+        Args:
+            query (str): Free-text query.
+            aliases (AliasDictionary, optional): Defaults to the shared dictionary.
+
+        Returns:
+            list: ``SearchResult`` objects, best first.
+        """
+        words = query.lower().split()
+        if not words:
+            return []
+        if aliases is None:
+            aliases = get_aliases()
+        alternatives = []
+        for word in words:
+            expansion = aliases.expand(word)
+            if expansion:
+                # Both sides of an alias are skill names, so short ones match whole words
+                alternatives.append((_alternative_pattern(word), _alternative_pattern(expansion)))
+            else:
+                alternatives.append((re.escape(word), *map(re.escape, self.terms.corrections(word))))
+        if all(len(options) == 1 for options in alternatives):
+            def count(text):
+                return sum(1 for w in words if w in text)
+        else:
+            patterns = [re.compile('|'.join(options)).search for options in alternatives]
+
+            def count(text):
+                return sum(1 for search in patterns if search(text))
+        results = []
+        for record in self.records:
+            score = 3 * count(record.name_lower) + count(record.description_lower)
+            if score > 0:
+                results.append(SearchResult(record, score))
+        results.sort(key=lambda result: result.relevance_score, reverse=True)
+        return results
+
+    def faceted_search(self, query, filters=None):
+        """
+        Search, then narrow the hits to the selected facet values.
+
+        The query hits become a bitset that is AND-ed with the facet bitsets;
+        the same query bitset feeds the facet counts. An empty query matches
+        every course, so the facets can be browsed on their own.
+
+        Args:
+            query (str): Free-text query.
+            filters (dict, optional): Facet name to a list of selected values.
+
+        Returns:
+            tuple: (``SearchResult`` list, best first; ``facet_counts`` dict).
+        """
+        if query.split():
+            hits = self.search(query)
+            query_bits = bits_from_positions((self.positions[id(hit.record)] for hit in hits), len(self.records))
+        else:
+            hits = None
+            query_bits = self.all_bits
+
+        bits = query_bits & self.filter_bits(filters)
+        if hits is None:
+            results = [SearchResult(self.records[position], 0) for position in iter_bits(bits)]
+        elif bits == query_bits:
+            results = hits
+        else:
+            keep = set(iter_bits(bits))
+            results = [hit for hit in hits if self.positions[id(hit.record)] in keep]
+        return results, self.facet_counts(query_bits, filters)
+
+
+_cache = {'path': None, 'mtime': None, 'catalog': Catalog({})}
+_lock = threading.Lock()
+
+
+def get_catalog(path=CATALOG_PATH):
+    """
+    Return the parsed catalog, reloading it only when the file has changed.
+
+    Args:
+        path (str): Catalog JSON file.
+
+    Returns:
+        Catalog: The shared catalog; empty if the file cannot be read.
+    """
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError as e:
+        logger.error(f"Course catalog unavailable at {path}: {e}")
+        return Catalog({})
+
+    if _cache['path'] != path or _cache['mtime'] != mtime:
+        with _lock:
+            if _cache['path'] != path or _cache['mtime'] != mtime:
+                try:
+                    with open(path, 'rb') as f:
+                        raw = f.read()
+                    catalog = Catalog(json.loads(raw.decode('utf-8')), content_digest(raw))
+                except (OSError, ValueError) as e:
+                    logger.error(f"Error loading course catalog from {path}: {e}")
+                    return _cache['catalog']
+                _cache.update(path=path, mtime=mtime, catalog=catalog)
+                logger.info(f"Loaded course catalog: {len(catalog)} courses")
+    return _cache['catalog']
+
+
+class CatalogJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that serializes catalog records and search results."""
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, (CourseRecord, SearchResult)):
+            return o.to_dict()
+        return DefaultJSONProvider.default(o)
@@ -5,6 +5,8 @@ Course recommendation module for the SkillsTown CV Analyzer application.
 import json
 import logging
 
+from tracing import traced
+
 logger = logging.getLogger(__name__)
 
 class CourseRecommender:
@@ -50,6 +52,7 @@ class CourseRecommender:
         """
         self.catalog = self._load_catalog()
     
+    @traced('recommend')
     def recommend(self, skills, max_recommendations=10):
         """
         Recommend courses based on the given skills.
@@ -7,6 +7,9 @@ import logging
 import PyPDF2
 import docx
 
+import metrics
+from tracing import span
+
 logger = logging.getLogger(__name__)
 
 class FileHandler:
@@ -63,7 +66,8 @@ class FileHandler:
         
         # Call the appropriate extraction function
         if file_ext in extractors:
-            return extractors[file_ext](filepath)
+            with span('file_extract'), metrics.FILE_EXTRACTION_DURATION.time(extension=file_ext.lstrip('.')):
+                return extractors[file_ext](filepath)
         else:
             logger.warning(f"No extractor available for {file_ext} files")
             return ""
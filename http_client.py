@@ -0,0 +1,139 @@
+"""
+Shared HTTP client for calls to upstream services (quiz API, Gemini).
+
+All upstream traffic goes through one pooled ``requests.Session`` so
+connections are reused and test harnesses can swap the transport: see
+``http_replay`` for recording and replaying exchanges. ``requests`` itself is
+imported on first use to keep worker boot cheap.
+"""
+
+import logging
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+POOL_SIZE = int(os.environ.get('HTTP_POOL_SIZE', 10))
+
+_session = None
+_lock = threading.Lock()
+
+
+def session():
+    """
+    Return the process-wide session, creating it on first use.
+
+    If ``HTTP_RECORD`` or ``HTTP_REPLAY`` names a fixture file, the matching
+    ``http_replay`` adapter is installed when the session is created.
+
+    Returns:
+        requests.Session: The shared session.
+    """
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                import requests
+
+                new_session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+                new_session.mount('http://', adapter)
+                new_session.mount('https://', adapter)
+                _install_from_env(new_session)
+                _session = new_session
+    return _session
+
+
+def init_from_env():
+    """
+    Create the session at startup if ``HTTP_RECORD`` or ``HTTP_REPLAY`` is set,
+    so a missing fixture or a bad ``HTTP_REPLAY_LATENCY`` fails the boot
+    instead of the first upstream request.
+    """
+    if os.environ.get('HTTP_RECORD') or os.environ.get('HTTP_REPLAY'):
+        session()
+
+
+def mount(adapter):
+    """
+    Route all upstream traffic through ``adapter``.
+
+    Args:
+        adapter (requests.adapters.BaseAdapter): Transport adapter to install.
+
+    Returns:
+        tuple: The previous ``(http, https)`` adapters, for ``restore``.
+    """
+    current = session()
+    previous = (current.get_adapter('http://'), current.get_adapter('https://'))
+    current.mount('http://', adapter)
+    current.mount('https://', adapter)
+    return previous
+
+
+def restore(previous):
+    """Reinstall the adapters returned by ``mount``."""
+    current = session()
+    current.mount('http://', previous[0])
+    current.mount('https://', previous[1])
+
+
+def request(method, url, service=None, **kwargs):
+    """
+    Send a request through the shared session, counting and timing it.
+
+    Args:
+        method (str): HTTP method.
+        url (str): Request URL.
+        service (str, optional): Metrics label, e.g. ``gemini``; defaults to the host.
+        **kwargs: Passed to ``requests.Session.request``.
+
+    Returns:
+        requests.Response: The response.
+    """
+    service = service or urlsplit(url).netloc
+    started = time.perf_counter()
+    status = 'error'
+    try:
+        response = session().request(method, url, **kwargs)
+        status = response.status_code
+        return response
+    finally:
+        metrics.UPSTREAM_REQUESTS.inc(service=service, status=status)
+        metrics.UPSTREAM_DURATION.observe(time.perf_counter() - started, service=service)
+
+
+def get(url, service=None, **kwargs):
+    """Send a GET request through the shared session."""
+    return request('GET', url, service, **kwargs)
+
+
+def post(url, service=None, **kwargs):
+    """Send a POST request through the shared session."""
+    return request('POST', url, service, **kwargs)
+
+
+def _install_from_env(new_session):
+    """Install a record or replay adapter named by the environment."""
+    record_path = os.environ.get('HTTP_RECORD')
+    replay_path = os.environ.get('HTTP_REPLAY')
+    if not (record_path or replay_path):
+        return
+
+    import http_replay
+
+    if replay_path:
+        latency = http_replay.parse_latency(os.environ.get('HTTP_REPLAY_LATENCY', http_replay.LATENCY_ORIGINAL))
+        adapter = http_replay.ReplayAdapter(http_replay.Cassette.load(replay_path), latency=latency)
+        logger.info(f"Replaying upstream HTTP from {replay_path}")
+    else:
+        adapter = http_replay.RecordingAdapter(http_replay.Cassette(record_path), new_session.get_adapter('https://'))
+        adapter.save_at_exit()
+        logger.info(f"Recording upstream HTTP to {record_path}")
+
+    new_session.mount('http://', adapter)
+    new_session.mount('https://', adapter)
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Record and replay upstream HTTP exchanges (Gemini, quiz API) as fixture files.
+
+Recording wraps the real transport of ``http_client`` and stores every
+request/response pair with its duration. Replaying serves those responses
+back from the fixture, either with the original timing or with none, so
+benchmarks of ``upload_cv`` or the course page flow run offline and
+reproducibly.
+
+In code:
+    with http_replay.recording('fixtures/http/course_flow.json'):
+        ...exercise the app...
+
+    with http_replay.replaying('fixtures/http/course_flow.json', latency='zero'):
+        ...run the benchmark...
+
+For a running server, set ``HTTP_RECORD=<file>`` or ``HTTP_REPLAY=<file>``
+(plus ``HTTP_REPLAY_LATENCY=zero``) before it starts; both are checked at boot.
+"""
+
+import atexit
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import timedelta
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+import http_client
+
+logger = logging.getLogger(__name__)
+
+LATENCY_ORIGINAL = 'original'
+LATENCY_ZERO = 'zero'
+
+FIXTURE_VERSION = 1
+# Query parameters that carry credentials and are never written to fixtures
+REDACTED_PARAMS = {'key', 'api_key', 'access_token'}
+# Response headers kept in fixtures; the rest are transport details
+RECORDED_HEADERS = {'content-type', 'retry-after'}
+
+
+class ReplayMiss(requests.exceptions.ConnectionError):
+    """Raised when a replayed request has no matching recorded exchange."""
+
+
+def parse_latency(value):
+    """
+    Validate a replay latency mode, e.g. from ``HTTP_REPLAY_LATENCY``.
+
+    Args:
+        value (str): ``'original'`` or ``'zero'``, in any case.
+
+    Returns:
+        str: ``LATENCY_ORIGINAL`` or ``LATENCY_ZERO``.
+
+    Raises:
+        ValueError: If ``value`` is neither.
+    """
+    latency = value.strip().lower()
+    if latency not in (LATENCY_ORIGINAL, LATENCY_ZERO):
+        raise ValueError(f"Unknown replay latency mode: {value!r} (expected '{LATENCY_ORIGINAL}' or '{LATENCY_ZERO}')")
+    return latency
+
+
+def normalize_url(url):
+    """
+    Strip credentials from a URL and sort its query string.
+
+    Args:
+        url (str): Request URL.
+
+    Returns:
+        str: URL used to store and match exchanges.
+    """
+    parts = urlsplit(url)
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in REDACTED_PARAMS)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ''))
+
+
+def _encode_body(data, content_type=''):
+    """Store JSON bodies as objects so fixtures stay readable and diffable."""
+    if data is None:
+        return {}
+    if isinstance(data, bytes):
+        data = data.decode('utf-8', errors='replace')
+    if 'json' in (content_type or '') or data[:1] in ('{', '['):
+        try:
+            return {'json': json.loads(data)}
+        except ValueError:
+            pass
+    return {'text': data}
+
+
+def _decode_body(stored):
+    """Inverse of ``_encode_body``; returns bytes."""
+    if 'json' in stored:
+        return json.dumps(stored['json']).encode('utf-8')
+    return stored.get('text', '').encode('utf-8')
+
+
+class Cassette:
+    """
+    An ordered list of recorded exchanges backed by a JSON file.
+    """
+
+    def __init__(self, path, interactions=None):
+        """
+        Initialize the cassette.
+
+        Args:
+            path (str): Fixture file path.
+            interactions (list, optional): Previously recorded exchanges.
+        """
+        self.path = path
+        self.interactions = interactions or []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read a fixture file.
+
+        Args:
+            path (str): Fixture file path.
+
+        Returns:
+            Cassette: The loaded cassette.
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != FIXTURE_VERSION:
+            raise ValueError(f"Unsupported fixture version in {path}: {data.get('version')}")
+        return cls(path, data['interactions'])
+
+    def add(self, interaction):
+        """Append one exchange; safe to call from several threads."""
+        with self._lock:
+            self.interactions.append(interaction)
+
+    def save(self):
+        """Write the cassette to its fixture file."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            data = {'version': FIXTURE_VERSION, 'interactions': list(self.interactions)}
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        logger.info(f"Saved {len(data['interactions'])} HTTP exchanges to {self.path}")
+
+
+class RecordingAdapter(BaseAdapter):
+    """
+    Transport adapter that forwards requests and records each exchange.
+    """
+
+    def __init__(self, cassette, transport=None):
+        """
+        Initialize the adapter.
+
+        Args:
+            cassette (Cassette): Where exchanges are recorded.
+            transport (BaseAdapter, optional): Real transport; defaults to a new HTTPAdapter.
+        """
+        super().__init__()
+        self.cassette = cassette
+        self.transport = transport or HTTPAdapter()
+
+    def send(self, request, **kwargs):
+        started = time.perf_counter()
+        response = self.transport.send(request, **kwargs)
+        content = response.content  # Read now so the duration covers the whole body
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        self.cassette.add({
+            'request': {
+                'method': request.method,
+                'url': normalize_url(request.url),
+                'body': _encode_body(request.body, request.headers.get('Content-Type')),
+            },
+            'response': {
+                'status': response.status_code,
+                'reason': response.reason,
+                'headers': {k: v for k, v in response.headers.items() if k.lower() in RECORDED_HEADERS},
+                'body': _encode_body(content, response.headers.get('Content-Type')),
+            },
+            'elapsed_ms': round(elapsed_ms, 3),
+        })
+        return response
+
+    def close(self):
+        self.transport.close()
+
+    def save_at_exit(self):
+        """Save the cassette when the process exits, for env-driven recording."""
+        atexit.register(self.cassette.save)
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    Transport adapter that answers requests from a cassette.
+
+    Exchanges are matched on method and normalized URL (and optionally the
+    request body), in recorded order per match key. Once a key's exchanges
+    are used up, the last one is repeated, so a short recording can drive a
+    long benchmark.
+    """
+
+    def __init__(self, cassette, latency=LATENCY_ORIGINAL, match_body=False, repeat=True, speed=1.0):
+        """
+        Initialize the adapter.
+
+        Args:
+            cassette (Cassette): Recorded exchanges to serve.
+            latency (str): ``'original'`` to sleep for the recorded duration, ``'zero'`` not to.
+            match_body (bool): Also require identical request bodies.
+            repeat (bool): Repeat the last exchange for a key once its recordings run out.
+            speed (float): Divides recorded durations when replaying original timing.
+        """
+        super().__init__()
+        self.latency = parse_latency(latency)
+        self.match_body = match_body
+        self.repeat = repeat
+        self.speed = speed
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._queues = defaultdict(list)
+        self._positions = defaultdict(int)
+        for interaction in cassette.interactions:
+            request = interaction['request']
+            self._queues[self._key(request['method'], request['url'], request.get('body'))].append(interaction)
+
+    def send(self, request, **kwargs):
+        key = self._key(request.method, normalize_url(request.url),
+                        _encode_body(request.body, request.headers.get('Content-Type')))
+        with self._lock:
+            queue = self._queues.get(key)
+            position = self._positions[key]
+            if queue and (position < len(queue) or self.repeat):
+                interaction = queue[min(position, len(queue) - 1)]
+                self._positions[key] = position + 1
+                self.hits += 1
+            else:
+                interaction = None
+                self.misses += 1
+
+        if interaction is None:
+            raise ReplayMiss(f"No recorded exchange for {request.method} {normalize_url(request.url)}", request=request)
+
+        if self.latency == LATENCY_ORIGINAL and interaction['elapsed_ms']:
+            time.sleep(interaction['elapsed_ms'] / 1000.0 / self.speed)
+        return self._build_response(request, interaction)
+
+    def close(self):
+        pass
+
+    def _key(self, method, url, body):
+        if self.match_body:
+            return method, url, json.dumps(body, sort_keys=True)
+        return method, url
+
+    def _build_response(self, request, interaction):
+        recorded = interaction['response']
+        response = Response()
+        response.status_code = recorded['status']
+        response.reason = recorded.get('reason')
+        response.headers = CaseInsensitiveDict(recorded.get('headers', {}))
+        response._content = _decode_body(recorded.get('body', {}))
+        response.encoding = 'utf-8'
+        response.url = request.url
+        response.request = request
+        response.elapsed = timedelta(milliseconds=interaction['elapsed_ms'])
+        return response
+
+
+@contextmanager
+def recording(path):
+    """
+    Record all upstream traffic made through ``http_client`` into ``path``.
+
+    Yields:
+        Cassette: The cassette being recorded; saved when the block exits.
+    """
+    cassette = Cassette(path)
+    previous = http_client.mount(RecordingAdapter(cassette, http_client.session().get_adapter('https://')))
+    try:
+        yield cassette
+    finally:
+        http_client.restore(previous)
+        cassette.save()
+
+
+@contextmanager
+def replaying(path, latency=LATENCY_ORIGINAL, **options):
+    """
+    Serve all upstream traffic made through ``http_client`` from ``path``.
+
+    Args:
+        path (str): Fixture file recorded with ``recording``.
+        latency (str): ``'original'`` or ``'zero'``.
+        **options: Extra ``ReplayAdapter`` options.
+
+    Yields:
+        ReplayAdapter: The adapter, whose ``hits``/``misses`` can be checked.
+    """
+    adapter = ReplayAdapter(Cassette.load(path), latency=latency, **options)
+    previous = http_client.mount(adapter)
+    try:
+        yield adapter
+    finally:
+        http_client.restore(previous)
+
+
+def summarize(path):
+    """Print the exchanges in a fixture grouped by endpoint."""
+    groups = defaultdict(list)
+    for interaction in Cassette.load(path).interactions:
+        request = interaction['request']
+        groups[(request['method'], urlsplit(request['url']).path)].append(interaction)
+
+    print(f"📼 {path}")
+    for (method, path_), items in sorted(groups.items()):
+        durations = sorted(i['elapsed_ms'] for i in items)
+        statuses = sorted({i['response']['status'] for i in items})
+        print(f"   {method:6} {path_:60} x{len(items):<4} median {durations[len(durations) // 2]:8.1f} ms  status {statuses}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print("Usage: python http_replay.py <fixture.json> [...]")
+        sys.exit(1)
+    for fixture in sys.argv[1:]:
+        summarize(fixture)
@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+Load generator for end-to-end scenarios against the SkillsTown app.
+
+Virtual users pick weighted scenarios (anonymous search, register/login, CV
+upload, enroll, course page with a full quiz, profile views) and run them in
+a loop. Concurrency is stepped up stage by stage; each stage reports
+throughput, error rate and p50/p95/p99 latency per route, and the run ends
+with the concurrency where throughput stopped scaling.
+
+By default the app is started in-process from ``create_app`` on a fresh
+SQLite database, with ``mock_upstreams`` standing in for the quiz API and
+Gemini. To measure a real worker configuration, start the mocks and e.g.
+``gunicorn -w 4 'app:create_app()'`` yourself and pass ``--url``.
+
+    python loadtest.py --concurrency 1,4,16,32 --duration 20
+    python loadtest.py --url http://localhost:8000 --weights search=5,quiz=1
+    python loadtest.py --database-url postgresql://.../skillstown_seeded
+"""
+
+import argparse
+import io
+import json
+import os
+import random
+import re
+import socket
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict
+
+import requests
+
+import synthetic_data
+
+SCENARIO_WEIGHTS = {
+    'search': 30,
+    'register_login': 5,
+    'cv_upload': 5,
+    'enroll': 15,
+    'quiz': 10,
+    'profile': 35,
+}
+SEARCH_TERMS = ['python', 'machine learning', 'web development', 'data', 'cloud', 'project management',
+                'javascript react', 'security', 'sql databases', 'leadership']
+PASSWORD = 'loadtest-password'
+QUIZ_POLL_INTERVAL = 0.2
+QUIZ_POLL_TIMEOUT = 30
+REQUEST_TIMEOUT = 60
+# A stage still "scales" if throughput grew by at least this much
+KNEE_GROWTH = 0.10
+
+COURSE_LINK = re.compile(r'/course/(\d+)')
+
+
+class Stats:
+    """Latencies and errors per route for one stage."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.scenarios = defaultdict(int)
+        self.lock = threading.Lock()
+
+    def record(self, route, seconds, ok):
+        with self.lock:
+            self.latencies[route].append(seconds)
+            if not ok:
+                self.errors[route] += 1
+
+    def scenario(self, name):
+        with self.lock:
+            self.scenarios[name] += 1
+
+    def summary(self, concurrency, elapsed):
+        """
+        Summarise the stage.
+
+        Returns:
+            dict: totals plus per-route count, error rate and percentiles in ms.
+        """
+        routes = {}
+        total = errors = 0
+        for route, samples in sorted(self.latencies.items()):
+            samples = sorted(samples)
+            total += len(samples)
+            errors += self.errors[route]
+            routes[route] = {
+                'requests': len(samples),
+                'error_rate': round(self.errors[route] / len(samples), 4),
+                'p50_ms': round(percentile(samples, 50) * 1000, 1),
+                'p95_ms': round(percentile(samples, 95) * 1000, 1),
+                'p99_ms': round(percentile(samples, 99) * 1000, 1),
+            }
+        return {
+            'concurrency': concurrency,
+            'duration_s': round(elapsed, 2),
+            'requests': total,
+            'throughput_rps': round(total / elapsed, 2) if elapsed else 0.0,
+            'error_rate': round(errors / total, 4) if total else 0.0,
+            'scenarios': dict(self.scenarios),
+            'routes': routes,
+        }
+
+
+def percentile(sorted_samples, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_samples:
+        return 0.0
+    rank = max(0, min(len(sorted_samples) - 1, int(round(pct / 100 * len(sorted_samples) + 0.5)) - 1))
+    return sorted_samples[rank]
+
+
+class VirtualUser:
+    """
+    One simulated user with its own cookie session and account.
+    """
+
+    def __init__(self, base_url, rng, courses, cv_pdf):
+        self.base_url = base_url.rstrip('/')
+        self.rng = rng
+        self.courses = courses
+        self.cv_pdf = cv_pdf
+        self.http = requests.Session()
+        self.email = None
+        self.course_ids = []
+        self.stats = None
+
+    def call(self, route, method, path, expect=(200,), **kwargs):
+        """
+        Send one request and record it under ``route``.
+
+        Returns:
+            requests.Response or None: None if the request failed to complete.
+        """
+        kwargs.setdefault('allow_redirects', False)
+        kwargs.setdefault('timeout', REQUEST_TIMEOUT)
+        started = time.perf_counter()
+        try:
+            response = self.http.request(method, self.base_url + path, **kwargs)
+        except requests.RequestException:
+            if self.stats:
+                self.stats.record(route, time.perf_counter() - started, False)
+            return None
+        if self.stats:
+            self.stats.record(route, time.perf_counter() - started, response.status_code in expect)
+        return response
+
+    def json_call(self, route, method, path, expect=(200,), **kwargs):
+        """``call`` for JSON endpoints; returns the decoded body or None."""
+        response = self.call(route, method, path, expect, headers={'Accept': 'application/json'}, **kwargs)
+        if response is None or response.status_code not in expect:
+            return None
+        try:
+            return response.json()
+        except ValueError:
+            return None
+
+    # Account setup (runs before measuring, and inside register_login)
+
+    def register(self):
+        self.email = f"load-{uuid.uuid4().hex[:12]}@example.com"
+        self.call('POST /register', 'POST', '/register', expect=(302,),
+                  data={'name': 'Load Test', 'email': self.email, 'password': PASSWORD})
+
+    def enroll(self):
+        category, name = self.rng.choice(self.courses)
+        self.json_call('POST /enroll', 'POST', '/enroll', data={'course_name': name, 'category': category})
+
+    def refresh_course_ids(self):
+        response = self.call('GET /my-courses', 'GET', '/my-courses')
+        if response is not None and response.status_code == 200:
+            self.course_ids = sorted(set(COURSE_LINK.findall(response.text)))
+
+    def setup(self):
+        self.register()
+        for _ in range(2):
+            self.enroll()
+        self.refresh_course_ids()
+
+    # Scenarios
+
+    def search(self):
+        self.call('GET /', 'GET', '/')
+        self.call('GET /search', 'GET', '/search', params={'query': self.rng.choice(SEARCH_TERMS)})
+
+    def register_login(self):
+        self.call('GET /logout', 'GET', '/logout', expect=(302,))
+        self.register()
+        self.call('GET /logout', 'GET', '/logout', expect=(302,))
+        self.call('POST /login', 'POST', '/login', expect=(302,), data={'email': self.email, 'password': PASSWORD})
+        self.course_ids = []
+        self.enroll()
+        self.refresh_course_ids()
+
+    def cv_upload(self):
+        self.call('GET /assessment/upload', 'GET', '/assessment/upload')
+        self.call('POST /assessment/upload', 'POST', '/assessment/upload',
+                  files={'cv_file': ('cv.pdf', io.BytesIO(self.cv_pdf), 'application/pdf')})
+
+    def enroll_scenario(self):
+        self.call('GET /search', 'GET', '/search', params={'query': self.rng.choice(SEARCH_TERMS)})
+        self.enroll()
+        self.refresh_course_ids()
+
+    def quiz(self):
+        if not self.course_ids:
+            self.enroll_scenario()
+            if not self.course_ids:
+                return
+        course_id = self.rng.choice(self.course_ids)
+        self.call('GET /course/<id>', 'GET', f'/course/{course_id}')
+        self.json_call('GET /course/<id>/dashboard', 'GET', f'/course/{course_id}/dashboard')
+
+        started = self.json_call('POST /course/<id>/generate-quiz', 'POST', f'/course/{course_id}/generate-quiz',
+                                 expect=(200, 202))
+        status = started
+        deadline = time.monotonic() + QUIZ_POLL_TIMEOUT
+        while status and status.get('status') not in ('done', 'failed') and time.monotonic() < deadline:
+            time.sleep(QUIZ_POLL_INTERVAL)
+            status = self.json_call('GET /course/<id>/quiz-status', 'GET', f'/course/{course_id}/quiz-status')
+        if not status or status.get('status') != 'done':
+            if self.stats:
+                self.stats.record('quiz generation', 0.0, False)
+            return
+
+        quiz_id = status['quiz_id']
+        details = self.json_call('GET /quiz/<id>/details', 'GET', f'/quiz/{quiz_id}/details')
+        attempt = self.json_call('POST /quiz/<id>/start', 'POST', f'/quiz/{quiz_id}/start')
+        if not details or not attempt:
+            return
+        questions = (details.get('quiz') or details).get('questions', [])
+        answers = [self.rng.randrange(len(q.get('options') or [0])) for q in questions]
+        attempt_id = attempt.get('attemptId', attempt.get('id'))
+        self.json_call('POST /quiz/attempt/<id>/complete', 'POST', f'/quiz/attempt/{attempt_id}/complete',
+                       json={'answers': answers})
+
+    def profile(self):
+        self.call('GET /profile', 'GET', '/profile')
+        self.call('GET /my-courses', 'GET', '/my-courses')
+        if self.course_ids:
+            self.json_call('GET /course/<id>/quiz-attempts', 'GET',
+                           f'/course/{self.rng.choice(self.course_ids)}/quiz-attempts')
+
+
+SCENARIO_METHODS = {
+    'search': VirtualUser.search,
+    'register_login': VirtualUser.register_login,
+    'cv_upload': VirtualUser.cv_upload,
+    'enroll': VirtualUser.enroll_scenario,
+    'quiz': VirtualUser.quiz,
+    'profile': VirtualUser.profile,
+}
+
+
+def parse_weights(spec):
+    """
+    Parse ``name=weight,...`` overrides on top of SCENARIO_WEIGHTS.
+
+    Raises:
+        ValueError: For unknown scenarios or non-numeric weights.
+    """
+    weights = dict(SCENARIO_WEIGHTS)
+    for item in (spec or '').split(','):
+        if not item.strip():
+            continue
+        name, _, weight = item.partition('=')
+        if name.strip() not in weights:
+            raise ValueError(f"Unknown scenario '{name.strip()}'; choose from {', '.join(weights)}")
+        weights[name.strip()] = float(weight)
+    return {name: weight for name, weight in weights.items() if weight > 0}
+
+
+def run_stage(users, concurrency, duration, weights):
+    """
+    Run ``concurrency`` virtual users for ``duration`` seconds.
+
+    Returns:
+        dict: The stage summary from ``Stats.summary``.
+    """
+    stats = Stats()
+    names = list(weights)
+    scenario_weights = [weights[name] for name in names]
+    stop = threading.Event()
+
+    def loop(user):
+        user.stats = stats
+        while not stop.is_set():
+            name = user.rng.choices(names, scenario_weights)[0]
+            stats.scenario(name)
+            SCENARIO_METHODS[name](user)
+
+    threads = [threading.Thread(target=loop, args=(user,), daemon=True) for user in users[:concurrency]]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join(REQUEST_TIMEOUT)
+    return stats.summary(concurrency, time.perf_counter() - started)
+
+
+def find_knee(stages):
+    """
+    Return the highest concurrency at which throughput was still scaling.
+
+    A stage scales when its throughput is at least KNEE_GROWTH above the
+    previous stage's and its error rate is at most one point higher.
+    """
+    knee = stages[0]['concurrency'] if stages else None
+    for previous, current in zip(stages, stages[1:]):
+        if (current['throughput_rps'] < previous['throughput_rps'] * (1 + KNEE_GROWTH)
+                or current['error_rate'] > previous['error_rate'] + 0.01):
+            break
+        knee = current['concurrency']
+    return knee
+
+
+def print_stage(summary):
+    print(f"\n📈 concurrency={summary['concurrency']}  {summary['throughput_rps']} req/s  "
+          f"errors={summary['error_rate']:.2%}  requests={summary['requests']}")
+    print(f"   {'route':<38} {'count':>7} {'err%':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for route, data in summary['routes'].items():
+        print(f"   {route:<38} {data['requests']:>7} {data['error_rate']:>6.1%} "
+              f"{data['p50_ms']:>9.1f} {data['p95_ms']:>9.1f} {data['p99_ms']:>9.1f}")
+
+
+def free_port():
+    """Ask the OS for an unused local port."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_local_app(args):
+    """
+    Start the mock upstreams and the app in this process.
+
+    Upstream URLs and keys are read at import time by ``app`` and
+    ``skill_extractor``, so the environment is set before either is imported.
+
+    Returns:
+        tuple: (base_url, servers to shut down).
+    """
+    quiz_port, gemini_port = free_port(), free_port()
+    database_url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='skillstown-load-'), 'load.db')}"
+    os.environ.update({
+        'QUIZ_API_BASE_URL': f"http://127.0.0.1:{quiz_port}",
+        'GEMINI_API_URL': f"http://127.0.0.1:{gemini_port}/v1/models/gemini-2.0-flash:generateContent",
+        'GEMINI_API_KEY': 'mock',
+        'DATABASE_URL': database_url,
+        'BOOT_MODE': 'full',
+    })
+
+    import mock_upstreams
+    from app import create_app
+
+    def behaviour(offset):
+        profile = mock_upstreams.FaultProfile(mock_upstreams.LatencyModel.parse(args.upstream_latency),
+                                              args.upstream_error_rate)
+        return mock_upstreams.MockBehaviour(profile, seed=args.seed + offset)
+
+    servers = [
+        mock_upstreams.serve_in_thread(create_app()),
+        mock_upstreams.serve_in_thread(mock_upstreams.create_quiz_api(behaviour(0)), port=quiz_port),
+        mock_upstreams.serve_in_thread(mock_upstreams.create_gemini_api(behaviour(1)), port=gemini_port),
+    ]
+    print(f"🧪 App on http://127.0.0.1:{servers[0].port} ({database_url}), mocks on ports {quiz_port}/{gemini_port}")
+    return f"http://127.0.0.1:{servers[0].port}", servers
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Load test the SkillsTown app with weighted scenarios')
+    parser.add_argument('--url', help='Target an already running app instead of starting one in-process')
+    parser.add_argument('--database-url', help='Database for the in-process app (default: fresh SQLite file)')
+    parser.add_argument('--concurrency', default='1,2,4,8,16', help='Comma-separated virtual user counts, one stage each')
+    parser.add_argument('--duration', type=float, default=15, help='Seconds per stage')
+    parser.add_argument('--weights', help='Scenario weight overrides, e.g. search=50,quiz=0')
+    parser.add_argument('--upstream-latency', default='lognormal:100,0.5', help='Mock upstream latency spec (in-process only)')
+    parser.add_argument('--upstream-error-rate', type=float, default=0.0, help='Mock upstream 500 rate (in-process only)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Write all stage summaries as JSON to this file')
+    args = parser.parse_args()
+
+    try:
+        weights = parse_weights(args.weights)
+        levels = sorted({int(level) for level in args.concurrency.split(',') if level.strip()})
+    except ValueError as e:
+        parser.error(str(e))
+
+    servers = []
+    base_url = args.url
+    if not base_url:
+        base_url, servers = start_local_app(args)
+
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'data', 'course_catalog.json')) as f:
+        catalog = json.load(f)
+    courses = [(category['name'], course['name']) for category in catalog['categories'] for course in category['courses']]
+
+    pdf_path = os.path.join(tempfile.mkdtemp(prefix='skillstown-load-'), 'cv.pdf')
+    synthetic_data.write_pdf(pdf_path, synthetic_data.make_cv_text(4000, seed=args.seed))
+    with open(pdf_path, 'rb') as f:
+        cv_pdf = f.read()
+
+    print(f"👥 Creating {max(levels)} virtual users...")
+    users = [VirtualUser(base_url, random.Random(args.seed * 10007 + i), courses, cv_pdf) for i in range(max(levels))]
+    for user in users:
+        user.setup()
+
+    print(f"🚀 Load testing {base_url}: stages {levels}, {args.duration:g}s each, weights {weights}")
+    stages = []
+    for level in levels:
+        summary = run_stage(users, level, args.duration, weights)
+        stages.append(summary)
+        print_stage(summary)
+
+    knee = find_knee(stages)
+    print("\n" + "=" * 50)
+    print(f"{'users':>6} {'req/s':>9} {'errors':>8}")
+    for summary in stages:
+        print(f"{summary['concurrency']:>6} {summary['throughput_rps']:>9.1f} {summary['error_rate']:>8.2%}")
+    print(f"\n🎯 Throughput stops scaling after {knee} concurrent users")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'target': base_url, 'weights': weights, 'stages': stages, 'knee_concurrency': knee}, f, indent=2)
+        print(f"💾 Results written to {args.output}")
+
+    for server in servers:
+        server.shutdown()
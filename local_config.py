@@ -19,8 +19,7 @@ LOCAL_DATABASE_URL = "sqlite:///skillstown_local.db"
 UPLOAD_FOLDER = os.path.join(os.path.dirname(__file__), 'uploads')
 MAX_CONTENT_LENGTH = 10 * 1024 * 1024  # 10MB
 
-# Ensure upload directory exists
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+# The upload directory is created on first upload, not at import time
 
 # API Keys (set these as environment variables)
 REQUIRED_ENV_VARS = [
@@ -0,0 +1,198 @@
+"""
+Logging configuration for the SkillsTown CV Analyzer application.
+
+Request threads never write log output themselves: records go through a
+``QueueHandler`` into a bounded in-memory queue and a single listener thread
+formats and writes them. When the queue is full records are dropped (and
+counted) instead of blocking the request.
+
+Environment:
+
+* ``LOG_LEVEL``: root level (default ``INFO``).
+* ``LOG_LEVELS``: per-module levels, e.g. ``app=DEBUG,werkzeug=WARNING``.
+* ``LOG_FORMAT``: ``json`` (one object per line) or ``text`` (default).
+* ``LOG_DEBUG_SAMPLE_RATE``: fraction of DEBUG records kept (default 1.0).
+* ``LOG_MAX_MESSAGE``: messages longer than this are truncated (default 2000).
+* ``LOG_QUEUE_SIZE``: records buffered before dropping (default 10000).
+
+JSON output uses ``python-json-logger`` when it is installed.
+"""
+
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+from datetime import datetime, timezone
+
+import metrics
+
+try:
+    from pythonjsonlogger import jsonlogger
+except ImportError:  # Optional dependency
+    jsonlogger = None
+
+TEXT_FORMAT = '%(asctime)s %(levelname)s [%(name)s] %(message)s'
+JSON_FIELDS = '%(asctime)s %(levelname)s %(name)s %(message)s'
+
+LOG_RECORDS_DROPPED = metrics.counter('skillstown_log_records_dropped_total',
+                                      'Log records dropped because the log queue was full')
+LOG_RECORDS_SAMPLED = metrics.counter('skillstown_log_records_sampled_total',
+                                      'DEBUG log records skipped by sampling')
+
+_listener = None
+_lock = threading.Lock()
+
+
+def truncate(text, limit):
+    """
+    Shorten ``text`` to at most ``limit`` characters, noting how much was cut.
+
+    Args:
+        text (str): Text to shorten.
+        limit (int): Maximum length kept.
+
+    Returns:
+        str: The text, or its head followed by ``...[N chars truncated]``.
+    """
+    if limit <= 0 or len(text) <= limit:
+        return text
+    return f"{text[:limit]}...[{len(text) - limit} chars truncated]"
+
+
+class DebugSampler(logging.Filter):
+    """Keep only a fraction of DEBUG records; other levels always pass."""
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG or self.rate >= 1.0:
+            return True
+        if random.random() < self.rate:
+            return True
+        LOG_RECORDS_SAMPLED.inc()
+        return False
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    ``QueueHandler`` that truncates long messages and drops records when full.
+    """
+
+    def __init__(self, log_queue, max_message):
+        super().__init__(log_queue)
+        self.max_message = max_message
+
+    def prepare(self, record):
+        # Truncate the message only; tracebacks are kept whole
+        record = copy.copy(record)
+        record.msg = truncate(record.getMessage(), self.max_message)
+        record.args = None
+        return super().prepare(record)
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc()
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record; used when python-json-logger is missing."""
+
+    def format(self, record):
+        entry = {
+            'asctime': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'levelname': record.levelname,
+            'name': record.name,
+            'message': record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc_info'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+def _formatter(log_format):
+    if log_format != 'json':
+        return logging.Formatter(TEXT_FORMAT)
+    if jsonlogger is not None:
+        return jsonlogger.JsonFormatter(JSON_FIELDS)
+    return JsonFormatter()
+
+
+def parse_levels(spec):
+    """
+    Parse a ``module=LEVEL,...`` list.
+
+    Args:
+        spec (str): e.g. ``app=DEBUG,werkzeug=WARNING``.
+
+    Returns:
+        dict: logger name -> level name; malformed entries are skipped.
+    """
+    levels = {}
+    for item in (spec or '').split(','):
+        name, _, level = item.partition('=')
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def configure_logging(stream=None):
+    """
+    Route all logging through the queue; safe to call more than once.
+
+    Args:
+        stream: Where the listener writes (default ``sys.stderr``).
+
+    Returns:
+        logging.handlers.QueueListener: The running listener.
+    """
+    global _listener
+    with _lock:
+        if _listener is not None:
+            return _listener
+
+        output = logging.StreamHandler(stream or sys.stderr)
+        output.setFormatter(_formatter(os.environ.get('LOG_FORMAT', 'text').lower()))
+
+        log_queue = queue.Queue(int(os.environ.get('LOG_QUEUE_SIZE', 10000)))
+        handler = NonBlockingQueueHandler(log_queue, int(os.environ.get('LOG_MAX_MESSAGE', 2000)))
+        handler.addFilter(DebugSampler(float(os.environ.get('LOG_DEBUG_SAMPLE_RATE', 1.0))))
+
+        root = logging.getLogger()
+        for existing in list(root.handlers):
+            root.removeHandler(existing)
+        root.addHandler(handler)
+        root.setLevel(os.environ.get('LOG_LEVEL', 'INFO').upper())
+
+        for name, level in parse_levels(os.environ.get('LOG_LEVELS')).items():
+            logging.getLogger(name).setLevel(level)
+
+        _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+        _listener.start()
+        atexit.register(stop_listener)
+        # Forked workers (gunicorn --preload) need their own listener thread
+        os.register_at_fork(after_in_child=_restart_listener)
+        return _listener
+
+
+def stop_listener():
+    """Flush queued records and stop the listener thread."""
+    if _listener is not None and _listener._thread is not None:
+        _listener.stop()
+
+
+def _restart_listener():
+    if _listener is not None:
+        _listener._thread = None
+        _listener.start()
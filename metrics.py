@@ -0,0 +1,455 @@
+"""
+In-process metrics for the SkillsTown CV Analyzer application.
+
+Counters and histograms are kept in a process-wide registry and exposed in
+the Prometheus text format at ``/metrics``. Under gunicorn each worker has
+its own registry, so when ``METRICS_MULTIPROC_DIR`` is set every worker
+periodically writes a snapshot file there and ``/metrics`` merges all of
+them; counters of workers that have exited keep counting, as Prometheus
+expects. Files are named after the pid plus a random suffix, so a worker
+that gets a recycled pid never overwrites an exited worker's file. Their files are folded into a single ``metrics-dead.json`` total,
+so the directory does not grow with every worker restart.
+"""
+
+import atexit
+import fcntl
+import json
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+FLUSH_INTERVAL = float(os.environ.get('METRICS_FLUSH_INTERVAL', 5))
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class Counter:
+    """
+    A monotonically increasing count, optionally split by labels.
+    """
+
+    kind = 'counter'
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        """Add ``amount`` to the series selected by ``labels``."""
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def snapshot(self):
+        with self._lock:
+            return [[list(key), value] for key, value in self._values.items()]
+
+
+class Histogram:
+    """
+    A distribution of observed values (seconds, by convention) in fixed buckets.
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}  # label key -> [per-bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        """Record one observation in the series selected by ``labels``."""
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def time(self, **labels):
+        """Context manager observing the duration of a block."""
+        return _Timer(self, labels)
+
+    def snapshot(self):
+        with self._lock:
+            return [[list(key), list(series)] for key, series in self._values.items()]
+
+
+class _Timer:
+    __slots__ = ('histogram', 'labels', 'started')
+
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.histogram.observe(time.perf_counter() - self.started, **self.labels)
+        return False
+
+
+class Registry:
+    """
+    Named metrics of one process.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name, help_text, labelnames=()):
+        """Get or create a counter."""
+        return self._get_or_create(Counter, name, help_text, labelnames)
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        """Get or create a histogram."""
+        return self._get_or_create(Histogram, name, help_text, labelnames, buckets=buckets)
+
+    def snapshot(self):
+        """
+        Return every metric as plain data, suitable for JSON and ``merge``.
+
+        Returns:
+            dict: name -> {kind, help, labels, buckets?, series}.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        data = {}
+        for metric in metrics:
+            entry = {'kind': metric.kind, 'help': metric.help,
+                     'labels': list(metric.labelnames), 'series': metric.snapshot()}
+            if metric.kind == 'histogram':
+                entry['buckets'] = list(metric.buckets)
+            data[metric.name] = entry
+        return data
+
+    def _get_or_create(self, cls, name, help_text, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help_text, labelnames, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} already registered as a {metric.kind}")
+            return metric
+
+
+REGISTRY = Registry()
+counter = REGISTRY.counter
+histogram = REGISTRY.histogram
+
+
+def merge(snapshots):
+    """
+    Sum several registry snapshots (one per worker) into one.
+
+    Args:
+        snapshots (list): Values returned by ``Registry.snapshot``.
+
+    Returns:
+        dict: The combined snapshot.
+    """
+    merged = {}
+    for snapshot in snapshots:
+        for name, entry in snapshot.items():
+            target = merged.setdefault(name, {**entry, 'series': {}})
+            for key, value in entry['series']:
+                key = tuple(key)
+                current = target['series'].get(key)
+                if current is None:
+                    target['series'][key] = list(value) if isinstance(value, list) else value
+                elif isinstance(value, list):
+                    target['series'][key] = [a + b for a, b in zip(current, value)]
+                else:
+                    target['series'][key] = current + value
+    for entry in merged.values():
+        entry['series'] = [[list(key), value] for key, value in entry['series'].items()]
+    return merged
+
+
+def render(snapshot):
+    """
+    Format a snapshot in the Prometheus text exposition format.
+
+    Args:
+        snapshot (dict): A registry snapshot, possibly merged.
+
+    Returns:
+        str: The exposition text.
+    """
+    lines = []
+    for name in sorted(snapshot):
+        entry = snapshot[name]
+        lines.append(f"# HELP {name} {entry['help']}")
+        lines.append(f"# TYPE {name} {entry['kind']}")
+        for key, value in sorted(entry['series'], key=lambda item: item[0]):
+            labels = list(zip(entry['labels'], key))
+            if entry['kind'] == 'counter':
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip(entry['buckets'] + ['+Inf'], value[:-1]):
+                cumulative += count
+                le = bound if bound == '+Inf' else _format_value(bound)
+                lines.append(f"{name}_bucket{_format_labels(labels + [('le', le)])} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(value[-1])}")
+            lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+    return '\n'.join(lines) + '\n'
+
+
+def _format_labels(pairs):
+    if not pairs:
+        return ''
+    escaped = (f'{k}="{_escape(v)}"' for k, v in pairs)
+    return '{' + ','.join(escaped) + '}'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+# Snapshot file of one worker: its pid plus a random suffix per process
+_WORKER_FILE = re.compile(r'^metrics-(\d+)(?:-[0-9a-f]+)?\.json$')
+# Combined snapshot of workers that have exited
+DEAD_WORKERS_FILE = 'metrics-dead.json'
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _read_snapshot(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_snapshot(path, snapshot):
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f)
+    os.replace(tmp, path)
+
+
+class MultiprocessStore:
+    """
+    Shares worker snapshots through files in a directory.
+    """
+
+    def __init__(self, directory, registry=REGISTRY):
+        self.directory = directory
+        self.registry = registry
+        self.interval = FLUSH_INTERVAL
+        self._flusher_pid = None
+        self._file_pid = None
+        self._file_name = None
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def path(self):
+        # Resolved on every write: gunicorn forks workers after the app is imported.
+        # The suffix keeps a worker that reuses an exited worker's pid from
+        # overwriting that worker's file before it is folded.
+        pid = os.getpid()
+        if self._file_pid != pid:
+            self._file_pid, self._file_name = pid, f"metrics-{pid}-{uuid.uuid4().hex[:12]}.json"
+        return os.path.join(self.directory, self._file_name)
+
+    def flush(self):
+        """Atomically write this process's snapshot."""
+        _write_snapshot(self.path, self.registry.snapshot())
+
+    def fold_dead_workers(self):
+        """
+        Merge the files of workers that have exited into ``DEAD_WORKERS_FILE``
+        and delete them. Their counts stay in the total; only the file goes.
+
+        Returns:
+            int: Number of worker files folded.
+        """
+        dead = []
+        for filename in os.listdir(self.directory):
+            match = _WORKER_FILE.match(filename)
+            if match and not _pid_alive(int(match.group(1))):
+                dead.append(filename)
+        if not dead:
+            return 0
+
+        dead_path = os.path.join(self.directory, DEAD_WORKERS_FILE)
+        # Workers collect concurrently; the lock keeps each file from being counted twice
+        with open(os.path.join(self.directory, '.metrics.lock'), 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            snapshots = [_read_snapshot(dead_path)] if os.path.exists(dead_path) else []
+            folded = []
+            for filename in dead:
+                path = os.path.join(self.directory, filename)
+                try:
+                    snapshots.append(_read_snapshot(path))
+                except FileNotFoundError:
+                    continue
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Dropping unreadable metrics file {filename}: {e}")
+                folded.append(path)
+            if folded:
+                _write_snapshot(dead_path, merge(snapshots))
+                for path in folded:
+                    os.remove(path)
+        return len(folded)
+
+    def collect(self):
+        """Flush this process, fold exited workers, then merge all snapshots."""
+        self.flush()
+        try:
+            self.fold_dead_workers()
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not fold metrics of exited workers: {e}")
+        snapshots = []
+        for filename in os.listdir(self.directory):
+            if not (filename.startswith('metrics-') and filename.endswith('.json')):
+                continue
+            try:
+                with open(os.path.join(self.directory, filename), 'r', encoding='utf-8') as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable metrics file {filename}: {e}")
+        return merge(snapshots)
+
+    def start_flusher(self):
+        """
+        Flush in the background so idle workers still report, and at exit.
+        Restarted in forked children, since threads do not survive a fork.
+        """
+        if self._flusher_pid == os.getpid():
+            return
+        if self._flusher_pid is None:
+            atexit.register(self.flush)
+            os.register_at_fork(after_in_child=self.start_flusher)
+        self._flusher_pid = os.getpid()
+        threading.Thread(target=self._flush_loop, name='metrics-flush', daemon=True).start()
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.flush()
+            except OSError as e:
+                logger.warning(f"Metrics flush failed: {e}")
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Return the multiprocess store when ``METRICS_MULTIPROC_DIR`` is set, else None."""
+    global _store
+    directory = os.environ.get('METRICS_MULTIPROC_DIR')
+    if not directory:
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = MultiprocessStore(directory)
+        return _store
+
+
+def exposition():
+    """Prometheus text for this process, or for all workers in multiprocess mode."""
+    store = get_store()
+    return render(store.collect() if store else REGISTRY.snapshot())
+
+
+# Metrics shared by several modules
+REQUESTS = counter('skillstown_http_requests_total', 'HTTP requests handled', ('endpoint', 'method', 'status'))
+REQUEST_DURATION = histogram('skillstown_http_request_duration_seconds', 'HTTP request latency', ('endpoint',))
+UPSTREAM_REQUESTS = counter('skillstown_upstream_requests_total', 'Calls to upstream services', ('service', 'status'))
+UPSTREAM_DURATION = histogram('skillstown_upstream_request_duration_seconds', 'Upstream call latency', ('service',))
+CACHE_LOOKUPS = counter('skillstown_cache_lookups_total', 'Cache lookups by outcome', ('cache', 'result'))
+EXTRACTION_DURATION = histogram('skillstown_skill_extraction_duration_seconds', 'Skill extraction latency', ('method',))
+EXTRACTION_FALLBACKS = counter('skillstown_skill_extraction_fallbacks_total', 'Skill extractions that used the fallback', ('reason',))
+FILE_EXTRACTION_DURATION = histogram('skillstown_file_extraction_duration_seconds', 'Text extraction latency by file type', ('extension',))
+DB_QUERIES = counter('skillstown_db_queries_total', 'Database statements executed', ('endpoint', 'operation'))
+DB_QUERY_DURATION = histogram('skillstown_db_query_duration_seconds', 'Database statement latency', ('operation',),
+                              buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0))
+
+_OPERATION = re.compile(r'\s*(\w+)')
+
+
+def statement_operation(statement):
+    """The leading SQL keyword of a statement (select/insert/...), lower-cased."""
+    match = _OPERATION.match(statement)
+    return match.group(1).lower() if match else 'other'
+
+
+def init_app(app):
+    """
+    Count and time every request of ``app`` and every database statement.
+
+    Args:
+        app (Flask): The application.
+    """
+    from flask import g, request
+
+    @app.before_request
+    def start_request_timer():
+        g._metrics_started = time.perf_counter()
+
+    @app.after_request
+    def record_request(response):
+        started = g.pop('_metrics_started', None)
+        endpoint = request.endpoint or 'unmatched'
+        REQUESTS.inc(endpoint=endpoint, method=request.method, status=response.status_code)
+        if started is not None:
+            REQUEST_DURATION.observe(time.perf_counter() - started, endpoint=endpoint)
+        return response
+
+    # Statement timings arrive through observe_statement from query_monitor's cursor hook
+    import query_monitor
+    query_monitor.install_statement_hooks()
+
+    store = get_store()
+    if store:
+        store.start_flusher()
+
+
+def observe_statement(statement, seconds):
+    """
+    Count a database statement and record its duration.
+
+    Args:
+        statement (str): The SQL that ran.
+        seconds (float): How long it took.
+    """
+    from flask import has_request_context, request
+
+    operation = statement_operation(statement)
+    endpoint = (request.endpoint or 'unmatched') if has_request_context() else 'background'
+    DB_QUERIES.inc(endpoint=endpoint, operation=operation)
+    DB_QUERY_DURATION.observe(seconds, operation=operation)
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Data migration: convert JSON text blobs to native JSON columns
+PostgreSQL columns become JSONB; on SQLite the stored text is normalized
+so the JSON1 functions can read it. Rows are converted in batches.
+"""
+
+import os
+import sys
+import json
+from sqlalchemy import create_engine, text
+
+# (table, column) pairs that are declared as JSONType in models.py
+JSON_COLUMNS = [
+    ('skillstown_user_profiles', 'skill_analysis'),
+    ('skillstown_course_details', 'materials'),
+    ('skillstown_course_details', 'quiz_results'),
+    ('skillstown_quiz_attempts', 'user_answers'),
+]
+
+BATCH_SIZE = int(os.environ.get('MIGRATION_BATCH_SIZE', 1000))
+
+def get_database_url():
+    """Get database URL from environment"""
+    db_url = os.environ.get('DATABASE_URL')
+    if db_url and db_url.startswith('postgres://'):
+        db_url = db_url.replace('postgres://', 'postgresql://')
+    return db_url or 'sqlite:///skillstown.db'
+
+def normalize_json(raw):
+    """Turn a legacy text value into a JSON document string (or None)"""
+    if raw is None:
+        return None
+    if not isinstance(raw, str):
+        return json.dumps(raw)
+    if not raw.strip():
+        return None
+    try:
+        return json.dumps(json.loads(raw))
+    except ValueError:
+        # Keep unparseable text instead of dropping it
+        return json.dumps(raw)
+
+def iter_batches(conn, table, column, where=''):
+    """Yield (id, value) rows in primary key order, BATCH_SIZE at a time"""
+    last_id = 0
+    while True:
+        rows = conn.execute(text(
+            f"SELECT id, {column} FROM {table} WHERE id > :last_id {where} ORDER BY id LIMIT :limit"
+        ), {'last_id': last_id, 'limit': BATCH_SIZE}).fetchall()
+        if not rows:
+            break
+        yield rows
+        last_id = rows[-1][0]
+
+def migrate_postgresql_column(conn, table, column):
+    """Copy a TEXT column into a new JSONB column in batches, then swap them"""
+    data_type = conn.execute(text("""
+        SELECT data_type FROM information_schema.columns
+        WHERE table_name = :table AND column_name = :column
+    """), {'table': table, 'column': column}).scalar()
+    conn.commit()
+
+    if data_type is None:
+        print(f"⚠️  {table}.{column} does not exist, skipping")
+        return
+    if data_type == 'jsonb':
+        print(f"✅ {table}.{column} is already JSONB")
+        return
+
+    staging = f"{column}_jsonb"
+    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {staging} JSONB"))
+    conn.commit()
+
+    update = text(f"UPDATE {table} SET {staging} = CAST(:value AS JSONB) WHERE id = :id")
+    converted = 0
+    for rows in iter_batches(conn, table, column, where=f"AND {column} IS NOT NULL"):
+        conn.execute(update, [{'id': row[0], 'value': normalize_json(row[1])} for row in rows])
+        conn.commit()
+        converted += len(rows)
+        print(f"   {table}.{column}: {converted} rows converted")
+
+    # Catch rows written while the batches ran, then swap under a short lock
+    conn.execute(text(f"LOCK TABLE {table} IN EXCLUSIVE MODE"))
+    for rows in iter_batches(conn, table, column, where=f"AND {column} IS NOT NULL AND {staging} IS NULL"):
+        conn.execute(update, [{'id': row[0], 'value': normalize_json(row[1])} for row in rows])
+    conn.execute(text(f"ALTER TABLE {table} DROP COLUMN {column}"))
+    conn.execute(text(f"ALTER TABLE {table} RENAME COLUMN {staging} TO {column}"))
+    conn.commit()
+    print(f"✅ {table}.{column} converted to JSONB")
+
+def migrate_sqlite_column(conn, table, column):
+    """Rewrite legacy values in place so every stored value is valid JSON"""
+    columns = [row[1] for row in conn.execute(text(f"PRAGMA table_info({table})"))]
+    if column not in columns:
+        print(f"⚠️  {table}.{column} does not exist, skipping")
+        return
+
+    update = text(f"UPDATE {table} SET {column} = :value WHERE id = :id")
+    rewritten = 0
+    for rows in iter_batches(conn, table, column, where=f"AND {column} IS NOT NULL"):
+        changes = []
+        for row_id, raw in rows:
+            value = normalize_json(raw)
+            if value != raw:
+                changes.append({'id': row_id, 'value': value})
+        if changes:
+            conn.execute(update, changes)
+            conn.commit()
+            rewritten += len(changes)
+    print(f"✅ {table}.{column}: {rewritten} rows normalized")
+
+def run_json_migration(db_url=None):
+    """Convert every JSON blob column listed in JSON_COLUMNS"""
+    print("🗄️  Converting JSON text columns to native JSON...")
+    print("=" * 50)
+
+    db_url = db_url or get_database_url()
+    print(f"Database URL: {db_url}")
+
+    engine = create_engine(db_url)
+    is_postgresql = engine.dialect.name == 'postgresql'
+
+    try:
+        with engine.connect() as conn:
+            for table, column in JSON_COLUMNS:
+                print(f"📝 Migrating {table}.{column}...")
+                if is_postgresql:
+                    migrate_postgresql_column(conn, table, column)
+                else:
+                    migrate_sqlite_column(conn, table, column)
+        return True
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+if __name__ == '__main__':
+    if run_json_migration():
+        print("\n🎉 JSON column migration completed successfully!")
+    else:
+        print("\n❌ JSON column migration failed!")
+        sys.exit(1)
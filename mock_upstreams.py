@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+Local stand-ins for the external quiz API and the Gemini generateContent
+endpoint, for load testing and benchmarking without touching real services.
+
+Both servers inject configurable latency, 5xx errors and 429s. All random
+choices come from a seeded generator, so a given seed and request order
+always produce the same sequence of latencies, faults and quiz content.
+
+Usage:
+    python mock_upstreams.py --latency lognormal:150,0.5 --error-rate 0.01 --rate-limit-rate 0.02
+
+Then point the app at them:
+    QUIZ_API_BASE_URL=http://localhost:8081
+    GEMINI_API_URL=http://localhost:8082/v1/models/gemini-2.0-flash:generateContent
+    GEMINI_API_KEY=mock
+"""
+
+import argparse
+import json
+import logging
+import math
+import random
+import re
+import threading
+import time
+import uuid
+
+from flask import Flask, jsonify, request
+from werkzeug.serving import make_server
+
+DEFAULT_QUIZ_PORT = 8081
+DEFAULT_GEMINI_PORT = 8082
+QUESTIONS_PER_QUIZ = 5
+
+
+class LatencyModel:
+    """
+    A latency distribution, sampled in seconds.
+
+    Specs are ``kind:params`` with values in milliseconds:
+    ``fixed:50``, ``uniform:20,200``, ``normal:100,30``,
+    ``lognormal:100,0.5`` (median, sigma) and ``exp:100`` (mean).
+    """
+
+    KINDS = {'fixed': 1, 'uniform': 2, 'normal': 2, 'lognormal': 2, 'exp': 1}
+
+    def __init__(self, kind='fixed', params=(0,)):
+        if kind not in self.KINDS or len(params) != self.KINDS[kind]:
+            raise ValueError(f"Invalid latency model: {kind}{list(params)}")
+        self.kind = kind
+        self.params = tuple(float(p) for p in params)
+
+    @classmethod
+    def parse(cls, spec):
+        """
+        Build a model from a spec string such as ``lognormal:100,0.5``.
+
+        Args:
+            spec (str): Distribution spec; a bare number means ``fixed``.
+
+        Returns:
+            LatencyModel: The parsed model.
+        """
+        kind, _, params = spec.partition(':')
+        if not params:
+            return cls('fixed', (kind,))
+        return cls(kind, params.split(','))
+
+    def sample(self, rng):
+        """Draw one latency in seconds from ``rng``."""
+        p = self.params
+        if self.kind == 'fixed':
+            ms = p[0]
+        elif self.kind == 'uniform':
+            ms = rng.uniform(p[0], p[1])
+        elif self.kind == 'normal':
+            ms = rng.gauss(p[0], p[1])
+        elif self.kind == 'lognormal':
+            ms = rng.lognormvariate(math.log(max(p[0], 1e-3)), p[1])
+        else:
+            ms = rng.expovariate(1.0 / p[0]) if p[0] > 0 else 0
+        return max(ms, 0) / 1000.0
+
+    def __repr__(self):
+        return f"{self.kind}:{','.join(f'{p:g}' for p in self.params)}"
+
+
+class FaultProfile:
+    """
+    Latency and failure behaviour of one route (or of a whole server).
+    """
+
+    def __init__(self, latency=None, error_rate=0.0, rate_limit_rate=0.0, max_rps=None, retry_after=1):
+        """
+        Initialize the profile.
+
+        Args:
+            latency (LatencyModel, optional): Added delay; defaults to none.
+            error_rate (float): Probability of a 500 response.
+            rate_limit_rate (float): Probability of a random 429 response.
+            max_rps (float, optional): Requests per second allowed before 429s.
+            retry_after (int): Seconds sent in the ``Retry-After`` header of 429s.
+        """
+        self.latency = latency or LatencyModel()
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.max_rps = max_rps
+        self.retry_after = retry_after
+
+
+class MockBehaviour:
+    """
+    Seeded fault injection shared by every route of a mock server.
+    """
+
+    def __init__(self, default=None, routes=None, seed=0):
+        """
+        Initialize the behaviour.
+
+        Args:
+            default (FaultProfile, optional): Profile for routes without their own.
+            routes (dict, optional): Route name -> FaultProfile overrides.
+            seed (int): Seed for latency, fault and content generation.
+        """
+        self.default = default or FaultProfile()
+        self.routes = routes or {}
+        self.seed = seed
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self.counts = {'requests': 0, 'errors': 0, 'rate_limited': 0}
+
+    def apply(self, route):
+        """
+        Delay the current request and decide whether it fails.
+
+        Args:
+            route (str): Route name used to pick the profile.
+
+        Returns:
+            tuple | None: An error response, or None to serve the request normally.
+        """
+        profile = self.routes.get(route, self.default)
+        with self._lock:
+            self.counts['requests'] += 1
+            delay = profile.latency.sample(self._rng)
+            roll = self._rng.random()
+            throttled = not self._take_token(route, profile)
+
+        time.sleep(delay)
+
+        if throttled or roll < profile.rate_limit_rate:
+            with self._lock:
+                self.counts['rate_limited'] += 1
+            response = jsonify({'error': {'code': 429, 'message': 'Resource has been exhausted', 'status': 'RESOURCE_EXHAUSTED'}})
+            return response, 429, {'Retry-After': str(profile.retry_after)}
+        if roll < profile.rate_limit_rate + profile.error_rate:
+            with self._lock:
+                self.counts['errors'] += 1
+            return jsonify({'error': {'code': 500, 'message': 'Injected failure', 'status': 'INTERNAL'}}), 500
+        return None
+
+    def content_rng(self, *parts):
+        """A generator for response content, deterministic in the seed and ``parts``."""
+        return random.Random(':'.join(str(p) for p in (self.seed,) + parts))
+
+    def _take_token(self, route, profile):
+        """Token bucket per route; caller holds the lock."""
+        if not profile.max_rps:
+            return True
+        now = time.monotonic()
+        tokens, last = self._buckets.get(route, (profile.max_rps, now))
+        tokens = min(profile.max_rps, tokens + (now - last) * profile.max_rps)
+        if tokens < 1:
+            self._buckets[route] = (tokens, now)
+            return False
+        self._buckets[route] = (tokens - 1, now)
+        return True
+
+
+def create_quiz_api(behaviour=None, questions_per_quiz=QUESTIONS_PER_QUIZ):
+    """
+    Build a Flask app implementing the quiz API endpoints the app calls.
+
+    Args:
+        behaviour (MockBehaviour, optional): Fault injection settings.
+        questions_per_quiz (int): Number of questions in generated quizzes.
+
+    Returns:
+        Flask: The mock quiz API.
+    """
+    behaviour = behaviour or MockBehaviour()
+    app = Flask('mock_quiz_api')
+    app.config['MOCK_BEHAVIOUR'] = behaviour
+    lock = threading.Lock()
+    quizzes = {}
+    attempts = {}
+    sequence = {'quiz': 0, 'attempt': 0}
+
+    def next_number(kind):
+        with lock:
+            sequence[kind] += 1
+            return sequence[kind]
+
+    @app.before_request
+    def inject_faults():
+        if request.endpoint in (None, 'health'):
+            return None
+        if not request.headers.get('Authorization', '').startswith('Bearer '):
+            return jsonify({'error': 'Missing bearer token'}), 401
+        return behaviour.apply(request.endpoint)
+
+    @app.route('/health')
+    def health():
+        return jsonify({'status': 'ok', 'quizzes': len(quizzes), 'attempts': len(attempts), **behaviour.counts})
+
+    @app.route('/quiz/create-ai-from-course', methods=['POST'])
+    def create_quiz():
+        payload = request.get_json(silent=True) or {}
+        course = payload.get('course') or {}
+        name = course.get('name') or 'Course'
+        skills = course.get('skills') or [name]
+
+        rng = behaviour.content_rng('quiz', next_number('quiz'))
+        quiz_id = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+        questions = []
+        for i in range(questions_per_quiz):
+            skill = skills[i % len(skills)]
+            options = [f"{skill}: option {chr(65 + j)}" for j in range(4)]
+            questions.append({'question': f"Question {i + 1} about {skill} in {name}?",
+                              'options': options, 'correct': rng.randrange(4), 'skill': skill})
+
+        quiz = {
+            'id': quiz_id,
+            'title': f"{name} Quiz",
+            'description': f"Test your knowledge of {name}.",
+            'questions': questions
+        }
+        with lock:
+            quizzes[quiz_id] = quiz
+
+        return jsonify({
+            'quizId': quiz_id,
+            'title': quiz['title'],
+            'description': quiz['description'],
+            'questionsCount': len(questions)
+        }), 201
+
+    @app.route('/quiz/<quiz_id>/from-course')
+    def get_quiz(quiz_id):
+        quiz = quizzes.get(quiz_id)
+        if not quiz:
+            return jsonify({'error': 'Quiz not found'}), 404
+        public = [{'question': q['question'], 'options': q['options']} for q in quiz['questions']]
+        return jsonify({'quiz': {'id': quiz_id, 'title': quiz['title'],
+                                 'description': quiz['description'], 'questions': public}})
+
+    @app.route('/quiz/<quiz_id>/attempt-from-course', methods=['POST'])
+    def start_attempt(quiz_id):
+        if quiz_id not in quizzes:
+            return jsonify({'error': 'Quiz not found'}), 404
+        rng = behaviour.content_rng('attempt', next_number('attempt'))
+        attempt_id = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+        with lock:
+            attempts[attempt_id] = {'quiz_id': quiz_id, 'completed': False}
+        return jsonify({'attemptId': attempt_id, 'quizId': quiz_id}), 201
+
+    @app.route('/quiz/attempt/<attempt_id>/complete-from-course', methods=['POST'])
+    def complete_attempt(attempt_id):
+        attempt = attempts.get(attempt_id)
+        if not attempt:
+            return jsonify({'error': 'Attempt not found'}), 404
+
+        answers = request.get_json(silent=True)
+        if isinstance(answers, dict):
+            answers = answers.get('answers', [])
+        answers = answers if isinstance(answers, list) else []
+
+        questions = quizzes[attempt['quiz_id']]['questions']
+        right = [q for q, a in zip(questions, answers) if a == q['correct']]
+        wrong = [q for q in questions if q not in right]
+        attempt['completed'] = True
+
+        return jsonify({'results': {
+            'score': round(100 * len(right) / len(questions)) if questions else 0,
+            'totalQuestions': len(questions),
+            'correct': len(right),
+            'strengths': ', '.join(sorted({q['skill'] for q in right})) or 'Keep practising',
+            'improvements': ', '.join(sorted({q['skill'] for q in wrong})) or 'None - great job'
+        }})
+
+    return app
+
+
+def create_gemini_api(behaviour=None, skills=None):
+    """
+    Build a Flask app answering Gemini ``generateContent`` requests.
+
+    The reply is a skill analysis in the JSON shape requested by
+    ``get_analysis_prompt``, built from the known skills found in the prompt.
+
+    Args:
+        behaviour (MockBehaviour, optional): Fault injection settings.
+        skills (list, optional): Vocabulary to look for; defaults to SkillExtractor's.
+
+    Returns:
+        Flask: The mock Gemini API.
+    """
+    if skills is None:
+        from skill_extractor import SkillExtractor
+        skills = SkillExtractor().default_skills
+    behaviour = behaviour or MockBehaviour()
+    app = Flask('mock_gemini_api')
+    app.config['MOCK_BEHAVIOUR'] = behaviour
+    patterns = [(skill, re.compile(r'\b' + re.escape(skill) + r'(?!\w)', re.IGNORECASE)) for skill in skills]
+
+    @app.before_request
+    def inject_faults():
+        if request.endpoint in (None, 'health'):
+            return None
+        if not request.args.get('key'):
+            return jsonify({'error': {'code': 403, 'message': 'API key missing', 'status': 'PERMISSION_DENIED'}}), 403
+        return behaviour.apply(request.endpoint)
+
+    @app.route('/health')
+    def health():
+        return jsonify({'status': 'ok', **behaviour.counts})
+
+    @app.route('/v1/models/<model>:generateContent', methods=['POST'])
+    @app.route('/v1beta/models/<model>:generateContent', methods=['POST'])
+    def generate_content(model):
+        payload = request.get_json(silent=True) or {}
+        prompt = ' '.join(part.get('text', '')
+                          for content in payload.get('contents', [])
+                          for part in content.get('parts', []))
+
+        cv_text, _, job_text = prompt.partition('JOB DESCRIPTION:')
+        found = [skill for skill, pattern in patterns if pattern.search(cv_text)]
+        analysis = {
+            'current_skills': found,
+            'skill_categories': {'technical': found},
+            'experience_level': 'senior' if len(found) > 15 else 'mid' if len(found) > 6 else 'entry',
+            'learning_recommendations': [f"Advanced {skill}" for skill in found[:3]],
+            'career_paths': ['Software Engineer'] if found else []
+        }
+        if job_text:
+            required = [skill for skill, pattern in patterns if pattern.search(job_text)]
+            analysis.update({
+                'job_requirements': required,
+                'skill_gaps': [s for s in required if s not in found],
+                'matching_skills': [s for s in required if s in found],
+                'career_advice': 'Focus on the skill gaps listed above.'
+            })
+
+        return jsonify({
+            'candidates': [{
+                'content': {'parts': [{'text': json.dumps(analysis)}], 'role': 'model'},
+                'finishReason': 'STOP',
+                'index': 0
+            }],
+            'usageMetadata': {'promptTokenCount': len(prompt) // 4,
+                              'candidatesTokenCount': 50 + 5 * len(found)},
+            'modelVersion': model
+        })
+
+    return app
+
+
+def serve_in_thread(app, host='127.0.0.1', port=0, quiet=True):
+    """
+    Run a mock app on a background thread, e.g. from a benchmark or load test.
+
+    Args:
+        app (Flask): App from ``create_quiz_api`` or ``create_gemini_api``.
+        host (str): Interface to bind.
+        port (int): Port to bind; 0 picks a free one.
+        quiet (bool): Silence the per-request access log.
+
+    Returns:
+        BaseWSGIServer: The running server; ``server.port`` is the bound port
+        and ``server.shutdown()`` stops it.
+    """
+    if quiet:
+        logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    server = make_server(host, port, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def parse_route_latency(values):
+    """Parse repeated ``route=spec`` options into a route -> LatencyModel dict."""
+    routes = {}
+    for value in values or []:
+        route, _, spec = value.partition('=')
+        routes[route] = LatencyModel.parse(spec)
+    return routes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run mock quiz API and Gemini servers')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--quiz-port', type=int, default=DEFAULT_QUIZ_PORT)
+    parser.add_argument('--gemini-port', type=int, default=DEFAULT_GEMINI_PORT)
+    parser.add_argument('--latency', default='fixed:0', help='Default latency, e.g. lognormal:150,0.5 (ms)')
+    parser.add_argument('--route-latency', action='append', metavar='ROUTE=SPEC',
+                        help='Per-route latency, e.g. create_quiz=lognormal:2000,0.4 or generate_content=normal:1500,300')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Probability of a 500 response')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Probability of a random 429 response')
+    parser.add_argument('--max-rps', type=float, help='Requests per second per route before 429s')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    def behaviour(offset):
+        def profile(latency):
+            return FaultProfile(latency, args.error_rate, args.rate_limit_rate, args.max_rps)
+        routes = {route: profile(model) for route, model in parse_route_latency(args.route_latency).items()}
+        return MockBehaviour(profile(LatencyModel.parse(args.latency)), routes, seed=args.seed + offset)
+
+    servers = [
+        serve_in_thread(create_quiz_api(behaviour(0)), args.host, args.quiz_port),
+        serve_in_thread(create_gemini_api(behaviour(1)), args.host, args.gemini_port),
+    ]
+    print(f"🧪 Mock quiz API:  http://{args.host}:{servers[0].port}")
+    print(f"🧪 Mock Gemini:    http://{args.host}:{servers[1].port}/v1/models/gemini-2.0-flash:generateContent")
+    print(f"   latency={args.latency} error_rate={args.error_rate} rate_limit_rate={args.rate_limit_rate} seed={args.seed}")
+
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        for server in servers:
+            server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,42 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
-from datetime import datetime
+from sqlalchemy import delete, func, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import deferred
+from sqlalchemy.orm.attributes import set_committed_value
+from datetime import datetime, timedelta
 import uuid
 
+from compression import CompressedText
+
 db = SQLAlchemy()
 
+# Bump whenever a model or table changes. create_all never alters existing tables,
+# so a bump that changes one needs a step in schema_migrations.MIGRATIONS; the
+# stored version only advances after that step has run, and fast boots refuse
+# to start until it has
+SCHEMA_VERSION = 8
+
+# Native JSONB on PostgreSQL; elsewhere (SQLite) JSON stored as text and queried via JSON1
+JSONType = db.JSON().with_variant(JSONB(), 'postgresql')
+
+def dialect_insert(model):
+    """INSERT construct for the bound dialect, so ON CONFLICT clauses are available"""
+    dialect = db.session.get_bind().dialect.name
+    insert = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+    return insert(model)
+
+class SchemaVersion(db.Model):
+    __tablename__ = 'skillstown_schema_version'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False)
+    applied_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+    
+    def __repr__(self):
+        return f'<SchemaVersion {self.version}>'
+
 class Company(db.Model):
     __tablename__ = 'companies'
     
@@ -45,10 +77,17 @@ class Student(db.Model, UserMixin):
         return str(self.id)
     
     def get_quiz_uuid(self):
-        """Get or create quiz UUID for this user"""
+        """Get or assign the quiz UUID for this user; the caller's transaction commits it"""
         if not self.quiz_user_uuid:
-            self.quiz_user_uuid = str(uuid.uuid4())
-            db.session.commit()
+            # COALESCE keeps whichever UUID a concurrent request assigned first
+            students = Student.__table__
+            assigned = db.session.execute(
+                update(students)
+                .where(students.c.id == self.id)
+                .values(quiz_user_uuid=func.coalesce(students.c.quiz_user_uuid, str(uuid.uuid4())))
+                .returning(students.c.quiz_user_uuid)
+            ).scalar()
+            set_committed_value(self, 'quiz_user_uuid', assigned)
         return self.quiz_user_uuid
     
     @property
@@ -128,10 +167,11 @@ class UserProfile(db.Model):
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.String(36), db.ForeignKey('students.id'), nullable=False)
-    cv_text = db.Column(db.Text)
-    job_description = db.Column(db.Text)
+    # Large blobs are compressed and deferred so listing profiles never reads them
+    cv_text = deferred(db.Column(CompressedText), group='profile_text')
+    job_description = deferred(db.Column(CompressedText), group='profile_text')
     skills = db.Column(db.Text)
-    skill_analysis = db.Column(db.Text)
+    skill_analysis = deferred(db.Column(JSONType))
     uploaded_at = db.Column(db.DateTime, default=db.func.current_timestamp())
     
     def __repr__(self):
@@ -146,13 +186,21 @@ class CourseDetail(db.Model):
     description = db.Column(db.Text)
     progress_percentage = db.Column(db.Integer, default=0)
     completed_at = db.Column(db.DateTime)
-    materials = db.Column(db.Text)  # JSON format for course materials
+    materials = db.Column(JSONType)  # Course materials, e.g. {"materials": [...]}
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
     # New field for quiz results
-    quiz_results = db.Column(db.Text)  # JSON string containing quiz performance and recommendations
+    quiz_results = db.Column(JSONType)  # Quiz performance and recommendations
     # Relationship to UserCourse
     user_course = db.relationship('UserCourse', backref='details')
     
+    @classmethod
+    def get_json_field(cls, user_course_id, column, key):
+        """Extract one key of a JSON column on the database side"""
+        row = db.session.query(getattr(cls, column)[key]).filter(
+            cls.user_course_id == user_course_id
+        ).order_by(cls.id).first()
+        return row[0] if row else None
+    
     def __repr__(self):
         return f'<CourseDetail {self.user_course_id}>'
 
@@ -163,9 +211,47 @@ class UserCourse(db.Model):
     category = db.Column(db.String(100), nullable=False)
     course_name = db.Column(db.String(255), nullable=False)
     status = db.Column(db.String(50), default='enrolled')
-    created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
-    __table_args__ = (db.UniqueConstraint('user_id', 'course_name', name='skillstown_user_course_unique'),)
+    # Set in Python so SQLite stores one text format and keyset seeks compare the raw column
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'course_name', name='skillstown_user_course_unique'),
+        # Keyset pagination of "my courses" seeks on (created_at, id) per user
+        db.Index('ix_skillstown_user_courses_user_created', 'user_id', 'created_at', 'id'),
+    )
 
+    @classmethod
+    def enroll_many(cls, user_id, courses):
+        """
+        Enroll a user in several courses with one INSERT ... ON CONFLICT DO NOTHING.
+        
+        Returns a {course_name: id} dict of the newly created enrollments; courses
+        the user is already enrolled in are skipped. The caller commits.
+        """
+        rows = [{
+            'user_id': user_id,
+            'category': course['category'],
+            'course_name': course['course_name'],
+            'status': 'enrolled'
+        } for course in courses]
+        if not rows:
+            return {}
+        
+        stmt = dialect_insert(cls).values(rows).on_conflict_do_nothing(
+            index_elements=['user_id', 'course_name']
+        ).returning(cls.course_name, cls.id)
+        return {name: course_id for name, course_id in db.session.execute(stmt)}
+    
+    @classmethod
+    def set_status(cls, course_id, user_id, status):
+        """Update the status of a user's course in one statement; returns False if not found"""
+        table = cls.__table__
+        result = db.session.execute(
+            update(table)
+            .where(table.c.id == course_id, table.c.user_id == user_id)
+            .values(status=status)
+        )
+        return result.rowcount > 0
+    
     def __repr__(self):
         return f'<UserCourse {self.course_name}>'
 
@@ -205,6 +291,54 @@ class CourseQuiz(db.Model):
     def __repr__(self):
         return f'<CourseQuiz {self.quiz_api_id}>'
 
+class QuizGeneration(db.Model):
+    """Claim on generating a quiz for a course, shared by every worker process"""
+    __tablename__ = 'skillstown_quiz_generations'
+    
+    user_course_id = db.Column(db.Integer, db.ForeignKey('skillstown_user_courses.id'), primary_key=True)
+    token = db.Column(db.String(32), nullable=False)
+    started_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    @classmethod
+    def claim(cls, user_course_id, token, lease):
+        """
+        Claim a course's generation with one INSERT ... ON CONFLICT DO NOTHING.
+        
+        A claim older than ``lease`` seconds was left by a worker that died and
+        is taken over. Returns True if ``token`` now holds the claim. The caller commits.
+        """
+        now = datetime.utcnow()
+        stmt = dialect_insert(cls).values(
+            user_course_id=user_course_id, token=token, started_at=now
+        ).on_conflict_do_nothing(index_elements=['user_course_id']).returning(cls.token)
+        if db.session.execute(stmt).first():
+            return True
+        
+        table = cls.__table__
+        result = db.session.execute(
+            update(table)
+            .where(table.c.user_course_id == user_course_id, table.c.started_at < now - timedelta(seconds=lease))
+            .values(token=token, started_at=now)
+        )
+        return result.rowcount > 0
+    
+    @classmethod
+    def release(cls, user_course_id, token):
+        """Drop the claim if ``token`` still holds it. The caller commits."""
+        table = cls.__table__
+        db.session.execute(delete(table).where(table.c.user_course_id == user_course_id, table.c.token == token))
+    
+    @classmethod
+    def in_progress(cls, user_course_id, lease):
+        """True if some worker holds a live claim on the course"""
+        cutoff = datetime.utcnow() - timedelta(seconds=lease)
+        return db.session.query(
+            cls.query.filter(cls.user_course_id == user_course_id, cls.started_at >= cutoff).exists()
+        ).scalar()
+    
+    def __repr__(self):
+        return f'<QuizGeneration {self.user_course_id}>'
+
 # NEW: Model to track quiz attempts
 class CourseQuizAttempt(db.Model):
     __tablename__ = 'skillstown_quiz_attempts'
@@ -218,12 +352,37 @@ class CourseQuizAttempt(db.Model):
     correct_answers = db.Column(db.Integer)
     feedback_strengths = db.Column(db.Text)
     feedback_improvements = db.Column(db.Text)
-    user_answers = db.Column(db.Text)  # JSON array of user answers
-    completed_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+    user_answers = db.Column(JSONType)  # Array of user answers
+    # Set in Python so SQLite stores one text format and keyset seeks compare the raw column
+    completed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    __table_args__ = (
+        # One row per upstream attempt, so retried starts are upserts
+        db.UniqueConstraint('course_quiz_id', 'attempt_api_id', name='skillstown_quiz_attempt_unique'),
+        # Keyset pagination of quiz history seeks on (completed_at, id) per user
+        db.Index('ix_skillstown_quiz_attempts_user_completed', 'user_id', 'completed_at', 'id'),
+    )
     
     # Relationships
     user = db.relationship('Student', backref='quiz_attempts')
     course_quiz = db.relationship('CourseQuiz', backref='attempts')
     
+    @classmethod
+    def record_start(cls, user_id, course_quiz_id, attempt_api_id):
+        """
+        Record a started attempt with one INSERT ... ON CONFLICT DO NOTHING.
+        
+        A retried or duplicate start for the same upstream attempt keeps the
+        existing row. Returns the new row's id, or None if it already existed.
+        The caller commits.
+        """
+        stmt = dialect_insert(cls).values(
+            user_id=user_id,
+            course_quiz_id=course_quiz_id,
+            attempt_api_id=attempt_api_id,
+            completed_at=datetime.utcnow()
+        ).on_conflict_do_nothing(index_elements=['course_quiz_id', 'attempt_api_id']).returning(cls.id)
+        return db.session.execute(stmt).scalar()
+    
     def __repr__(self):
         return f'<CourseQuizAttempt {self.attempt_api_id}>'
\ No newline at end of file
@@ -0,0 +1,120 @@
+"""
+Keyset (seek) pagination helpers for the SkillsTown CV Analyzer application.
+
+Pages are ordered newest first on a ``(timestamp, id)`` pair and continued
+with an opaque cursor, so every page costs the same index range scan no
+matter how deep into the history the user is. The timestamp column must be
+NOT NULL: a NULL cannot be compared in the seek predicate, so it would end
+the listing early.
+"""
+
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor token cannot be decoded."""
+
+
+def encode_cursor(timestamp, row_id):
+    """
+    Build an opaque cursor token for the last row of a page.
+
+    Args:
+        timestamp (datetime): Sort timestamp of the row.
+        row_id (int): Primary key of the row.
+
+    Returns:
+        str: URL-safe cursor token.
+
+    Raises:
+        ValueError: If ``timestamp`` is None.
+    """
+    if timestamp is None:
+        raise ValueError(f"Keyset pagination needs a non-NULL sort value (row {row_id})")
+    payload = json.dumps([timestamp.isoformat(), row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    """
+    Decode a cursor produced by ``encode_cursor``.
+
+    Args:
+        token (str): Cursor token from the client.
+
+    Returns:
+        tuple: ``(timestamp, row_id)``.
+
+    Raises:
+        InvalidCursor: If the token is malformed.
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        timestamp, row_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except (ValueError, TypeError, UnicodeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {token!r}") from e
+
+
+def parse_page_size(value, default=DEFAULT_PAGE_SIZE):
+    """
+    Clamp a client-supplied page size to ``[1, MAX_PAGE_SIZE]``.
+
+    Args:
+        value (str | int | None): Requested page size.
+        default (int): Size used when the value is missing or invalid.
+
+    Returns:
+        int: The page size to use.
+    """
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+def keyset_page(query, sort_column, id_column, cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """
+    Fetch one page of ``query`` ordered by ``(sort_column, id_column)`` descending.
+
+    Args:
+        query: SQLAlchemy query to paginate (already filtered).
+        sort_column: NOT NULL timestamp column to order by.
+        id_column: Primary key column used as a tie-breaker.
+        cursor (str, optional): Cursor returned with the previous page.
+        limit (int): Maximum number of rows to return.
+
+    Returns:
+        tuple: ``(rows, next_cursor)``; ``next_cursor`` is None on the last page.
+
+    Raises:
+        InvalidCursor: If ``cursor`` is malformed.
+    """
+    if cursor:
+        timestamp, row_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            sort_column < timestamp,
+            and_(sort_column == timestamp, id_column < row_id)
+        ))
+
+    rows = query.order_by(sort_column.desc(), id_column.desc()).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _cursor_for(rows[-1], sort_column, id_column)
+    return rows, next_cursor
+
+
+def _cursor_for(row, sort_column, id_column):
+    """Build the cursor for a result row, which may be an entity or a tuple."""
+    entity = row[0] if isinstance(row, tuple) or hasattr(row, '_fields') else row
+    return encode_cursor(getattr(entity, sort_column.key), getattr(entity, id_column.key))
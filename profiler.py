@@ -0,0 +1,246 @@
+"""
+On-demand profiling for a running worker.
+
+* ``sample()`` is a statistical sampler: a background thread snapshots every
+  thread's stack with ``sys._current_frames()`` at a fixed interval and counts
+  identical stacks. The result renders as collapsed stacks (the input format
+  of flamegraph tools) or directly as a flamegraph SVG.
+* ``init_app()`` adds opt-in ``cProfile`` capture for selected routes: an
+  admin request carrying ``X-Profile: 1`` to a route listed in
+  ``PROFILE_ROUTES`` is profiled and the stats are saved under ``PROFILE_DIR``.
+
+Both are only reachable by admins: requests with ``Authorization: Bearer
+$ADMIN_TOKEN``, or logged-in users listed in ``ADMIN_USERS``.
+"""
+
+import cProfile
+import html
+import io
+import logging
+import os
+import pstats
+import sys
+import sysconfig
+import threading
+import time
+from collections import Counter
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+MAX_SECONDS = 60
+DEFAULT_INTERVAL = 0.01
+# Standard library (file, function) pairs a thread's innermost Python frame is
+# in while it is blocked rather than doing work; same-named app functions still count
+IDLE_SITES = {
+    ('threading.py', 'wait'), ('threading.py', '_wait_for_tstate_lock'),
+    ('queue.py', 'get'), ('selectors.py', 'select'),
+    ('socket.py', 'accept'), ('socket.py', 'readinto'),
+    ('socketserver.py', 'serve_forever'), ('ssl.py', 'read'), ('ssl.py', 'recv_into'),
+    ('concurrent/futures/thread.py', '_worker'),
+}
+STDLIB_DIR = sysconfig.get_paths()['stdlib']
+
+_sampling = threading.Lock()
+
+
+class ProfilerBusy(RuntimeError):
+    """Raised when a sampling run is already in progress in this worker."""
+
+
+def is_admin_request():
+    """
+    True when the current request comes from an admin.
+
+    Returns:
+        bool: Whether the bearer token matches ``ADMIN_TOKEN`` or the logged-in
+        user's username is listed in ``ADMIN_USERS``.
+    """
+    from flask import request
+    from flask_login import current_user
+
+    token = os.environ.get('ADMIN_TOKEN')
+    if token and request.headers.get('Authorization') == f'Bearer {token}':
+        return True
+
+    admins = {name.strip() for name in os.environ.get('ADMIN_USERS', '').split(',') if name.strip()}
+    return bool(admins) and current_user.is_authenticated and current_user.username in admins
+
+
+@lru_cache(maxsize=4096)
+def is_idle_code(code):
+    """True if ``code`` is one of the standard library ``IDLE_SITES``."""
+    path = code.co_filename
+    if not path.startswith(STDLIB_DIR + os.sep):
+        return False
+    return (os.path.relpath(path, STDLIB_DIR).replace(os.sep, '/'), code.co_name) in IDLE_SITES
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+
+def sample(seconds, interval=DEFAULT_INTERVAL, include_idle=False):
+    """
+    Sample the stacks of every other thread in this process.
+
+    Args:
+        seconds (float): How long to sample; capped at MAX_SECONDS.
+        interval (float): Seconds between snapshots.
+        include_idle (bool): Keep stacks of threads blocked in waits and I/O.
+
+    Returns:
+        Counter: Collapsed stack (``thread;outer;...;inner``) -> sample count.
+
+    Raises:
+        ProfilerBusy: If another sampling run is in progress.
+    """
+    if not _sampling.acquire(blocking=False):
+        raise ProfilerBusy("A profile is already being collected in this worker")
+
+    stacks = Counter()
+    caller = threading.get_ident()
+
+    def run():
+        names = {}
+        deadline = time.monotonic() + min(seconds, MAX_SECONDS)
+        sampler = threading.get_ident()
+        while time.monotonic() < deadline:
+            for ident, frame in sys._current_frames().items():
+                if ident in (sampler, caller):
+                    continue
+                if not include_idle and is_idle_code(frame.f_code):
+                    continue
+                if ident not in names:
+                    names = {thread.ident: thread.name for thread in threading.enumerate()}
+                labels = []
+                while frame is not None:
+                    labels.append(_frame_label(frame))
+                    frame = frame.f_back
+                labels.append(names.get(ident, f"thread-{ident}"))
+                stacks[';'.join(reversed(labels))] += 1
+            time.sleep(interval)
+
+    try:
+        thread = threading.Thread(target=run, name='profiler-sampler', daemon=True)
+        thread.start()
+        thread.join()
+    finally:
+        _sampling.release()
+    return stacks
+
+
+def collapsed(stacks):
+    """Format sampled stacks in the collapsed ``stack count`` format."""
+    return ''.join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+def flamegraph_svg(stacks, title='SkillsTown worker profile', width=1200, row_height=16):
+    """
+    Render sampled stacks as a flamegraph SVG (roots at the bottom).
+
+    Args:
+        stacks (Counter): Result of ``sample``.
+        title (str): Heading drawn above the graph.
+        width (int): Image width in pixels.
+        row_height (int): Height of one stack level in pixels.
+
+    Returns:
+        str: The SVG document.
+    """
+    root = {'children': {}, 'count': 0}
+    for stack, count in stacks.items():
+        node = root
+        node['count'] += count
+        for label in stack.split(';'):
+            node = node['children'].setdefault(label, {'children': {}, 'count': 0})
+            node['count'] += count
+
+    def depth(node):
+        return 1 + max((depth(child) for child in node['children'].values()), default=0)
+
+    levels = depth(root) - 1
+    height = (levels + 2) * row_height + 20
+    total = root['count'] or 1
+    rects = []
+
+    def layout(node, label, x, level):
+        node_width = node['count'] / total * width
+        if node_width < 0.5:
+            return
+        y = height - (level + 1) * row_height
+        share = node['count'] / total * 100
+        hue = 20 + (hash(label) % 40)
+        tooltip = html.escape(f"{label} ({node['count']} samples, {share:.1f}%)")
+        text = html.escape(label[:int(node_width / 7)]) if node_width > 30 else ''
+        rects.append(
+            f'<g><title>{tooltip}</title>'
+            f'<rect x="{x:.1f}" y="{y}" width="{node_width:.1f}" height="{row_height - 1}" '
+            f'fill="hsl({hue},90%,60%)" rx="2"/>'
+            f'<text x="{x + 3:.1f}" y="{y + row_height - 4}">{text}</text></g>'
+        )
+        child_x = x
+        for child_label, child in sorted(node['children'].items()):
+            layout(child, child_label, child_x, level + 1)
+            child_x += child['count'] / total * width
+
+    x = 0.0
+    for label, child in sorted(root['children'].items()):
+        layout(child, label, x, 0)
+        x += child['count'] / total * width
+
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'font-family="monospace" font-size="11">'
+        f'<text x="{width / 2}" y="16" text-anchor="middle" font-size="14">'
+        f'{html.escape(title)} - {root["count"]} samples</text>'
+        + ''.join(rects) + '</svg>'
+    )
+
+
+def init_app(app):
+    """
+    Enable admin-triggered cProfile capture for the routes in ``PROFILE_ROUTES``.
+
+    ``PROFILE_ROUTES`` is a comma-separated list of paths or endpoint names,
+    e.g. ``/assessment/upload``.
+
+    Args:
+        app (Flask): The application.
+    """
+    routes = {route.strip() for route in os.environ.get('PROFILE_ROUTES', '').split(',') if route.strip()}
+    if not routes:
+        return
+
+    from flask import g, request
+
+    profile_dir = os.environ.get('PROFILE_DIR', os.path.join(app.instance_path, 'profiles'))
+
+    @app.before_request
+    def start_profile():
+        if request.headers.get('X-Profile') != '1':
+            return
+        if request.path not in routes and request.endpoint not in routes:
+            return
+        if not is_admin_request():
+            return
+        g._profile = cProfile.Profile()
+        g._profile.enable()
+
+    @app.after_request
+    def finish_profile(response):
+        profile = g.pop('_profile', None)
+        if profile is None:
+            return response
+        profile.disable()
+
+        os.makedirs(profile_dir, exist_ok=True)
+        path = os.path.join(profile_dir, f"{request.endpoint}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.prof")
+        profile.dump_stats(path)
+
+        summary = io.StringIO()
+        pstats.Stats(profile, stream=summary).sort_stats('cumulative').print_stats(20)
+        logger.info(f"Profiled {request.method} {request.path} -> {path}\n{summary.getvalue()}")
+        response.headers['X-Profile-File'] = os.path.basename(path)
+        return response
@@ -0,0 +1,235 @@
+"""
+SQL statement monitoring for the SkillsTown CV Analyzer application.
+
+Two checks run on SQLAlchemy cursor events:
+
+* statements slower than ``SLOW_QUERY_MS`` are logged with the route that
+  ran them and the shape (names and types, never values) of their binds;
+* statements are counted per route and per ``query_budget`` scope, and a
+  scope that runs more statements than its budget is reported. In tests
+  (``app.testing``) that raises ``QueryBudgetExceeded`` so N+1 regressions
+  fail the test; elsewhere it logs a warning. ``SQL_BUDGET_MODE`` can force
+  ``raise``, ``warn`` or ``off``.
+
+The same cursor hook times each statement once and also reports the
+duration to the request trace (``tracing``) and the database metrics
+(``metrics``), so no other module listens to cursor events.
+"""
+
+import contextvars
+import functools
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+import metrics
+import tracing
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', 200))
+MAX_LOGGED_STATEMENT = 500
+
+# Statements allowed per request (by endpoint) or per query_budget scope,
+# including the user loader's lookup for logged-in routes
+DEFAULT_QUERY_BUDGETS = {
+    'my_courses': 3,
+    'get_course_quiz_attempts': 3,
+    'get_quiz_recommendations': 3,
+    'get_course_dashboard': 3,
+    'course_detail': 5,
+    'profile': 2,
+    'skillstown_user_profile': 2,
+    'get_skillstown_stats': 1,
+}
+
+QUERIES_PER_REQUEST = metrics.histogram(
+    'skillstown_db_queries_per_request', 'Database statements per request', ('endpoint',),
+    buckets=(1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+)
+
+_scopes = contextvars.ContextVar('query_scopes', default=())
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised in tests when a route or scope runs more statements than budgeted."""
+
+
+class _Scope:
+    __slots__ = ('name', 'budget', 'count', 'statements')
+
+    def __init__(self, name, budget):
+        self.name = name
+        self.budget = budget
+        self.count = 0
+        self.statements = []
+
+
+def budget_mode():
+    """
+    Resolve what to do when a budget is exceeded: ``raise``, ``warn`` or ``off``.
+
+    Returns:
+        str: The mode for the current app (``raise`` under ``app.testing``).
+    """
+    from flask import current_app, has_app_context
+
+    if has_app_context():
+        mode = current_app.config.get('SQL_BUDGET_MODE')
+        if mode:
+            return mode
+        if current_app.testing:
+            return 'raise'
+    return os.environ.get('SQL_BUDGET_MODE', 'warn')
+
+
+def budget_for(name):
+    """Return the configured statement budget for a route or scope, or None."""
+    from flask import current_app, has_app_context
+
+    if has_app_context():
+        budgets = current_app.config.get('QUERY_BUDGETS')
+        if budgets and name in budgets:
+            return budgets[name]
+    return DEFAULT_QUERY_BUDGETS.get(name)
+
+
+@contextmanager
+def query_budget(name, budget=None):
+    """
+    Count the statements run inside the block and check them against a budget.
+
+    Args:
+        name (str): Scope name, used to look up the budget and in reports.
+        budget (int, optional): Overrides the configured budget.
+
+    Yields:
+        The scope; ``scope.count`` holds the number of statements so far.
+    """
+    scope = _Scope(name, budget if budget is not None else budget_for(name))
+    token = _scopes.set(_scopes.get() + (scope,))
+    try:
+        yield scope
+    finally:
+        _scopes.reset(token)
+    _check(scope)
+
+
+def budgeted(name):
+    """Decorator form of ``query_budget``."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with query_budget(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def bind_shape(parameters, executemany=False):
+    """
+    Describe bind parameters by name and type without exposing their values.
+
+    Args:
+        parameters: DBAPI parameters (dict, sequence, or a list of them for executemany).
+        executemany (bool): Whether the statement ran once per parameter set.
+
+    Returns:
+        str: e.g. ``{user_id_1: str, param_1: int}`` or ``3 x {...}``.
+    """
+    if executemany and isinstance(parameters, (list, tuple)) and parameters:
+        return f"{len(parameters)} x {bind_shape(parameters[0])}"
+    if isinstance(parameters, dict):
+        return '{' + ', '.join(f"{key}: {type(value).__name__}" for key, value in parameters.items()) + '}'
+    if isinstance(parameters, (list, tuple)):
+        return '(' + ', '.join(type(value).__name__ for value in parameters) + ')'
+    return type(parameters).__name__
+
+
+def init_app(app):
+    """
+    Count statements per request of ``app`` and log slow statements.
+
+    Args:
+        app (Flask): The application.
+    """
+    from flask import g, request
+
+    @app.before_request
+    def start_request_scope():
+        scope = _Scope(request.endpoint or 'unmatched', budget_for(request.endpoint))
+        g._query_scope = scope
+        g._query_scope_token = _scopes.set(_scopes.get() + (scope,))
+
+    @app.after_request
+    def check_request_scope(response):
+        scope = g.pop('_query_scope', None)
+        if scope is not None:
+            QUERIES_PER_REQUEST.observe(scope.count, endpoint=scope.name)
+            _check(scope)
+        return response
+
+    @app.teardown_request
+    def clear_request_scope(exc):
+        token = g.pop('_query_scope_token', None)
+        if token is not None:
+            _scopes.reset(token)
+
+    install_statement_hooks()
+
+
+def install_statement_hooks():
+    """
+    Register the cursor hook pair that times every statement, once per process.
+
+    Covers every engine. ``tracing.init_app`` and ``metrics.init_app`` call it
+    too, since their database timings come from the same hook.
+    """
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    if not event.contains(Engine, 'after_cursor_execute', _statement_finished):
+        event.listen(Engine, 'before_cursor_execute', _statement_started)
+        event.listen(Engine, 'after_cursor_execute', _statement_finished)
+
+
+def _statement_started(conn, cursor, statement, parameters, context, executemany):
+    context._statement_started = time.perf_counter()
+
+
+def _statement_finished(conn, cursor, statement, parameters, context, executemany):
+    duration = time.perf_counter() - context._statement_started
+    tracing.add_query_time(duration)
+    metrics.observe_statement(statement, duration)
+
+    scopes = _scopes.get()
+    for scope in scopes:
+        scope.count += 1
+        if scope.budget is not None and len(scope.statements) <= scope.budget:
+            scope.statements.append(statement[:200])
+
+    duration_ms = duration * 1000
+    if duration_ms >= SLOW_QUERY_MS:
+        logger.warning(json.dumps({
+            'event': 'slow_query',
+            'route': scopes[0].name if scopes else 'background',
+            'duration_ms': round(duration_ms, 2),
+            'statement': ' '.join(statement.split())[:MAX_LOGGED_STATEMENT],
+            'binds': bind_shape(parameters, executemany),
+        }))
+
+
+def _check(scope):
+    if scope.budget is None or scope.count <= scope.budget:
+        return
+    mode = budget_mode()
+    if mode == 'off':
+        return
+
+    message = (f"Query budget exceeded for {scope.name}: {scope.count} statements, budget {scope.budget}. "
+               f"First statements: " + ' | '.join(' '.join(s.split()) for s in scope.statements))
+    if mode == 'raise':
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
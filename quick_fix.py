@@ -85,8 +85,8 @@ def create_missing_tables():
                                 description TEXT,
                                 progress_percentage INTEGER DEFAULT 0,
                                 completed_at TIMESTAMP,
-                                materials TEXT,
-                                quiz_results TEXT,
+                                materials JSONB,
+                                quiz_results JSONB,
                                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                             )
                         """))
@@ -157,7 +157,7 @@ def create_missing_tables():
                                 correct_answers INTEGER,
                                 feedback_strengths TEXT,
                                 feedback_improvements TEXT,
-                                user_answers TEXT,
+                                user_answers JSONB,
                                 completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                             )
                         """))
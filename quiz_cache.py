@@ -0,0 +1,176 @@
+"""
+Read-through cache for quiz definitions served by the external quiz API.
+
+Quiz definitions never change once created, so entries never expire: an
+in-process LRU answers repeat opens within a worker, and an optional shared
+Redis tier (``QUIZ_CACHE_REDIS_URL``) lets workers reuse each other's fetches.
+"""
+
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 512
+# Shared entries only expire to bound storage; they never go stale
+SHARED_TTL_SECONDS = 30 * 24 * 3600
+
+
+class LRUCache:
+    """
+    A small thread-safe least-recently-used cache.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries (int): Number of entries kept before evicting the oldest.
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value or None, marking the key as recently used."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        """Store a value, evicting the least recently used entry when full."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RedisTier:
+    """
+    Optional shared cache tier backed by Redis. Failures are logged and
+    treated as misses so the cache never breaks the request path.
+    """
+
+    def __init__(self, url, prefix='skillstown:quiz:', ttl=SHARED_TTL_SECONDS):
+        import redis  # Optional dependency, only needed when a shared tier is configured
+
+        self.client = redis.Redis.from_url(url, socket_timeout=0.25, socket_connect_timeout=0.25)
+        self.prefix = prefix
+        self.ttl = ttl
+
+    def get(self, key):
+        try:
+            raw = self.client.get(self.prefix + key)
+            return json.loads(raw) if raw else None
+        except Exception as e:
+            logger.warning(f"Shared quiz cache read failed: {e}")
+            return None
+
+    def set(self, key, value):
+        try:
+            self.client.set(self.prefix + key, json.dumps(value), ex=self.ttl)
+        except Exception as e:
+            logger.warning(f"Shared quiz cache write failed: {e}")
+
+
+class QuizDefinitionCache:
+    """
+    Two-tier cache of quiz definitions keyed by ``quiz_api_id``.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, shared=None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries (int): Size of the in-process LRU.
+            shared (RedisTier, optional): Shared tier consulted on local misses.
+        """
+        self.local = LRUCache(max_entries)
+        self.shared = shared
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls):
+        """
+        Build the cache from ``QUIZ_CACHE_SIZE`` and ``QUIZ_CACHE_REDIS_URL``.
+
+        Returns:
+            QuizDefinitionCache: The configured cache.
+        """
+        shared = None
+        redis_url = os.environ.get('QUIZ_CACHE_REDIS_URL')
+        if redis_url:
+            try:
+                shared = RedisTier(redis_url)
+            except ImportError:
+                logger.warning("QUIZ_CACHE_REDIS_URL is set but the redis package is not installed")
+        return cls(int(os.environ.get('QUIZ_CACHE_SIZE', DEFAULT_MAX_ENTRIES)), shared)
+
+    def get(self, quiz_api_id):
+        """
+        Look a quiz definition up in the local tier, then the shared tier.
+
+        Args:
+            quiz_api_id (str): Quiz ID from the quiz API.
+
+        Returns:
+            dict | None: The cached definition, or None on a miss.
+        """
+        value = self.local.get(quiz_api_id)
+        if value is not None:
+            self.hits += 1
+            metrics.CACHE_LOOKUPS.inc(cache='quiz_definition', result='hit')
+            return value
+
+        if self.shared is not None:
+            value = self.shared.get(quiz_api_id)
+            if value is not None:
+                self.shared_hits += 1
+                metrics.CACHE_LOOKUPS.inc(cache='quiz_definition', result='shared_hit')
+                self.local.set(quiz_api_id, value)
+                return value
+
+        self.misses += 1
+        metrics.CACHE_LOOKUPS.inc(cache='quiz_definition', result='miss')
+        return None
+
+    def set(self, quiz_api_id, definition):
+        """
+        Store a freshly fetched quiz definition in every tier.
+
+        Args:
+            quiz_api_id (str): Quiz ID from the quiz API.
+            definition (dict): The quiz definition returned by the API.
+        """
+        self.local.set(quiz_api_id, definition)
+        if self.shared is not None:
+            self.shared.set(quiz_api_id, definition)
+
+    def stats(self):
+        """Return hit/miss counters for monitoring."""
+        return {
+            'entries': len(self.local),
+            'hits': self.hits,
+            'shared_hits': self.shared_hits,
+            'misses': self.misses
+        }
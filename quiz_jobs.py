@@ -0,0 +1,139 @@
+"""
+Background job runner for quiz generation.
+
+Generating a quiz upstream can take tens of seconds, so it runs on a small
+thread pool instead of the request thread. Jobs are single-flight per key
+(the ``user_course_id``): while one generation is running, further requests
+for the same course join it instead of starting another upstream job.
+
+The job map only covers one process. Across gunicorn workers the guard is a
+claim row per course in the database (``models.QuizGeneration``): a worker
+only submits a job after its claim insert wins, and releases the claim when
+the job finishes. The in-process map stays as the fast path.
+"""
+
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+STATUS_PENDING = 'pending'
+STATUS_RUNNING = 'running'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+
+# Finished jobs are kept briefly so pollers can read the outcome
+FINISHED_JOB_TTL = 15 * 60
+# Seconds after which a database claim counts as abandoned by a dead worker
+CLAIM_LEASE = int(os.environ.get('QUIZ_JOB_CLAIM_LEASE', 120))
+
+
+class QuizJob:
+    """
+    State of one background generation.
+    """
+
+    __slots__ = ('id', 'key', 'user_id', 'status', 'result', 'error', 'created_at', 'finished_at')
+
+    def __init__(self, key, user_id):
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.user_id = user_id
+        self.status = STATUS_PENDING
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+
+    @property
+    def finished(self):
+        return self.status in (STATUS_DONE, STATUS_FAILED)
+
+    def to_dict(self):
+        """Serialize the job for the status endpoint."""
+        data = {'job_id': self.id, 'status': self.status}
+        if self.result:
+            data.update(self.result)
+        if self.error:
+            data['error'] = self.error
+        return data
+
+
+class QuizJobManager:
+    """
+    Runs generation jobs on a thread pool, coalescing concurrent requests.
+    """
+
+    def __init__(self, max_workers=None):
+        """
+        Initialize the manager.
+
+        Args:
+            max_workers (int, optional): Pool size; defaults to ``QUIZ_JOB_WORKERS`` or 4.
+        """
+        max_workers = max_workers or int(os.environ.get('QUIZ_JOB_WORKERS', 4))
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='quiz-job')
+        self._lock = threading.Lock()
+        self._latest = {}  # key -> most recent QuizJob
+
+    def submit(self, key, user_id, fn, *args):
+        """
+        Start a job for ``key`` unless one is already in flight.
+
+        Args:
+            key: Single-flight key, e.g. the ``user_course_id``.
+            user_id (str): Owner of the job, checked by the status endpoint.
+            fn (callable): Work to run; its return value (a dict) becomes the result.
+            *args: Arguments passed to ``fn``.
+
+        Returns:
+            tuple: ``(job, created)``; ``created`` is False when joining an in-flight job.
+        """
+        with self._lock:
+            self._prune()
+            current = self._latest.get(key)
+            if current is not None and not current.finished:
+                return current, False
+
+            job = QuizJob(key, user_id)
+            self._latest[key] = job
+
+        self._executor.submit(self._run, job, fn, args)
+        return job, True
+
+    def get(self, key):
+        """
+        Return the most recent job for ``key`` in this process, if any.
+
+        Args:
+            key: Single-flight key.
+
+        Returns:
+            QuizJob | None: The job, or None if unknown here.
+        """
+        with self._lock:
+            return self._latest.get(key)
+
+    def _run(self, job, fn, args):
+        job.status = STATUS_RUNNING
+        try:
+            job.result = fn(*args)
+            job.status = STATUS_DONE
+        except Exception as e:
+            logger.error(f"Quiz generation job {job.id} for {job.key} failed: {e}")
+            job.error = str(e)
+            job.status = STATUS_FAILED
+        finally:
+            job.finished_at = time.time()
+
+    def _prune(self):
+        """Forget finished jobs older than FINISHED_JOB_TTL. Caller holds the lock."""
+        cutoff = time.time() - FINISHED_JOB_TTL
+        stale = [key for key, job in self._latest.items()
+                 if job.finished and job.finished_at < cutoff]
+        for key in stale:
+            del self._latest[key]
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Background job: compress or recompress UserProfile text blobs
+Converts legacy TEXT columns to BYTEA on PostgreSQL, then rewrites any row
+that is not stored with the preferred codec. Safe to re-run at any time.
+"""
+
+import os
+import sys
+import time
+import argparse
+from sqlalchemy import create_engine, text
+
+from compression import CODEC_NAMES, compress_text, decompress_text, preferred_codec, stored_codec
+
+TABLE = 'skillstown_user_profiles'
+COMPRESSED_COLUMNS = ['cv_text', 'job_description']
+
+def get_database_url():
+    """Get database URL from environment"""
+    db_url = os.environ.get('DATABASE_URL')
+    if db_url and db_url.startswith('postgres://'):
+        db_url = db_url.replace('postgres://', 'postgresql://')
+    return db_url or 'sqlite:///skillstown.db'
+
+def iter_batches(conn, column, batch_size, where=''):
+    """Yield (id, value) rows in primary key order"""
+    last_id = 0
+    while True:
+        rows = conn.execute(text(
+            f"SELECT id, {column} FROM {TABLE} WHERE id > :last_id AND {column} IS NOT NULL {where} "
+            f"ORDER BY id LIMIT :limit"
+        ), {'last_id': last_id, 'limit': batch_size}).fetchall()
+        if not rows:
+            break
+        yield rows
+        last_id = rows[-1][0]
+
+def convert_postgresql_column(conn, column, codec, batch_size, throttle):
+    """
+    Move a TEXT column into a compressed BYTEA column, batch by batch.
+    Writes are blocked (EXCLUSIVE) only while rows written during the copy are
+    caught up; the column swap itself holds ACCESS EXCLUSIVE for a catalog-only change.
+    Schema migration 3 runs this at deploy time.
+    """
+    data_type = conn.execute(text("""
+        SELECT data_type FROM information_schema.columns
+        WHERE table_name = :table AND column_name = :column
+    """), {'table': TABLE, 'column': column}).scalar()
+    conn.commit()
+    if data_type != 'text':
+        return
+
+    print(f"📝 Converting {TABLE}.{column} from TEXT to compressed BYTEA...")
+    staging = f"{column}_z"
+    conn.execute(text(f"ALTER TABLE {TABLE} ADD COLUMN IF NOT EXISTS {staging} BYTEA"))
+    conn.commit()
+
+    update = text(f"UPDATE {TABLE} SET {staging} = :value WHERE id = :id")
+    converted = 0
+    for rows in iter_batches(conn, column, batch_size):
+        conn.execute(update, [{'id': row[0], 'value': compress_text(row[1], codec)} for row in rows])
+        conn.commit()
+        converted += len(rows)
+        print(f"   {column}: {converted} rows compressed")
+        time.sleep(throttle)
+
+    # Pick up rows written meanwhile, then swap the columns under a short lock
+    conn.execute(text(f"LOCK TABLE {TABLE} IN EXCLUSIVE MODE"))
+    for rows in iter_batches(conn, column, batch_size, where=f"AND {staging} IS NULL"):
+        conn.execute(update, [{'id': row[0], 'value': compress_text(row[1], codec)} for row in rows])
+    conn.execute(text(f"ALTER TABLE {TABLE} DROP COLUMN {column}"))
+    conn.execute(text(f"ALTER TABLE {TABLE} RENAME COLUMN {staging} TO {column}"))
+    conn.commit()
+    print(f"✅ {TABLE}.{column} is now compressed BYTEA")
+
+def recompress_column(conn, column, codec, batch_size, throttle):
+    """Rewrite every value whose stored codec differs from the target codec"""
+    update = text(f"UPDATE {TABLE} SET {column} = :value WHERE id = :id")
+    scanned = rewritten = 0
+    for rows in iter_batches(conn, column, batch_size):
+        changes = []
+        for row_id, raw in rows:
+            if stored_codec(raw) == codec:
+                continue
+            value = compress_text(decompress_text(raw), codec)
+            # Short values stay raw whatever the codec; skip those no-op rewrites
+            if isinstance(raw, str) or value != bytes(raw):
+                changes.append({'id': row_id, 'value': value})
+        if changes:
+            conn.execute(update, changes)
+            conn.commit()
+            rewritten += len(changes)
+            time.sleep(throttle)
+        scanned += len(rows)
+    print(f"✅ {TABLE}.{column}: scanned {scanned}, rewrote {rewritten}")
+
+def run_recompression(codec, batch_size, throttle, db_url=None):
+    """Compress every blob column in COMPRESSED_COLUMNS"""
+    print("🗜️  Recompressing profile blobs...")
+    print("=" * 50)
+
+    db_url = db_url or get_database_url()
+    print(f"Database URL: {db_url}")
+    engine = create_engine(db_url)
+
+    try:
+        with engine.connect() as conn:
+            for column in COMPRESSED_COLUMNS:
+                if engine.dialect.name == 'postgresql':
+                    convert_postgresql_column(conn, column, codec, batch_size, throttle)
+                recompress_column(conn, column, codec, batch_size, throttle)
+        return True
+    except Exception as e:
+        print(f"❌ Recompression failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compress UserProfile text blobs')
+    parser.add_argument('--codec', choices=sorted(CODEC_NAMES), help='Target codec (default: BLOB_COMPRESSION or best available)')
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--throttle', type=float, default=0.0, help='Seconds to sleep between batches')
+    args = parser.parse_args()
+
+    target = CODEC_NAMES[args.codec] if args.codec else preferred_codec()
+    if run_recompression(target, args.batch_size, args.throttle):
+        print("\n🎉 Recompression completed successfully!")
+    else:
+        sys.exit(1)
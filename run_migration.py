@@ -126,7 +126,7 @@ def run_quiz_migration():
                             correct_answers INTEGER,
                             feedback_strengths TEXT,
                             feedback_improvements TEXT,
-                            user_answers TEXT,
+                            user_answers JSONB,
                             completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                             FOREIGN KEY (user_id) REFERENCES students(id) ON DELETE CASCADE,
                             FOREIGN KEY (course_quiz_id) REFERENCES skillstown_course_quizzes(id) ON DELETE CASCADE
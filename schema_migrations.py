@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Versioned schema migrations for existing SkillsTown databases.
+
+``db.create_all()`` only creates missing tables and never alters existing
+ones. So every ``SCHEMA_VERSION`` bump in models.py that changes an existing
+table has a step in ``MIGRATIONS``. ``skillstown_schema_version`` is only
+advanced after that step has run. Run pending steps at deploy time, before
+the new workers start:
+
+    python schema_migrations.py            # apply pending migrations
+    python schema_migrations.py --status   # show current and target versions
+
+Order: the steps run in version order. JSON columns go first. Then the
+profile text columns are copied into compressed BYTEA in batches and swapped
+in (``recompress_profiles.convert_postgresql_column``). Then the pagination
+indexes are added and SQLite pagination timestamps get a single text format.
+Version 6 only adds a table. Version 7 removes duplicate quiz attempt rows
+and makes them unique per upstream attempt id. Version 8 fills NULL
+pagination timestamps with the epoch and makes them NOT NULL on PostgreSQL.
+Compressing existing profile rows (``recompress_profiles.py``) is not a
+deploy step; it can run at any time after version 3.
+"""
+
+import argparse
+import os
+import sys
+
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.exc import SQLAlchemyError
+
+# Version of a database created before versions were recorded
+BASELINE_VERSION = 1
+# A table every SkillsTown database has; if it is missing the database is new
+CORE_TABLE = 'students'
+# Rows per batch, and seconds between batches, when converting profile text columns
+PROFILE_BATCH_SIZE = int(os.environ.get('PROFILE_MIGRATION_BATCH_SIZE', 500))
+PROFILE_THROTTLE = float(os.environ.get('PROFILE_MIGRATION_THROTTLE', 0))
+
+
+class MigrationError(RuntimeError):
+    """A migration step failed; the recorded version stays at the last completed step."""
+
+
+def get_database_url():
+    """Get database URL from environment"""
+    db_url = os.environ.get('DATABASE_URL')
+    if db_url and db_url.startswith('postgres://'):
+        db_url = db_url.replace('postgres://', 'postgresql://')
+    return db_url or 'sqlite:///skillstown.db'
+
+
+# Sort columns of the keyset-paginated tables
+PAGINATION_COLUMNS = (('skillstown_user_courses', 'created_at'), ('skillstown_quiz_attempts', 'completed_at'))
+
+
+def _json_columns(engine):
+    from migrate_json_columns import run_json_migration
+    return run_json_migration(engine.url)
+
+
+def _profile_text_bytea(engine):
+    # Batched copy into compressed BYTEA staging columns; only the catch-up of rows
+    # written meanwhile and the column swap run under a short table lock
+    if engine.dialect.name != 'postgresql':
+        return True
+    from compression import preferred_codec
+    from recompress_profiles import COMPRESSED_COLUMNS, convert_postgresql_column
+    try:
+        with engine.connect() as conn:
+            for column in COMPRESSED_COLUMNS:
+                convert_postgresql_column(conn, column, preferred_codec(), PROFILE_BATCH_SIZE, PROFILE_THROTTLE)
+    except SQLAlchemyError as e:
+        print(f"❌ Profile column conversion failed: {e}")
+        return False
+    return True
+
+
+def _pagination_indexes(engine):
+    with engine.begin() as conn:
+        conn.execute(text("CREATE INDEX IF NOT EXISTS ix_skillstown_user_courses_user_created "
+                          "ON skillstown_user_courses (user_id, created_at, id)"))
+        conn.execute(text("CREATE INDEX IF NOT EXISTS ix_skillstown_quiz_attempts_user_completed "
+                          "ON skillstown_quiz_attempts (user_id, completed_at, id)"))
+    print("✅ Pagination indexes created")
+    return True
+
+
+def _pagination_timestamps(engine):
+    # SQLite keeps DateTime as text; server defaults wrote 'YYYY-MM-DD HH:MM:SS'
+    # while SQLAlchemy writes microseconds, and mixed formats break raw seeks
+    if engine.dialect.name != 'sqlite':
+        return True
+    with engine.begin() as conn:
+        for table, column in PAGINATION_COLUMNS:
+            updated = conn.execute(text(
+                f"UPDATE {table} SET {column} = {column} || '.000000' WHERE length({column}) = 19"
+            )).rowcount
+            print(f"✅ {table}.{column}: {updated} timestamps normalized")
+    return True
+
+
+def _unique_quiz_attempts(engine):
+    # Retried starts left duplicate rows per upstream attempt; keep the completed one, else the first
+    with engine.begin() as conn:
+        removed = conn.execute(text("""
+            DELETE FROM skillstown_quiz_attempts WHERE id IN (
+                SELECT id FROM (
+                    SELECT id, ROW_NUMBER() OVER (
+                        PARTITION BY course_quiz_id, attempt_api_id
+                        ORDER BY CASE WHEN score IS NULL THEN 1 ELSE 0 END, id
+                    ) AS position
+                    FROM skillstown_quiz_attempts
+                ) ranked WHERE position > 1
+            )
+        """)).rowcount
+        conn.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS skillstown_quiz_attempt_unique "
+                          "ON skillstown_quiz_attempts (course_quiz_id, attempt_api_id)"))
+    print(f"✅ Quiz attempts unique per upstream attempt ({removed} duplicates removed)")
+    return True
+
+
+def _pagination_not_null(engine):
+    # Keyset cursors cannot seek past a NULL; such rows sort as the oldest instead
+    epoch = "'1970-01-01 00:00:00.000000'" if engine.dialect.name == 'sqlite' else "TIMESTAMP '1970-01-01 00:00:00'"
+    with engine.begin() as conn:
+        for table, column in PAGINATION_COLUMNS:
+            filled = conn.execute(text(f"UPDATE {table} SET {column} = {epoch} WHERE {column} IS NULL")).rowcount
+            if engine.dialect.name == 'postgresql':
+                conn.execute(text(f"ALTER TABLE {table} ALTER COLUMN {column} SET NOT NULL"))
+            print(f"✅ {table}.{column}: {filled} NULL timestamps filled")
+    return True
+
+
+# Versions that only add tables (6: skillstown_quiz_generations) need no step;
+# create_all adds the table and run_migrations records the version.
+# (version, description, step); a step takes an Engine and returns True on success.
+# Steps must be idempotent: a database whose version was never recorded replays them all.
+MIGRATIONS = [
+    (2, 'JSON/JSONB analysis, materials and quiz answer columns', _json_columns),
+    (3, 'compressed BYTEA profile text columns', _profile_text_bytea),
+    (4, 'keyset pagination indexes', _pagination_indexes),
+    (5, 'uniform SQLite pagination timestamps', _pagination_timestamps),
+    (7, 'unique quiz attempts per upstream attempt id', _unique_quiz_attempts),
+    (8, 'NOT NULL pagination timestamps', _pagination_not_null),
+]
+
+
+def read_version(conn):
+    """Recorded schema version, or None if it was never recorded."""
+    try:
+        return conn.execute(text("SELECT version FROM skillstown_schema_version WHERE id = 1")).scalar()
+    except SQLAlchemyError:
+        conn.rollback()
+        return None
+
+
+def is_new_database(conn):
+    """True if the SkillsTown tables have not been created yet."""
+    return not inspect(conn).has_table(CORE_TABLE)
+
+
+def stamp_version(conn, version):
+    """Record ``version`` as the schema version and commit."""
+    updated = conn.execute(
+        text("UPDATE skillstown_schema_version SET version = :v, applied_at = CURRENT_TIMESTAMP WHERE id = 1"),
+        {'v': version}
+    ).rowcount
+    if not updated:
+        conn.execute(
+            text("INSERT INTO skillstown_schema_version (id, version, applied_at) VALUES (1, :v, CURRENT_TIMESTAMP)"),
+            {'v': version}
+        )
+    conn.commit()
+
+
+def pending_migrations(current, target):
+    """Steps needed to bring a database at ``current`` up to ``target``."""
+    current = BASELINE_VERSION if current is None else current
+    return [(version, description, step) for version, description, step in MIGRATIONS if current < version <= target]
+
+
+def run_migrations(engine, target):
+    """
+    Apply every pending step up to ``target``, recording the version after each one.
+
+    Args:
+        engine: SQLAlchemy engine of the database to migrate.
+        target (int): Schema version the models expect.
+
+    Returns:
+        list: Versions that were applied.
+
+    Raises:
+        MigrationError: If a step fails; later steps are not attempted.
+    """
+    with engine.connect() as conn:
+        current = read_version(conn)
+    applied = []
+    for version, description, step in pending_migrations(current, target):
+        print(f"📝 Schema {version}: {description}...")
+        if not step(engine):
+            raise MigrationError(f"Schema migration to version {version} ({description}) failed")
+        with engine.connect() as conn:
+            stamp_version(conn, version)
+        applied.append(version)
+    if current is None or current < target:
+        # Versions without a data step (new tables only) still need recording
+        with engine.connect() as conn:
+            stamp_version(conn, target)
+    return applied
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Apply pending SkillsTown schema migrations')
+    parser.add_argument('--status', action='store_true', help='Only show the current and target versions')
+    args = parser.parse_args()
+
+    from models import SCHEMA_VERSION, db
+
+    db_url = get_database_url()
+    print(f"Database URL: {db_url}")
+    engine = create_engine(db_url)
+
+    with engine.connect() as conn:
+        new = is_new_database(conn)
+        current = read_version(conn)
+    pending = [] if new else pending_migrations(current, SCHEMA_VERSION)
+    print(f"Schema version: {current if current is not None else 'not recorded'}, models: {SCHEMA_VERSION}")
+    for version, description, _ in pending:
+        print(f"   pending {version}: {description}")
+    if args.status:
+        sys.exit(0)
+
+    # New tables first; create_all leaves existing tables alone
+    db.metadata.create_all(engine)
+    if new:
+        with engine.connect() as conn:
+            stamp_version(conn, SCHEMA_VERSION)
+        print("\n🎉 New database created at the current schema version")
+        sys.exit(0)
+    try:
+        run_migrations(engine, SCHEMA_VERSION)
+    except MigrationError as e:
+        print(f"\n❌ {e}")
+        sys.exit(1)
+    print("\n🎉 Schema is up to date!")
@@ -0,0 +1,194 @@
+"""
+Result cache for the course search page.
+
+Search traffic repeats the same few queries, so ``/search`` keeps recent
+``(results, facet counts)`` pairs in an in-process LRU whose entries also
+expire after ``SEARCH_CACHE_TTL`` seconds. Keys combine the normalized query,
+the selected filters, and content hashes of the catalog and the skill alias
+file. A reloaded catalog therefore never serves old results: its entries
+stop matching and age out.
+
+The same key gives the page an ``ETag``. Together with ``Cache-Control``,
+browsers and proxies can revalidate and get a 304 without the page being
+rendered. ETags also carry a build identifier (``BUILD_ID``, or a digest of
+the templates and static assets taken at startup), so a deploy that changes
+the page invalidates them.
+"""
+
+import hashlib
+import os
+import threading
+import time
+
+import metrics
+from quiz_cache import LRUCache
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_TTL_SECONDS = 300
+# How long clients may reuse a search page before revalidating
+DEFAULT_MAX_AGE = 60
+# Directories whose files shape a rendered search page, relative to the app
+BUILD_DIRS = ('templates', os.path.join('static', 'css'), os.path.join('static', 'js'))
+
+
+class TTLLRUCache(LRUCache):
+    """
+    ``LRUCache`` whose entries also expire a fixed time after being stored.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL_SECONDS, clock=time.monotonic):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries (int): Number of entries kept before evicting the oldest.
+            ttl (float): Seconds an entry stays valid.
+            clock (callable): Time source, in seconds.
+        """
+        super().__init__(max_entries)
+        self.ttl = ttl
+        self.clock = clock
+
+    def get(self, key):
+        """Return the cached value or None if it is missing or expired."""
+        entry = super().get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires <= self.clock():
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+            return None
+        return value
+
+    def set(self, key, value):
+        """Store a value that expires ``ttl`` seconds from now."""
+        super().set(key, (self.clock() + self.ttl, value))
+
+
+def normalize_query(query):
+    """Lower-case ``query`` and collapse whitespace, so equivalent queries share an entry."""
+    return ' '.join(query.lower().split())
+
+
+def normalize_filters(filters):
+    """Sorted, deduplicated ``((facet, (values...)), ...)`` for ``filters``."""
+    return tuple(sorted((facet, tuple(sorted(set(values)))) for facet, values in (filters or {}).items() if values))
+
+
+def build_id(root=os.path.dirname(os.path.abspath(__file__))):
+    """
+    Identify the deployed templates and assets.
+
+    Args:
+        root (str): Application directory containing ``BUILD_DIRS``.
+
+    Returns:
+        str: ``BUILD_ID`` from the environment, or a digest of the paths and
+        contents of every file under ``BUILD_DIRS``.
+    """
+    if os.environ.get('BUILD_ID'):
+        return os.environ['BUILD_ID']
+    digest = hashlib.sha256()
+    for directory in BUILD_DIRS:
+        for dirpath, dirnames, filenames in os.walk(os.path.join(root, directory)):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                path = os.path.join(dirpath, filename)
+                digest.update(os.path.relpath(path, root).encode('utf-8'))
+                with open(path, 'rb') as f:
+                    digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+class SearchCache:
+    """
+    Cached search results plus the ETag that identifies them.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL_SECONDS, max_age=DEFAULT_MAX_AGE, build=''):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries (int): Size of the LRU.
+            ttl (float): Seconds a result set is reused.
+            max_age (int): ``Cache-Control`` max-age for search pages.
+            build (str): Build identifier folded into every ETag.
+        """
+        self.entries = TTLLRUCache(max_entries, ttl)
+        self.max_age = max_age
+        self.build = build
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        """
+        Build the cache from ``SEARCH_CACHE_SIZE``, ``SEARCH_CACHE_TTL``,
+        ``SEARCH_MAX_AGE`` and ``build_id()``.
+
+        Returns:
+            SearchCache: The configured cache.
+        """
+        return cls(int(os.environ.get('SEARCH_CACHE_SIZE', DEFAULT_MAX_ENTRIES)),
+                   float(os.environ.get('SEARCH_CACHE_TTL', DEFAULT_TTL_SECONDS)),
+                   int(os.environ.get('SEARCH_MAX_AGE', DEFAULT_MAX_AGE)),
+                   build_id())
+
+    @staticmethod
+    def key(query, filters, catalog, aliases):
+        """
+        Cache key for a search.
+
+        Args:
+            query (str): Raw query text.
+            filters (dict): Facet name to selected values.
+            catalog (Catalog): Catalog being searched.
+            aliases (AliasDictionary): Alias dictionary used for expansion.
+
+        Returns:
+            tuple: Hashable key.
+        """
+        return (normalize_query(query), normalize_filters(filters), catalog.content_hash, aliases.content_hash)
+
+    def etag(self, key, variant=''):
+        """
+        ETag for the page rendered from ``key`` by this build.
+
+        Args:
+            key (tuple): From ``SearchCache.key``.
+            variant (str): Anything else the page depends on, such as the user.
+
+        Returns:
+            str: Opaque tag, without quotes.
+        """
+        return hashlib.sha256(repr((self.build, key, variant)).encode('utf-8')).hexdigest()[:32]
+
+    def get_or_search(self, key, search):
+        """
+        Return the cached result for ``key``, or run ``search()`` and cache it.
+
+        Args:
+            key (tuple): From ``SearchCache.key``.
+            search (callable): Produces the result on a miss.
+        """
+        value = self.entries.get(key)
+        if value is not None:
+            with self._lock:
+                self.hits += 1
+            metrics.CACHE_LOOKUPS.inc(cache='search', result='hit')
+            return value
+
+        with self._lock:
+            self.misses += 1
+        metrics.CACHE_LOOKUPS.inc(cache='search', result='miss')
+        value = search()
+        self.entries.set(key, value)
+        return value
+
+    def stats(self):
+        """Return hit/miss counters for monitoring."""
+        return {'entries': len(self.entries), 'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Seed a database with production-scale synthetic data for performance testing.
+
+Generates companies, students, enrollments, quizzes, quiz attempts and CV
+profiles with skewed, realistic distributions: a few large companies and a
+long tail, popular courses enrolled far more than niche ones, most quizzes
+attempted once or twice, and scores clustered around 70%.
+
+Rows are written in batches with one multi-row statement per table per batch
+(``executemany``), or with ``COPY`` on PostgreSQL, so 100k students and
+millions of dependent rows load in minutes. Every seeded student can log in
+with the password given by ``--password``.
+
+    python seed_large.py --students 100000
+    DATABASE_URL=postgresql://... python seed_large.py --students 200000 --method copy
+"""
+
+import argparse
+import csv
+import io
+import json
+import math
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, func, select, text
+from werkzeug.security import generate_password_hash
+
+import synthetic_data
+from compression import compress_text
+from models import SCHEMA_VERSION, db, Company, CourseQuiz, CourseQuizAttempt, Student, UserCourse, UserProfile
+from schema_migrations import is_new_database, stamp_version
+
+CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'data', 'course_catalog.json')
+INDUSTRIES = ['Technology', 'Finance', 'Healthcare', 'Retail', 'Manufacturing', 'Education',
+              'Consulting', 'Logistics', 'Media', 'Public Sector']
+STATUS_WEIGHTS = {'enrolled': 50, 'in_progress': 30, 'completed': 20}
+HISTORY_DAYS = 730
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
+
+COLUMNS = {
+    Company: ['id', 'name', 'industry', 'created_at'],
+    Student: ['id', 'name', 'email', 'enrolled_at', 'company_id', 'username', 'password_hash',
+              'is_active', 'date_joined', 'quiz_user_uuid'],
+    UserCourse: ['id', 'user_id', 'category', 'course_name', 'status', 'created_at'],
+    CourseQuiz: ['id', 'user_course_id', 'quiz_api_id', 'quiz_title', 'quiz_description',
+                 'questions_count', 'created_at'],
+    CourseQuizAttempt: ['id', 'user_id', 'course_quiz_id', 'attempt_api_id', 'score', 'total_questions',
+                        'correct_answers', 'feedback_strengths', 'feedback_improvements', 'user_answers',
+                        'completed_at'],
+    UserProfile: ['id', 'user_id', 'cv_text', 'job_description', 'skills', 'skill_analysis', 'uploaded_at'],
+}
+# Tables in foreign key order
+TABLES = [Company, Student, UserCourse, CourseQuiz, CourseQuizAttempt, UserProfile]
+
+
+def get_database_url():
+    """Get database URL from environment"""
+    db_url = os.environ.get('DATABASE_URL')
+    if db_url and db_url.startswith('postgres://'):
+        db_url = db_url.replace('postgres://', 'postgresql://')
+    return db_url or 'sqlite:///skillstown.db'
+
+
+def load_catalog_courses():
+    """(category, course) pairs from the course catalog, in file order"""
+    with open(CATALOG_PATH, 'r', encoding='utf-8') as f:
+        catalog = json.load(f)
+    return [(category['name'], course) for category in catalog.get('categories', [])
+            for course in category.get('courses', [])]
+
+
+def zipf_weights(count, exponent=1.1):
+    """Popularity weights for ranks 1..count"""
+    return [1 / (rank ** exponent) for rank in range(1, count + 1)]
+
+
+class Seeder:
+    """
+    Generates rows batch by batch and writes them with the chosen method.
+    """
+
+    def __init__(self, conn, method, rng, options):
+        self.conn = conn
+        self.method = method
+        self.rng = rng
+        self.options = options
+        self.run = uuid.UUID(int=rng.getrandbits(128)).hex[:8]
+        self.now = datetime.utcnow()
+        self.password_hash = generate_password_hash(options.password)
+        self.courses = load_catalog_courses()
+        self.course_weights = zipf_weights(len(self.courses))
+        # Integer keys are assigned here so children can reference parents without RETURNING
+        self.next_id = {model: (conn.execute(select(func.max(model.__table__.c.id))).scalar() or 0) + 1
+                        for model in (UserCourse, CourseQuiz, CourseQuizAttempt, UserProfile)}
+        self.counts = {model: 0 for model in TABLES}
+
+    def new_uuid(self):
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def take_id(self, model):
+        value = self.next_id[model]
+        self.next_id[model] += 1
+        return value
+
+    def random_time(self, after=None):
+        """A timestamp within the history window, later than ``after``"""
+        start = after or self.now - timedelta(days=HISTORY_DAYS)
+        span = max((self.now - start).total_seconds(), 1)
+        # Skew towards the start so later events have room to follow
+        return start + timedelta(seconds=span * self.rng.random() ** 2)
+
+    # Generation
+
+    def companies(self):
+        rows = [(self.new_uuid(), f"{self.rng.choice(synthetic_data.SKILLS)} Labs {self.run}-{i}",
+                 self.rng.choice(INDUSTRIES), self.random_time())
+                for i in range(self.options.companies)]
+        self.write(Company, rows)
+        return [row[0] for row in rows]
+
+    def batch(self, start, size, company_ids, company_weights):
+        """Generate and write ``size`` students and everything that hangs off them"""
+        rng = self.rng
+        students, user_courses, quizzes, attempts, profiles = [], [], [], [], []
+        status_names, status_weights = list(STATUS_WEIGHTS), list(STATUS_WEIGHTS.values())
+
+        for index in range(start, start + size):
+            student_id = self.new_uuid()
+            joined = self.random_time()
+            company_id = rng.choices(company_ids, company_weights)[0] if company_ids and rng.random() > 0.1 else None
+            email = f"student{index}.{self.run}@seed.skillstown.test"
+            n_courses = min(len(self.courses), max(1, round(rng.lognormvariate(math.log(self.options.courses_per_student), 0.6))))
+            has_quizzes = False
+
+            for position in self.pick_courses(n_courses):
+                category, course = self.courses[position]
+                course_id = self.take_id(UserCourse)
+                enrolled = self.random_time(joined)
+                user_courses.append((course_id, student_id, category, course['name'],
+                                     rng.choices(status_names, status_weights)[0], enrolled))
+
+                for _ in range(self.quiz_count()):
+                    has_quizzes = True
+                    quiz_id = self.take_id(CourseQuiz)
+                    quiz_created = self.random_time(enrolled)
+                    questions = rng.choice((5, 5, 10))
+                    quizzes.append((quiz_id, course_id, self.new_uuid(), f"{course['name']} Quiz",
+                                    f"Test your knowledge of {course['name']}.", questions, quiz_created))
+
+                    for _ in range(self.attempt_count()):
+                        attempts.append(self.attempt(student_id, quiz_id, questions, course, quiz_created))
+
+            if rng.random() < self.options.profile_rate:
+                profiles.append(self.profile(student_id, joined))
+
+            students.append((student_id, f"Student {index}", email, joined, company_id, email, self.password_hash,
+                             True, joined, self.new_uuid() if has_quizzes else None))
+
+        for model, rows in ((Student, students), (UserCourse, user_courses), (CourseQuiz, quizzes),
+                            (CourseQuizAttempt, attempts), (UserProfile, profiles)):
+            self.write(model, rows)
+
+    def pick_courses(self, count):
+        """Distinct catalog positions, biased towards popular courses"""
+        picked = dict.fromkeys(self.rng.choices(range(len(self.courses)), self.course_weights, k=count * 2))
+        positions = list(picked)[:count]
+        while len(positions) < count:
+            position = self.rng.randrange(len(self.courses))
+            if position not in positions:
+                positions.append(position)
+        return positions
+
+    def quiz_count(self):
+        roll = self.rng.random()
+        return 0 if roll < 0.4 else 1 if roll < 0.8 else self.rng.randint(2, 4)
+
+    def attempt_count(self):
+        roll = self.rng.random()
+        return 0 if roll < 0.15 else 1 if roll < 0.7 else self.rng.randint(2, 5)
+
+    def attempt(self, student_id, quiz_id, questions, course, after):
+        rng = self.rng
+        score = min(100, max(0, round(rng.gauss(70, 15))))
+        correct = round(questions * score / 100)
+        skills = course.get('skills') or [course['name']]
+        strong = rng.sample(skills, min(len(skills), 2))
+        weak = [skill for skill in skills if skill not in strong][:2] or ['None - great job']
+        return (self.take_id(CourseQuizAttempt), student_id, quiz_id, self.new_uuid(), score, questions, correct,
+                ', '.join(strong), ', '.join(weak), [rng.randrange(4) for _ in range(questions)],
+                self.random_time(after))
+
+    def profile(self, student_id, after):
+        rng = self.rng
+        cv_text = synthetic_data.make_cv_text(rng.randint(2000, 8000), seed=rng.getrandbits(32))
+        skills = rng.sample(synthetic_data.SKILLS, rng.randint(5, 20))
+        job_description = synthetic_data.make_cv_text(rng.randint(500, 2000), seed=rng.getrandbits(32)) \
+            if rng.random() < 0.3 else None
+        analysis = {
+            'current_skills': skills,
+            'experience_level': rng.choice(['entry', 'mid', 'senior']),
+            'learning_recommendations': rng.sample(synthetic_data.SKILLS, 3),
+            'career_paths': [f"{skills[0]} Developer"],
+        }
+        return (self.take_id(UserProfile), student_id, compress_text(cv_text),
+                compress_text(job_description) if job_description else None,
+                ', '.join(skills), analysis, self.random_time(after))
+
+    # Writing
+
+    def write(self, model, rows):
+        if not rows:
+            return
+        table = model.__table__.name
+        columns = COLUMNS[model]
+        if self.method == 'copy':
+            self.copy(table, columns, rows)
+        else:
+            self.executemany(table, columns, rows)
+        self.counts[model] += len(rows)
+
+    def executemany(self, table, columns, rows):
+        marker = '?' if self.conn.dialect.paramstyle == 'qmark' else '%s'
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join([marker] * len(columns))})"
+        self.conn.exec_driver_sql(sql, [tuple(self.adapt(value, False) for value in row) for row in rows])
+
+    def copy(self, table, columns, rows):
+        buffer = io.StringIO()
+        # QUOTE_NONNUMERIC writes None as an unquoted empty field, which COPY reads as NULL
+        writer = csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC)
+        writer.writerows(tuple(self.adapt(value, True) for value in row) for row in rows)
+        buffer.seek(0)
+        cursor = self.conn.connection.cursor()
+        cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+    @staticmethod
+    def adapt(value, for_copy):
+        if isinstance(value, datetime):
+            return value.strftime(TIMESTAMP_FORMAT)
+        if isinstance(value, (dict, list)):
+            return json.dumps(value)
+        if isinstance(value, bytes) and for_copy:
+            return '\\x' + value.hex()
+        if isinstance(value, bool) and for_copy:
+            return 'true' if value else 'false'
+        return value
+
+    def finish(self):
+        """Move PostgreSQL sequences past the explicit ids and refresh planner statistics"""
+        if self.conn.dialect.name == 'postgresql':
+            for model in self.next_id:
+                table = model.__table__.name
+                self.conn.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT COALESCE(MAX(id), 1) FROM {table}))"
+                ))
+        self.conn.commit()
+        for model in TABLES:
+            self.conn.execute(text(f"ANALYZE {model.__table__.name}"))
+        self.conn.commit()
+
+
+def run_seed(options):
+    """Create the schema if needed and seed it"""
+    print("🌱 Seeding large-scale synthetic data...")
+    print("=" * 50)
+
+    db_url = get_database_url()
+    print(f"Database URL: {db_url}")
+    engine = create_engine(db_url)
+    with engine.connect() as conn:
+        new = is_new_database(conn)
+    db.metadata.create_all(engine)
+    if new:
+        # A new database gets the current schema, so no migrations are pending
+        with engine.connect() as conn:
+            stamp_version(conn, SCHEMA_VERSION)
+
+    method = options.method
+    if method == 'auto':
+        method = 'copy' if engine.dialect.name == 'postgresql' else 'executemany'
+    if method == 'copy' and engine.dialect.name != 'postgresql':
+        print("❌ COPY is only available on PostgreSQL")
+        return False
+
+    started = time.perf_counter()
+    try:
+        with engine.connect() as conn:
+            if engine.dialect.name == 'sqlite':
+                conn.exec_driver_sql("PRAGMA synchronous = OFF")
+            seeder = Seeder(conn, method, random.Random(options.seed), options)
+            company_ids = seeder.companies()
+            company_weights = zipf_weights(len(company_ids), 0.9)
+            conn.commit()
+
+            for start in range(0, options.students, options.batch_size):
+                size = min(options.batch_size, options.students - start)
+                seeder.batch(start, size, company_ids, company_weights)
+                conn.commit()
+                done = start + size
+                rate = sum(seeder.counts.values()) / (time.perf_counter() - started)
+                print(f"   {done:,}/{options.students:,} students ({rate:,.0f} rows/s)")
+
+            seeder.finish()
+    except Exception as e:
+        print(f"❌ Seeding failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+    elapsed = time.perf_counter() - started
+    print(f"\n✅ Seeded in {elapsed:.1f}s using {method}:")
+    for model, count in seeder.counts.items():
+        print(f"   {model.__table__.name:<28} {count:>12,}")
+    print(f"   All seeded students use the password '{options.password}'")
+    return True
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Seed large-scale synthetic data')
+    parser.add_argument('--students', type=int, default=100000)
+    parser.add_argument('--companies', type=int, default=500)
+    parser.add_argument('--courses-per-student', type=float, default=8, help='Median enrollments per student')
+    parser.add_argument('--profile-rate', type=float, default=0.7, help='Share of students with an uploaded CV')
+    parser.add_argument('--batch-size', type=int, default=5000, help='Students per transaction')
+    parser.add_argument('--method', choices=['auto', 'copy', 'executemany'], default='auto',
+                        help='auto: COPY on PostgreSQL, executemany elsewhere')
+    parser.add_argument('--password', default='seed-password')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if run_seed(args):
+        print("\n🎉 Seeding completed successfully!")
+    else:
+        sys.exit(1)
@@ -199,10 +199,10 @@ def create_all_tables():
                         CREATE TABLE IF NOT EXISTS skillstown_user_profiles (
                             id SERIAL PRIMARY KEY,
                             user_id VARCHAR(36) NOT NULL REFERENCES students(id),
-                            cv_text TEXT,
-                            job_description TEXT,
+                            cv_text BYTEA,
+                            job_description BYTEA,
                             skills TEXT,
-                            skill_analysis TEXT,
+                            skill_analysis JSONB,
                             uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                         )
                     """))
@@ -296,8 +296,8 @@ def create_all_tables():
                             description TEXT,
                             progress_percentage INTEGER DEFAULT 0,
                             completed_at TIMESTAMP,
-                            materials TEXT,
-                            quiz_results TEXT,
+                            materials JSONB,
+                            quiz_results JSONB,
                             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                         )
                     """))
@@ -360,7 +360,7 @@ def create_all_tables():
                             correct_answers INTEGER,
                             feedback_strengths TEXT,
                             feedback_improvements TEXT,
-                            user_answers TEXT,
+                            user_answers JSONB,
                             completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                         )
                     """))
@@ -384,6 +384,18 @@ def create_all_tables():
                     """))
                 print("✅ skillstown_quiz_attempts table created")
                 
+                # 13. Indexes backing keyset pagination of courses and quiz history
+                print("📝 Creating pagination indexes...")
+                conn.execute(text("""
+                    CREATE INDEX IF NOT EXISTS ix_skillstown_user_courses_user_created
+                    ON skillstown_user_courses (user_id, created_at, id)
+                """))
+                conn.execute(text("""
+                    CREATE INDEX IF NOT EXISTS ix_skillstown_quiz_attempts_user_completed
+                    ON skillstown_quiz_attempts (user_id, completed_at, id)
+                """))
+                print("✅ Pagination indexes created")
+                
                 # Commit all changes
                 trans.commit()
                 print("\n🎉 All database tables created successfully!")
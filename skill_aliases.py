@@ -0,0 +1,108 @@
+"""
+Shared skill alias dictionary for the SkillsTown CV Analyzer application.
+
+``static/data/skill_aliases.json`` maps each canonical skill name to the
+spellings people use for it (``"Kubernetes": ["k8s", "kube"]``). It is
+compiled once per worker (and again only when the file changes) into a flat
+hash map from every lower-cased alias to its canonical name. The same map
+normalizes extracted CV skills and expands search queries, so "k8s" finds
+Kubernetes courses.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+ALIASES_PATH = os.environ.get(
+    'SKILL_ALIASES_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'data', 'skill_aliases.json'))
+
+
+def content_digest(raw):
+    """Short hex digest identifying catalog or alias file contents."""
+    return hashlib.sha256(raw).hexdigest()[:16]
+
+
+class AliasDictionary:
+    """
+    Lower-cased alias to canonical skill name, built once at load time.
+    """
+
+    __slots__ = ('canonical', 'expansions', 'content_hash')
+
+    def __init__(self, data, content_hash=None):
+        """
+        Args:
+            data (dict): Canonical name to a list of aliases.
+            content_hash (str, optional): Hash of the alias file; computed
+                from ``data`` when not given.
+        """
+        self.content_hash = content_hash or content_digest(json.dumps(data, sort_keys=True).encode('utf-8'))
+        self.canonical = {}
+        for name, aliases in data.items():
+            for alias in [name, *aliases]:
+                key = ' '.join(alias.lower().split())
+                if key in self.canonical and self.canonical[key] != name:
+                    logger.warning(f"Skill alias '{alias}' maps to both {self.canonical[key]} and {name}")
+                    continue
+                self.canonical[key] = name
+        # Search terms for an alias: the canonical name, lower-cased
+        self.expansions = {alias: name.lower() for alias, name in self.canonical.items() if alias != name.lower()}
+
+    def __len__(self):
+        return len(self.canonical)
+
+    def normalize(self, skill):
+        """
+        Canonical name for ``skill``.
+
+        Args:
+            skill (str): A skill name in any case, e.g. ``k8s``.
+
+        Returns:
+            str: The canonical name, or None if ``skill`` is not a known alias.
+        """
+        return self.canonical.get(' '.join(skill.lower().split()))
+
+    def expand(self, word):
+        """Lower-cased canonical name a lower-cased query word stands for, or None."""
+        return self.expansions.get(word)
+
+
+_cache = {'path': None, 'mtime': None, 'aliases': AliasDictionary({})}
+_lock = threading.Lock()
+
+
+def get_aliases(path=ALIASES_PATH):
+    """
+    Return the compiled alias dictionary, reloading it only when the file has changed.
+
+    Args:
+        path (str): Alias JSON file.
+
+    Returns:
+        AliasDictionary: The shared dictionary; empty if the file cannot be read.
+    """
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError as e:
+        logger.error(f"Skill aliases unavailable at {path}: {e}")
+        return AliasDictionary({})
+
+    if _cache['path'] != path or _cache['mtime'] != mtime:
+        with _lock:
+            if _cache['path'] != path or _cache['mtime'] != mtime:
+                try:
+                    with open(path, 'rb') as f:
+                        raw = f.read()
+                    aliases = AliasDictionary(json.loads(raw.decode('utf-8')), content_digest(raw))
+                except (OSError, ValueError, AttributeError) as e:
+                    logger.error(f"Error loading skill aliases from {path}: {e}")
+                    return _cache['aliases']
+                _cache.update(path=path, mtime=mtime, aliases=aliases)
+                logger.info(f"Loaded skill aliases: {len(aliases)} spellings")
+    return _cache['aliases']
@@ -10,11 +10,16 @@ import re
 import os
 from collections import Counter
 
+import http_client
+import metrics
+from skill_aliases import get_aliases
+from tracing import span
+
 logger = logging.getLogger(__name__)
 
 # Gemini API Configuration
 GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY')
-GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1/models/gemini-2.0-flash:generateContent"
+GEMINI_API_URL = os.environ.get("GEMINI_API_URL", "https://generativelanguage.googleapis.com/v1/models/gemini-2.0-flash:generateContent")
 
 # Gemini API settings for different use cases
 GEMINI_CONFIGS = {
@@ -143,21 +148,27 @@ class SkillExtractor:
             return self._empty_result()
         
         # Try Gemini API first
+        fallback_reason = 'no_api_key'
         if GEMINI_API_KEY:
             try:
                 logger.info("Attempting skill extraction with Gemini API")
-                result = self._extract_with_gemini(text, job_description)
+                with metrics.EXTRACTION_DURATION.time(method='gemini'):
+                    result = self._extract_with_gemini(text, job_description)
                 if result:
                     logger.info(f"Gemini extraction successful - found {len(result.get('current_skills', []))} skills")
                     return result
                 else:
                     logger.warning("Gemini API returned empty result")
+                    fallback_reason = 'empty_result'
             except Exception as e:
                 logger.error(f"Gemini API extraction failed: {e}")
+                fallback_reason = 'error'
         
         # Fallback to basic extraction
         logger.info("Using fallback skill extraction")
-        return self._extract_fallback(text, max_skills)
+        metrics.EXTRACTION_FALLBACKS.inc(reason=fallback_reason)
+        with span('skill_fallback'), metrics.EXTRACTION_DURATION.time(method='fallback'):
+            return self._extract_fallback(text, max_skills)
     
     def _extract_with_gemini(self, cv_text, job_description=None):
         """
@@ -180,7 +191,8 @@ class SkillExtractor:
         
         try:
             url = f"{GEMINI_API_URL}?key={GEMINI_API_KEY}"
-            response = requests.post(url, headers=headers, json=data, timeout=30)
+            with span('gemini'):
+                response = http_client.post(url, service='gemini', headers=headers, json=data, timeout=30)
             
             if response.status_code == 200:
                 response_json = response.json()
@@ -499,32 +511,8 @@ class SkillExtractor:
         """
         skill = skill.strip()
         
-        # Common normalizations
-        normalizations = {
-            'javascript': 'JavaScript',
-            'typescript': 'TypeScript',
-            'python': 'Python',
-            'java': 'Java',
-            'c++': 'C++',
-            'c#': 'C#',
-            'html': 'HTML',
-            'css': 'CSS',
-            'sql': 'SQL',
-            'aws': 'AWS',
-            'gcp': 'GCP',
-            'api': 'API',
-            'rest': 'REST API',
-            'json': 'JSON',
-            'xml': 'XML',
-            'ai': 'AI',
-            'ml': 'Machine Learning',
-            'react': 'React',
-            'angular': 'Angular',
-            'vue.js': 'Vue.js',
-            'node.js': 'Node.js'
-        }
-        
-        return normalizations.get(skill.lower(), skill.title())
+        # Known spellings come from the shared alias dictionary
+        return get_aliases().normalize(skill) or skill.title()
     
     def _categorize_skills(self, skills):
         """
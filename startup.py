@@ -0,0 +1,197 @@
+"""
+Startup helpers for the SkillsTown CV Analyzer application.
+
+Keeps worker boot cheap: heavy modules are imported lazily, the schema is
+verified with a single query instead of ``db.create_all()``, and every boot
+phase is timed so slow spawns are visible in the logs.
+"""
+
+import importlib.util
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+from sqlalchemy.exc import SQLAlchemyError
+
+logger = logging.getLogger(__name__)
+
+BOOT_MODE_FAST = 'fast'
+BOOT_MODE_FULL = 'full'
+
+
+def lazy_import(name):
+    """
+    Import a module lazily; it is only executed on first attribute access.
+
+    Args:
+        name (str): Fully qualified module name.
+
+    Returns:
+        module: The (possibly not yet loaded) module object.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f"No module named '{name}'")
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def get_boot_mode(is_production=False):
+    """
+    Resolve the boot mode from the ``BOOT_MODE`` environment variable.
+
+    Production defaults to fast boot, development to a full ``create_all``.
+
+    Args:
+        is_production (bool): Whether the app runs in production.
+
+    Returns:
+        str: Either ``'fast'`` or ``'full'``.
+    """
+    default = BOOT_MODE_FAST if is_production else BOOT_MODE_FULL
+    mode = os.environ.get('BOOT_MODE', default).strip().lower()
+    return mode if mode in (BOOT_MODE_FAST, BOOT_MODE_FULL) else default
+
+
+def running_from_cli():
+    """Return True when the app is being built by the ``flask`` command."""
+    return os.environ.get('FLASK_RUN_FROM_CLI') == 'true'
+
+
+class StartupTimer:
+    """
+    Record how long each named phase of application startup takes.
+    """
+
+    def __init__(self):
+        self.timings = {}
+        self._started = self._last = time.perf_counter()
+
+    def mark(self, name):
+        """
+        Record the time spent since the previous mark or phase.
+
+        Args:
+            name (str): Phase name used as the key in ``timings``.
+        """
+        now = time.perf_counter()
+        self.timings[name] = round((now - self._last) * 1000, 2)
+        self._last = now
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Time a block of startup work.
+
+        Args:
+            name (str): Phase name used as the key in ``timings``.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._last = time.perf_counter()
+            self.timings[name] = round((self._last - start) * 1000, 2)
+
+    @property
+    def total_ms(self):
+        """Milliseconds elapsed since the timer was created."""
+        return round((time.perf_counter() - self._started) * 1000, 2)
+
+    def report(self):
+        """
+        Log the per-phase timings and return them with the total.
+
+        Returns:
+            dict: Phase name to milliseconds, plus a ``total`` entry.
+        """
+        timings = dict(self.timings, total=self.total_ms)
+        logger.info("Startup timings (ms): " + ", ".join(f"{k}={v}" for k, v in timings.items()))
+        return timings
+
+
+class SchemaOutOfDate(RuntimeError):
+    """The database schema is older than the models and may not be migrated at boot."""
+
+
+def auto_migrate_enabled(boot_mode):
+    """
+    Whether boot may run pending schema migrations itself.
+
+    ``SCHEMA_AUTO_MIGRATE`` overrides the default, which is on for full boots
+    (development) and off for fast boots (production, where migrations run
+    once at deploy time via ``python schema_migrations.py``).
+    """
+    value = os.environ.get('SCHEMA_AUTO_MIGRATE')
+    if value is None:
+        return boot_mode == BOOT_MODE_FULL
+    return value.strip().lower() in ('1', 'true', 'yes')
+
+
+def ensure_schema(db, version, boot_mode):
+    """
+    Make sure the database schema matches the models.
+
+    In fast mode a single ``SELECT`` against ``skillstown_schema_version``
+    is enough when the recorded version matches. Otherwise
+    ``db.create_all()`` adds missing tables. ``create_all`` never alters
+    existing tables, so the version is only recorded once the pending steps in
+    ``schema_migrations.MIGRATIONS`` have run. If auto-migration is disabled,
+    boot is refused instead. A new database is created at the current version.
+    Must be called inside an application context.
+
+    Args:
+        db: The Flask-SQLAlchemy instance.
+        version (int): Schema version expected by the models.
+        boot_mode (str): ``'fast'`` or ``'full'``.
+
+    Returns:
+        str: ``'verified'`` if the fast check passed, ``'migrated'`` if pending
+        migrations ran, ``'created'`` otherwise.
+
+    Raises:
+        SchemaOutOfDate: If migrations are pending and auto-migration is disabled.
+    """
+    import schema_migrations
+
+    with db.engine.connect() as conn:
+        current = schema_migrations.read_version(conn)
+        if boot_mode == BOOT_MODE_FAST and current == version:
+            return 'verified'
+        new = schema_migrations.is_new_database(conn)
+
+    pending = [] if new else schema_migrations.pending_migrations(current, version)
+    if pending and not auto_migrate_enabled(boot_mode):
+        steps = ', '.join(f"{v} ({description})" for v, description, _ in pending)
+        raise SchemaOutOfDate(
+            f"Database schema is at version {current or schema_migrations.BASELINE_VERSION}, the models need {version}. "
+            f"Run 'python schema_migrations.py' before starting workers. Pending: {steps}"
+        )
+
+    db.create_all()
+    if new:
+        try:
+            with db.engine.connect() as conn:
+                schema_migrations.stamp_version(conn, version)
+        except SQLAlchemyError as e:
+            # Another worker recorded the version concurrently
+            logger.debug(f"Schema version stamp skipped: {e}")
+        return 'created'
+    if current is not None and current > version:
+        logger.warning(f"Database schema version {current} is newer than the models ({version})")
+        return 'created'
+    if current != version:
+        logger.info(f"Schema version {current} does not match {version}, running migrations")
+        schema_migrations.run_migrations(db.engine, version)
+        return 'migrated'
+    return 'created'
@@ -110,4 +110,75 @@ function copySkillsToClipboard() {
             }, 3000);
         });
     }
-}
\ No newline at end of file
+}
+
+function debounce(fn, delay) {
+    let timer;
+    return function(...args) {
+        clearTimeout(timer);
+        timer = setTimeout(() => fn.apply(this, args), delay);
+    };
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    const input = document.querySelector('input[data-suggest-url]');
+    const list = document.getElementById('search-suggestions');
+    if (!input || !list) return;
+    
+    const SUGGEST_DELAY_MS = 150;
+    const labels = { course: 'Course', skill: 'Skill', career_path: 'Career' };
+    let controller = null;
+    
+    function hideSuggestions() {
+        list.classList.add('d-none');
+        list.innerHTML = '';
+    }
+    
+    function showSuggestions(suggestions) {
+        list.innerHTML = '';
+        suggestions.forEach(suggestion => {
+            const item = document.createElement('button');
+            item.type = 'button';
+            item.className = 'list-group-item list-group-item-action d-flex justify-content-between';
+            item.textContent = suggestion.text;
+            
+            const badge = document.createElement('small');
+            badge.className = 'text-muted ms-2';
+            badge.textContent = labels[suggestion.type] || suggestion.type;
+            item.appendChild(badge);
+            
+            item.addEventListener('mousedown', (e) => {
+                e.preventDefault();
+                input.value = suggestion.text;
+                hideSuggestions();
+                input.form.submit();
+            });
+            list.appendChild(item);
+        });
+        list.classList.toggle('d-none', suggestions.length === 0);
+    }
+    
+    const fetchSuggestions = debounce(function() {
+        const query = input.value.trim();
+        // Drop the response of any request the user has already typed past
+        if (controller) controller.abort();
+        if (!query) {
+            hideSuggestions();
+            return;
+        }
+        
+        controller = new AbortController();
+        fetch(`${input.dataset.suggestUrl}?q=${encodeURIComponent(query)}`, { signal: controller.signal })
+            .then(response => response.json())
+            .then(data => showSuggestions(data.suggestions || []))
+            .catch(error => {
+                if (error.name !== 'AbortError') hideSuggestions();
+            });
+    }, SUGGEST_DELAY_MS);
+    
+    input.addEventListener('input', fetchSuggestions);
+    input.addEventListener('blur', hideSuggestions);
+    input.addEventListener('keydown', (e) => {
+        if (e.key === 'Escape') hideSuggestions();
+    });
+});
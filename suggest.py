@@ -0,0 +1,212 @@
+"""
+Search-as-you-type suggestions for the SkillsTown course search.
+
+Course names, catalog skills and career paths go into a prefix trie. Each
+node stores the top suggestions for its prefix, ranked by popularity, so a
+lookup walks one node per typed character and returns a precomputed list.
+Every word start of a suggestion is indexed, so "learn" also finds
+"Machine Learning Fundamentals".
+
+Every course counts one plus its enrollments. A course's popularity is that
+count; a skill or career path adds up the counts of every course that lists
+it, so an unenrolled catalog still ranks common skills first without a
+single-course skill outranking its course. The trie is rebuilt when the
+catalog reloads or the popularity snapshot expires. Popularity is reloaded
+on a background thread, and suggest requests keep using the current trie
+until the new one is ready, so no keystroke waits for the aggregate.
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+TOP_K = int(os.environ.get('SUGGEST_TOP_K', '8'))
+POPULARITY_TTL = float(os.environ.get('SUGGEST_POPULARITY_TTL', '300'))
+# Prefixes longer than this share the node of their first MAX_PREFIX characters
+MAX_PREFIX = 30
+
+_SPACES = re.compile(r"\s+")
+
+
+def normalize(text):
+    """Lower-case ``text`` and collapse runs of whitespace."""
+    return _SPACES.sub(' ', text.lower()).strip()
+
+
+class Suggestion:
+    """
+    One entry that can be suggested.
+    """
+
+    __slots__ = ('text', 'kind', 'category', 'popularity')
+
+    def __init__(self, text, kind, category=None, popularity=0):
+        self.text = text
+        self.kind = kind
+        self.category = category
+        self.popularity = popularity
+
+    def rank(self):
+        return (-self.popularity, self.text.lower())
+
+    def to_dict(self):
+        data = {'text': self.text, 'type': self.kind}
+        if self.category:
+            data['category'] = self.category
+        return data
+
+
+class _Node:
+    __slots__ = ('children', 'top')
+
+    def __init__(self):
+        self.children = {}
+        self.top = []
+
+
+class SuggestIndex:
+    """
+    Prefix trie with the top-k suggestions precomputed at every node.
+    """
+
+    def __init__(self, suggestions, top_k=TOP_K):
+        """
+        Args:
+            suggestions (iterable): ``Suggestion`` objects.
+            top_k (int): Suggestions kept per prefix.
+        """
+        self.top_k = top_k
+        self.root = _Node()
+        # Inserting best-first means each node's list fills in rank order
+        ranked = sorted(suggestions, key=Suggestion.rank)
+        for suggestion in ranked:
+            self._insert(suggestion)
+        self.size = len(ranked)
+
+    def _insert(self, suggestion):
+        text = normalize(suggestion.text)
+        starts = [0] + [match.end() for match in re.finditer(' ', text)]
+        visited = set()
+        for start in starts:
+            node = self.root
+            for char in text[start:start + MAX_PREFIX]:
+                node = node.children.setdefault(char, _Node())
+                if id(node) not in visited and len(node.top) < self.top_k:
+                    visited.add(id(node))
+                    node.top.append(suggestion)
+
+    def lookup(self, prefix, limit=None):
+        """
+        Suggestions for a typed prefix.
+
+        Args:
+            prefix (str): What the user has typed so far.
+            limit (int, optional): At most this many, up to ``top_k``.
+
+        Returns:
+            list: ``Suggestion`` objects, most popular first.
+        """
+        prefix = normalize(prefix)[:MAX_PREFIX]
+        if not prefix:
+            return []
+        node = self.root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return node.top[:limit or self.top_k]
+
+
+def build_suggestions(catalog, enrollments):
+    """
+    Turn the catalog into suggestions with popularity counts.
+
+    Args:
+        catalog (Catalog): The course catalog.
+        enrollments (dict): Lower-cased course name to enrollment count.
+
+    Returns:
+        list: ``Suggestion`` objects; skills and career paths are deduplicated
+        case-insensitively.
+    """
+    suggestions = []
+    shared = {}
+    for record in catalog.records:
+        # The +1 base is shared with the skills and career paths the course lists
+        weight = enrollments.get(record.name_lower, 0) + 1
+        suggestions.append(Suggestion(record.name, 'course', record.category, weight))
+        for kind, values in (('skill', record.skills), ('career_path', record.career_paths)):
+            for value in values:
+                key = (kind, value.lower())
+                if key not in shared:
+                    shared[key] = Suggestion(value, kind)
+                shared[key].popularity += weight
+    suggestions.extend(shared.values())
+    return suggestions
+
+
+_state = {'catalog': None, 'index': None, 'enrollments': {}, 'expires': 0.0, 'refreshing': False}
+_lock = threading.Lock()
+
+
+def _build(catalog, enrollments):
+    start = time.perf_counter()
+    index = SuggestIndex(build_suggestions(catalog, enrollments))
+    logger.info(f"Built suggestion index: {index.size} entries in {(time.perf_counter() - start) * 1000:.1f}ms")
+    return index
+
+
+def _refresh(catalog, load_enrollments):
+    """Load a new popularity snapshot and swap in a trie built from it."""
+    try:
+        enrollments = load_enrollments()
+    except Exception as e:
+        # Keep ranking by the previous snapshot and try again after POPULARITY_TTL
+        logger.warning(f"Could not load course popularity for suggestions: {e}")
+        enrollments = None
+    index = None
+    try:
+        index = _build(catalog, enrollments) if enrollments is not None else None
+    finally:
+        with _lock:
+            if index is not None:
+                _state['enrollments'] = enrollments
+                if _state['catalog'] is catalog:
+                    _state['index'] = index
+            _state['expires'] = time.monotonic() + POPULARITY_TTL
+            _state['refreshing'] = False
+
+
+def get_suggest_index(catalog, load_enrollments):
+    """
+    Return the suggestion trie for ``catalog`` without waiting for popularity.
+
+    A changed catalog is indexed right away with the last popularity snapshot.
+    When the snapshot is older than ``POPULARITY_TTL``, a background thread
+    loads a new one and swaps in a new trie; until then the current trie is
+    returned.
+
+    Args:
+        catalog (Catalog): The current catalog.
+        load_enrollments (callable): Returns ``{lower-cased course name: count}``;
+            called off the request thread. Failures are logged and the previous
+            snapshot is kept.
+    """
+    index = _state['index']
+    if index is None or _state['catalog'] is not catalog:
+        index = _build(catalog, _state['enrollments'])
+        with _lock:
+            _state.update(catalog=catalog, index=index)
+
+    if time.monotonic() >= _state['expires'] and not _state['refreshing']:
+        with _lock:
+            if _state['refreshing'] or time.monotonic() < _state['expires']:
+                return index
+            _state['refreshing'] = True
+        threading.Thread(target=_refresh, args=(catalog, load_enrollments),
+                         name='suggest-popularity', daemon=True).start()
+    return index
@@ -0,0 +1,178 @@
+"""
+Synthetic data for benchmarks and load tests.
+
+Generates course catalogs and CV texts of any size from a fixed vocabulary,
+and writes CVs as PDF, DOCX or TXT files without extra dependencies. All
+generators take a seed so runs are reproducible.
+"""
+
+import random
+import zipfile
+from xml.sax.saxutils import escape
+
+SKILLS = [
+    "Python", "Java", "JavaScript", "TypeScript", "C++", "C#", "Go", "Rust", "SQL", "HTML", "CSS",
+    "React", "Angular", "Vue.js", "Node.js", "Django", "Flask", "Spring", "PostgreSQL", "MongoDB",
+    "Redis", "Docker", "Kubernetes", "AWS", "Azure", "GCP", "Terraform", "Jenkins", "Git", "Linux",
+    "Machine Learning", "Data Science", "TensorFlow", "PyTorch", "Pandas", "NumPy", "Tableau",
+    "Power BI", "Excel", "Project Management", "Agile", "Scrum", "Leadership", "Communication",
+    "REST API", "GraphQL", "Microservices", "Unit Testing", "Selenium", "Cybersecurity",
+    "Digital Marketing", "SEO", "Financial Analysis", "Accounting", "Public Speaking",
+]
+
+CATEGORIES = [
+    "Programming", "Web Development", "Data Science", "Cloud & DevOps", "Databases",
+    "Business & Management", "Marketing", "Security", "Design", "Finance",
+]
+
+LEVELS = ["Beginner", "Intermediate", "Advanced", "Beginner to Intermediate", "Intermediate to Advanced"]
+
+FILLER = (
+    "hands-on projects real-world applications fundamentals best practices teams delivered "
+    "improved designed implemented maintained production systems customers performance reliable "
+    "scalable collaborated stakeholders requirements reporting automation workflow quality"
+).split()
+
+TITLE_WORDS = ["Introduction to", "Mastering", "Practical", "Applied", "Advanced", "Modern", "Complete"]
+
+
+def make_catalog(n_courses, n_categories=8, seed=0):
+    """
+    Build a catalog shaped like ``static/data/course_catalog.json``.
+
+    Args:
+        n_courses (int): Total number of courses.
+        n_categories (int): Number of categories the courses are spread over.
+        seed (int): Random seed.
+
+    Returns:
+        dict: ``{'categories': [{'name', 'courses': [...]}, ...]}``.
+    """
+    rng = random.Random(seed)
+    names = [CATEGORIES[i % len(CATEGORIES)] + (f" {i // len(CATEGORIES) + 1}" if i >= len(CATEGORIES) else '')
+             for i in range(n_categories)]
+    categories = [{'name': name, 'courses': []} for name in names]
+
+    for i in range(n_courses):
+        skills = rng.sample(SKILLS, 4)
+        description = ' '.join(
+            [f"Learn {skills[0]} and {skills[1]} with"] + rng.choices(FILLER, k=40) + [f"using {skills[2]}."]
+        )
+        categories[i % n_categories]['courses'].append({
+            'name': f"{rng.choice(TITLE_WORDS)} {skills[0]} {i}",
+            'description': description,
+            'duration': f"{rng.randint(2, 16)} weeks",
+            'level': rng.choice(LEVELS),
+            'skills': skills,
+            'projects': [f"{skills[3]} project {j}" for j in range(3)],
+            'career_paths': [f"{skills[0]} Developer", f"{skills[1]} Engineer"],
+        })
+    return {'categories': categories}
+
+
+def make_cv_text(n_chars, seed=0):
+    """
+    Build CV-like text of roughly ``n_chars`` characters.
+
+    Args:
+        n_chars (int): Target length.
+        seed (int): Random seed.
+
+    Returns:
+        str: Lines of experience mixing known skills and filler words.
+    """
+    rng = random.Random(seed)
+    lines = ["Jane Doe - Senior Software Engineer", "Summary: 8 years of experience leading teams."]
+    length = sum(len(line) + 1 for line in lines)
+    while length < n_chars:
+        words = rng.choices(FILLER, k=12)
+        for _ in range(3):
+            words.insert(rng.randrange(len(words)), rng.choice(SKILLS))
+        line = f"- {' '.join(words).capitalize()}."
+        lines.append(line)
+        length += len(line) + 1
+    return '\n'.join(lines)[:n_chars]
+
+
+def write_txt(path, text):
+    """Write ``text`` as a UTF-8 text file."""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def write_pdf(path, text, lines_per_page=50):
+    """
+    Write ``text`` as a minimal PDF (Helvetica, one text line per input line).
+
+    Args:
+        path (str): Output file.
+        text (str): Text; non-Latin-1 characters are replaced.
+        lines_per_page (int): Lines per page.
+    """
+    lines = text.splitlines() or ['']
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)]
+
+    def pdf_string(line):
+        line = line.encode('latin-1', 'replace').decode('latin-1')
+        return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+    # Object numbers: 1 catalog, 2 pages, 3 font, then (page, contents) pairs
+    objects = {3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"}
+    kids = []
+    for index, page_lines in enumerate(pages):
+        page_id, content_id = 4 + 2 * index, 5 + 2 * index
+        kids.append(f"{page_id} 0 R")
+        stream = "BT /F1 9 Tf 11 TL 40 800 Td " + ' '.join(f"({pdf_string(line)}) Tj T*" for line in page_lines) + " ET"
+        stream = stream.encode('latin-1')
+        objects[page_id] = (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>").encode()
+        objects[content_id] = b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)
+    objects[1] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for number in sorted(objects):
+        offsets[number] = len(out)
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, objects[number])
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for number in sorted(objects):
+        out += b"%010d 00000 n \n" % offsets[number]
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, 'wb') as f:
+        f.write(out)
+
+
+def write_docx(path, text):
+    """
+    Write ``text`` as a minimal DOCX with one paragraph per line.
+
+    Args:
+        path (str): Output file.
+        text (str): Text.
+    """
+    paragraphs = ''.join(f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>'
+                         for line in text.splitlines())
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as docx:
+        docx.writestr('[Content_Types].xml', (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/word/document.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+            '</Types>'))
+        docx.writestr('_rels/.rels', (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+            'Target="word/document.xml"/></Relationships>'))
+        docx.writestr('word/document.xml', (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+            f'<w:body>{paragraphs}</w:body></w:document>'))
+
+
+FILE_WRITERS = {'.pdf': write_pdf, '.docx': write_docx, '.txt': write_txt}
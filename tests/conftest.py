@@ -0,0 +1,49 @@
+"""
+Shared fixtures: the application modules on ``sys.path`` and one app, booted
+with ``TESTING`` on against a temporary SQLite database.
+"""
+
+import os
+import sys
+import uuid
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope='session')
+def app(tmp_path_factory):
+    database = tmp_path_factory.mktemp('db') / 'skillstown.db'
+    with pytest.MonkeyPatch.context() as env:
+        env.setenv('DATABASE_URL', f'sqlite:///{database}')
+        env.setenv('BOOT_MODE', 'full')
+        env.delenv('SQL_BUDGET_MODE', raising=False)
+        env.delenv('HTTP_RECORD', raising=False)
+        env.delenv('HTTP_REPLAY', raising=False)
+
+        from app import create_app
+
+        app = create_app('testing')
+        app.config.update(TESTING=True, WTF_CSRF_ENABLED=False)
+        yield app
+
+
+@pytest.fixture
+def app_context(app):
+    from models import db
+
+    with app.app_context():
+        yield
+        db.session.rollback()
+
+
+@pytest.fixture
+def student(app_context):
+    """A fresh student, so rows created by one test never collide with another's."""
+    from models import Student, db
+
+    student = Student(name='Test Student', email=f'{uuid.uuid4().hex}@example.com')
+    db.session.add(student)
+    db.session.commit()
+    return student
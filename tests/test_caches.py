@@ -0,0 +1,82 @@
+"""
+Eviction of the in-process caches.
+"""
+
+from course_catalog import Catalog
+from quiz_cache import LRUCache
+from search_cache import SearchCache, TTLLRUCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(max_entries=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert len(cache) == 2
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_lru_set_refreshes_existing_key():
+    cache = LRUCache(max_entries=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.set('a', 10)
+    cache.set('c', 3)
+    assert cache.get('a') == 10
+    assert cache.get('b') is None
+
+
+def test_ttl_cache_expires_entries():
+    clock = FakeClock()
+    cache = TTLLRUCache(max_entries=4, ttl=30, clock=clock)
+    cache.set('a', 1)
+
+    clock.now += 29
+    assert cache.get('a') == 1
+    clock.now += 1
+    assert cache.get('a') is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_still_evicts_by_size():
+    cache = TTLLRUCache(max_entries=1, ttl=30, clock=FakeClock())
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') is None
+    assert cache.get('b') == 2
+
+
+def test_search_cache_hits_and_etags():
+    catalog = Catalog({'categories': []})
+    cache = SearchCache(max_entries=4, ttl=30, build='build-1')
+    key = SearchCache.key('  Python   DATA ', {'level': ['beginner']}, catalog, catalog)
+    assert key == SearchCache.key('python data', {'level': ['beginner', 'beginner']}, catalog, catalog)
+
+    calls = []
+    def search():
+        calls.append(1)
+        return ['result']
+    assert cache.get_or_search(key, search) == ['result']
+    assert cache.get_or_search(key, search) == ['result']
+    assert len(calls) == 1
+    assert cache.stats() == {'entries': 1, 'hits': 1, 'misses': 1}
+
+    etag = cache.etag(key, 'user-1')
+    assert etag == cache.etag(key, 'user-1')
+    assert etag != cache.etag(key, 'user-2')
+    assert etag != SearchCache(build='build-2').etag(key, 'user-1')
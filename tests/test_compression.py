@@ -0,0 +1,45 @@
+"""
+Codec headers of ``compression``.
+"""
+
+import pytest
+
+from compression import (CODEC_RAW, CODEC_ZLIB, CODEC_ZSTD, MIN_COMPRESS_SIZE, compress_text, decompress_text,
+                         stored_codec)
+
+LONG_TEXT = 'Experienced Python developer with SQL, Docker and Kubernetes. ' * 20
+
+
+@pytest.mark.parametrize('codec', [CODEC_RAW, CODEC_ZLIB])
+def test_round_trip(codec):
+    stored = compress_text(LONG_TEXT, codec)
+    assert stored[0] == codec
+    assert stored_codec(stored) == codec
+    assert decompress_text(stored) == LONG_TEXT
+    assert decompress_text(memoryview(stored)) == LONG_TEXT
+
+
+def test_zlib_shrinks_long_text():
+    assert len(compress_text(LONG_TEXT, CODEC_ZLIB)) < len(LONG_TEXT.encode('utf-8')) // 2
+
+
+def test_zstd_round_trip():
+    pytest.importorskip('zstandard')
+    stored = compress_text(LONG_TEXT, CODEC_ZSTD)
+    assert stored_codec(stored) == CODEC_ZSTD
+    assert decompress_text(stored) == LONG_TEXT
+
+
+def test_short_values_are_stored_raw():
+    text = 'é' * ((MIN_COMPRESS_SIZE - 1) // 2)
+    stored = compress_text(text, CODEC_ZLIB)
+    assert stored == bytes([CODEC_RAW]) + text.encode('utf-8')
+    assert decompress_text(stored) == text
+
+
+def test_legacy_values_pass_through():
+    assert stored_codec('plain text') is None
+    assert decompress_text('plain text') == 'plain text'
+    assert stored_codec(b'plain text') is None
+    assert decompress_text(b'plain text') == 'plain text'
+    assert decompress_text(compress_text('')) == ''
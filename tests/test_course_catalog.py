@@ -0,0 +1,75 @@
+"""
+Facet bitsets of ``course_catalog.Catalog``.
+"""
+
+import pytest
+
+from course_catalog import FACETS, Catalog, bits_from_positions, duration_bucket, iter_bits
+
+DATA = {'categories': [
+    {'name': 'Programming', 'courses': [
+        {'name': 'Python Basics', 'level': 'Beginner', 'duration': '4 weeks', 'skills': ['Python', 'Git']},
+        {'name': 'Go Services', 'level': 'Intermediate', 'duration': '6 weeks', 'skills': ['Go', 'Docker']},
+        {'name': 'Advanced Python', 'level': 'Advanced', 'duration': '3 months', 'skills': ['Python']},
+    ]},
+    {'name': 'Data', 'courses': [
+        {'name': 'SQL Essentials', 'level': 'Beginner', 'duration': '2 weeks', 'skills': ['SQL']},
+        {'name': 'Data Pipelines', 'level': 'Intermediate to Advanced', 'duration': '10 weeks',
+         'skills': ['Python', 'SQL', 'Docker']},
+    ]},
+]}
+
+
+@pytest.fixture(scope='module')
+def catalog():
+    return Catalog(DATA)
+
+
+def names(catalog, bits):
+    return {catalog.records[position].name for position in iter_bits(bits)}
+
+
+def test_bits_round_trip():
+    positions = [0, 3, 8, 64, 65]
+    bits = bits_from_positions(positions, 70)
+    assert bits == sum(1 << position for position in positions)
+    assert list(iter_bits(bits)) == positions
+    assert list(iter_bits(0)) == []
+
+
+@pytest.mark.parametrize('duration, bucket', [
+    ('4 weeks', 'Up to 4 weeks'), ('6 weeks', '5-8 weeks'), ('3 months', 'Over 12 weeks'), ('self-paced', None),
+])
+def test_duration_bucket(duration, bucket):
+    assert duration_bucket(duration) == bucket
+
+
+def test_filter_bits_or_within_and_across_facets(catalog):
+    assert names(catalog, catalog.filter_bits({})) == {record.name for record in catalog.records}
+    assert names(catalog, catalog.filter_bits({'skill': ['SQL', 'Go']})) == {
+        'Go Services', 'SQL Essentials', 'Data Pipelines'}
+    assert names(catalog, catalog.filter_bits({'skill': ['Python'], 'category': ['Data']})) == {'Data Pipelines'}
+    assert catalog.filter_bits({'skill': ['Cobol']}) == 0
+    assert catalog.filter_bits({'skill': ['SQL']}, skip='skill') == catalog.all_bits
+
+
+def test_facet_counts_match_a_scan_of_the_records(catalog):
+    filters = {'category': ['Programming'], 'level': ['beginner', 'advanced']}
+    query_bits = catalog.all_bits & ~(1 << 1)
+    counts = catalog.facet_counts(query_bits, filters)
+
+    assert set(counts) == set(FACETS)
+    for facet in FACETS:
+        base = query_bits & catalog.filter_bits(filters, skip=facet)
+        for value, count in counts[facet]:
+            assert count == len(names(catalog, base & catalog.facets[facet][value]))
+
+    assert dict(counts['category']) == {'Programming': 2, 'Data': 2}
+    assert dict(counts['skill'])['Python'] == 2
+    assert counts['skill'][0] == ('Python', 2)
+
+
+def test_facet_counts_keep_selected_values_with_no_hits(catalog):
+    counts = catalog.facet_counts(0, {'category': ['Data']})
+    assert counts['category'] == [('Data', 0)]
+    assert counts['skill'] == []
@@ -0,0 +1,58 @@
+"""
+Merging worker snapshots in ``metrics``.
+"""
+
+import os
+
+import pytest
+
+import metrics
+from metrics import DEAD_WORKERS_FILE, MultiprocessStore, Registry, merge
+
+
+def worker(requests, seconds):
+    registry = Registry()
+    counter = registry.counter('requests_total', 'Requests.', ['route'])
+    histogram = registry.histogram('latency_seconds', 'Latency.', buckets=(0.1, 1.0))
+    for route, amount in requests.items():
+        counter.inc(amount, route=route)
+    for value in seconds:
+        histogram.observe(value)
+    return registry
+
+
+def series(snapshot, name):
+    return {tuple(key): value for key, value in snapshot[name]['series']}
+
+
+def test_merge_sums_counters_and_histograms():
+    first = worker({'index': 2, 'search': 1}, [0.05, 0.5])
+    second = worker({'index': 3}, [2.0])
+    merged = merge([first.snapshot(), second.snapshot()])
+
+    assert series(merged, 'requests_total') == {('index',): 5, ('search',): 1}
+    assert series(merged, 'latency_seconds') == {(): [1, 1, 1, pytest.approx(2.55)]}
+    assert merged['latency_seconds']['buckets'] == [0.1, 1.0]
+    assert merged['requests_total']['kind'] == 'counter'
+
+
+def test_merge_of_nothing():
+    assert merge([]) == {}
+
+
+def test_collect_folds_dead_workers(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, '_pid_alive', lambda pid: pid == os.getpid())
+    for pid, requests in ((101, 2), (102, 3)):
+        metrics._write_snapshot(str(tmp_path / f'metrics-{pid}-0123456789ab.json'),
+                                worker({'index': requests}, []).snapshot())
+    # Worker files written before the per-process suffix
+    metrics._write_snapshot(str(tmp_path / 'metrics-103.json'), worker({'index': 4}, []).snapshot())
+
+    store = MultiprocessStore(str(tmp_path), worker({'index': 1}, []))
+    assert series(store.collect(), 'requests_total') == {('index',): 10}
+    assert sorted(os.listdir(tmp_path)) == sorted(['.metrics.lock', DEAD_WORKERS_FILE, os.path.basename(store.path)])
+
+    # A worker that reuses an exited worker's pid writes its own file
+    metrics._write_snapshot(str(tmp_path / 'metrics-101-ba9876543210.json'), worker({'index': 5}, []).snapshot())
+    assert series(store.collect(), 'requests_total') == {('index',): 15}
+    assert store.fold_dead_workers() == 0
@@ -0,0 +1,48 @@
+"""
+Cursor tokens of ``pagination`` and page-size clamping.
+"""
+
+import base64
+from datetime import datetime
+
+import pytest
+
+from pagination import MAX_PAGE_SIZE, InvalidCursor, decode_cursor, encode_cursor, parse_page_size
+
+
+def test_cursor_round_trip():
+    timestamp = datetime(2024, 5, 17, 9, 30, 12, 345678)
+    token = encode_cursor(timestamp, 42)
+    assert '=' not in token
+    assert decode_cursor(token) == (timestamp, 42)
+
+
+def test_cursor_rejects_null_timestamp():
+    with pytest.raises(ValueError):
+        encode_cursor(None, 1)
+
+
+def _token(payload):
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+@pytest.mark.parametrize('token', [
+    '',
+    'not-a-cursor!',
+    encode_cursor(datetime(2024, 1, 1), 7)[:-3],
+    _token('["2024-01-01T00:00:00", 7, 8]'),
+    _token('[null, 7]'),
+    _token('["yesterday", 7]'),
+    _token('["2024-01-01T00:00:00", "seven"]'),
+    _token('{"a": 1, "b": 2}'),
+])
+def test_tampered_cursor_is_rejected(token):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(token)
+
+
+@pytest.mark.parametrize('value, expected', [
+    (None, 20), ('abc', 20), ('0', 1), ('-5', 1), ('7', 7), (str(MAX_PAGE_SIZE + 1), MAX_PAGE_SIZE),
+])
+def test_parse_page_size(value, expected):
+    assert parse_page_size(value) == expected
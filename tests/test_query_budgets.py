@@ -0,0 +1,106 @@
+"""
+Statement budgets of the logged-in pages.
+
+The app runs with ``TESTING`` on, so ``query_monitor`` raises
+``QueryBudgetExceeded`` when a route runs more statements than
+``DEFAULT_QUERY_BUDGETS`` allows. Every page is requested for a user with
+several courses and quiz attempts, where an N+1 query would show.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from werkzeug.security import generate_password_hash
+
+COURSES = 6
+QUIZZES_PER_COURSE = 2
+ATTEMPTS_PER_QUIZ = 3
+PASSWORD = 'budget-password'
+
+
+@pytest.fixture(scope='module')
+def course_ids(app):
+    with app.app_context():
+        return seed()
+
+
+def seed():
+    from models import CourseDetail, CourseQuiz, CourseQuizAttempt, Student, UserCourse, UserProfile, db
+
+    student = Student(name='Budget User', email='budget@example.com', username='budget',
+                      password_hash=generate_password_hash(PASSWORD))
+    db.session.add(student)
+    db.session.flush()
+
+    started = datetime.utcnow() - timedelta(days=30)
+    for c in range(COURSES):
+        course = UserCourse(user_id=student.id, category='Programming', course_name=f'Budget Course {c}',
+                            status='in_progress', created_at=started + timedelta(days=c))
+        db.session.add(course)
+        db.session.flush()
+        db.session.add(CourseDetail(user_course_id=course.id, description=f'Course {c}',
+                                    materials={'materials': [{'title': f'Lesson {c}'}]}))
+        for q in range(QUIZZES_PER_COURSE):
+            quiz = CourseQuiz(user_course_id=course.id, quiz_api_id=c * 100 + q,
+                              quiz_title=f'Quiz {c}.{q}', questions_count=5)
+            db.session.add(quiz)
+            db.session.flush()
+            for a in range(ATTEMPTS_PER_QUIZ):
+                db.session.add(CourseQuizAttempt(
+                    user_id=student.id, course_quiz_id=quiz.id, attempt_api_id=(c * 100 + q) * 10 + a,
+                    score=40 + 10 * a, total_questions=5, correct_answers=2 + a,
+                    feedback_strengths='Loops', feedback_improvements='Recursion',
+                    completed_at=started + timedelta(days=c, hours=q, minutes=a)
+                ))
+    db.session.add(UserProfile(user_id=student.id, cv_text='Python developer', skills='Python, SQL'))
+    db.session.commit()
+    return [course.id for course in UserCourse.query.filter_by(user_id=student.id).order_by(UserCourse.id)]
+
+
+@pytest.fixture
+def client(app, course_ids):
+    client = app.test_client()
+    response = client.post('/login', data={'email': 'budget@example.com', 'password': PASSWORD})
+    assert response.status_code == 302
+    return client
+
+
+@pytest.fixture
+def course_id(course_ids):
+    return course_ids[-1]
+
+
+def test_my_courses(client):
+    assert client.get('/my-courses').status_code == 200
+    assert client.get('/my-courses?limit=2').status_code == 200
+
+
+def test_course_detail(client, course_id):
+    response = client.get(f'/course/{course_id}')
+    assert response.status_code == 200
+    assert b'Quiz' in response.data
+
+
+def test_quiz_attempts(client, course_id):
+    response = client.get(f'/course/{course_id}/quiz-attempts?limit=4')
+    assert response.status_code == 200
+    page = response.get_json()
+    assert len(page['attempts']) == 4
+    assert page['next_cursor']
+
+    response = client.get(f"/course/{course_id}/quiz-attempts?limit=4&cursor={page['next_cursor']}")
+    assert response.status_code == 200
+    assert len(response.get_json()['attempts']) == QUIZZES_PER_COURSE * ATTEMPTS_PER_QUIZ - 4
+
+
+def test_course_dashboard(client, course_id):
+    response = client.get(f'/course/{course_id}/dashboard')
+    assert response.status_code == 200
+    dashboard = response.get_json()
+    assert dashboard['attempts']
+    assert dashboard['recommendations'] is not None
+
+
+@pytest.mark.parametrize('path', ['/profile', '/skillstown-profile'])
+def test_profile(client, path):
+    assert client.get(path).status_code == 200
@@ -0,0 +1,39 @@
+"""
+Top-k lookups of the ``suggest`` prefix trie.
+"""
+
+from suggest import SuggestIndex, Suggestion
+
+
+def texts(suggestions):
+    return [suggestion.text for suggestion in suggestions]
+
+
+def index(top_k=3):
+    return SuggestIndex([
+        Suggestion('Python Basics', 'course', 'Programming', popularity=5),
+        Suggestion('Python', 'skill', popularity=9),
+        Suggestion('PyTorch for Vision', 'course', 'Data', popularity=2),
+        Suggestion('Data Pipelines with Python', 'course', 'Data', popularity=5),
+        Suggestion('Machine Learning Fundamentals', 'course', 'Data', popularity=1),
+        Suggestion('Pandas', 'skill', popularity=5),
+    ], top_k=top_k)
+
+
+def test_top_k_ranked_by_popularity_then_text():
+    assert texts(index().lookup('py')) == ['Python', 'Data Pipelines with Python', 'Python Basics']
+    assert texts(index(top_k=8).lookup('p')) == [
+        'Python', 'Data Pipelines with Python', 'Pandas', 'Python Basics', 'PyTorch for Vision']
+
+
+def test_every_word_start_is_indexed():
+    assert texts(index().lookup('learn')) == ['Machine Learning Fundamentals']
+    assert texts(index().lookup('  PIPELINES  with')) == ['Data Pipelines with Python']
+    assert index().lookup('earn') == []
+
+
+def test_limit_and_empty_prefix():
+    assert texts(index().lookup('py', limit=1)) == ['Python']
+    assert index().lookup('') == []
+    assert index().lookup('   ') == []
+    assert index().lookup('rust') == []
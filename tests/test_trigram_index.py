@@ -0,0 +1,45 @@
+"""
+Typo correction with ``trigram_index``.
+"""
+
+import pytest
+
+from trigram_index import TrigramIndex, edit_distance, trigrams
+
+
+def test_trigrams_are_padded():
+    assert trigrams('go') == {'  g', ' go', 'go '}
+
+
+@pytest.mark.parametrize('a, b, distance', [
+    ('python', 'python', 0),
+    ('pyhton', 'python', 1),
+    ('pythn', 'python', 1),
+    ('pithon', 'python', 1),
+    ('ca', 'abc', 3),
+])
+def test_edit_distance(a, b, distance):
+    assert edit_distance(a, b, limit=5) == distance
+
+
+def test_edit_distance_stops_at_limit():
+    assert edit_distance('javascript', 'python', limit=2) == 3
+    assert edit_distance('kubernetes', 'kubernetse', limit=1) == 1
+
+
+@pytest.fixture(scope='module')
+def index():
+    return TrigramIndex(['python', 'pytorch', 'javascript', 'java', 'kubernetes', 'statistics'])
+
+
+def test_corrections(index):
+    assert index.corrections('pyhton') == ['python']
+    assert index.corrections('kuberntes') == ['kubernetes']
+    assert index.corrections('javscript') == ['javascript']
+
+
+def test_no_corrections_for_known_short_or_unrelated_words(index):
+    assert index.corrections('python') == []
+    assert index.corrections('stat') == []
+    assert index.corrections('jvaa') == []
+    assert index.corrections('xylophone') == []
@@ -0,0 +1,87 @@
+"""
+``INSERT ... ON CONFLICT`` helpers of ``models`` on both sides of the conflict.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from models import CourseQuiz, CourseQuizAttempt, QuizGeneration, Student, UserCourse, db
+
+PYTHON = {'category': 'Programming', 'course_name': 'Python Basics'}
+SQL = {'category': 'Data', 'course_name': 'SQL Essentials'}
+
+
+@pytest.fixture
+def course(student):
+    course_id = UserCourse.enroll_many(student.id, [PYTHON])[PYTHON['course_name']]
+    db.session.commit()
+    return db.session.get(UserCourse, course_id)
+
+
+def test_enroll_many_returns_only_new_enrollments(student):
+    created = UserCourse.enroll_many(student.id, [PYTHON, SQL])
+    db.session.commit()
+    assert set(created) == {'Python Basics', 'SQL Essentials'}
+
+    assert UserCourse.enroll_many(student.id, [PYTHON, SQL]) == {}
+    again = UserCourse.enroll_many(student.id, [SQL, {'category': 'Data', 'course_name': 'Statistics'}])
+    db.session.commit()
+    assert list(again) == ['Statistics']
+    assert UserCourse.query.filter_by(user_id=student.id).count() == 3
+
+
+def test_enroll_many_with_no_courses(student):
+    assert UserCourse.enroll_many(student.id, []) == {}
+
+
+def test_record_start_keeps_the_first_row(student, course):
+    quiz = CourseQuiz(user_course_id=course.id, quiz_api_id=1, quiz_title='Python quiz')
+    db.session.add(quiz)
+    db.session.commit()
+
+    attempt_id = CourseQuizAttempt.record_start(student.id, quiz.id, 'attempt-1')
+    db.session.commit()
+    assert attempt_id is not None
+
+    assert CourseQuizAttempt.record_start(student.id, quiz.id, 'attempt-1') is None
+    assert CourseQuizAttempt.record_start(student.id, quiz.id, 'attempt-2') not in (None, attempt_id)
+    db.session.commit()
+    assert CourseQuizAttempt.query.filter_by(course_quiz_id=quiz.id).count() == 2
+
+
+def test_quiz_generation_claim(course):
+    assert QuizGeneration.claim(course.id, 'first', lease=60)
+    db.session.commit()
+    assert not QuizGeneration.claim(course.id, 'second', lease=60)
+    assert QuizGeneration.in_progress(course.id, lease=60)
+
+    # Another token cannot release the claim
+    QuizGeneration.release(course.id, 'second')
+    db.session.commit()
+    assert QuizGeneration.in_progress(course.id, lease=60)
+
+    QuizGeneration.release(course.id, 'first')
+    db.session.commit()
+    assert not QuizGeneration.in_progress(course.id, lease=60)
+    assert QuizGeneration.claim(course.id, 'second', lease=60)
+    db.session.commit()
+
+
+def test_quiz_generation_takes_over_expired_claim(course):
+    assert QuizGeneration.claim(course.id, 'dead-worker', lease=60)
+    db.session.get(QuizGeneration, course.id).started_at = datetime.utcnow() - timedelta(seconds=120)
+    db.session.commit()
+
+    assert not QuizGeneration.in_progress(course.id, lease=60)
+    assert QuizGeneration.claim(course.id, 'live-worker', lease=60)
+    db.session.commit()
+    db.session.expire_all()
+    assert db.session.get(QuizGeneration, course.id).token == 'live-worker'
+
+
+def test_quiz_uuid_is_assigned_once(student):
+    first = student.get_quiz_uuid()
+    db.session.commit()
+    db.session.expire_all()
+    assert db.session.get(Student, student.id).get_quiz_uuid() == first
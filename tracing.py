@@ -0,0 +1,189 @@
+"""
+Lightweight per-request spans for the SkillsTown CV Analyzer application.
+
+Code marks interesting sections with ``span('name')``; while a request is
+being traced the durations are summed per name and returned in a
+``Server-Timing`` header and a structured log line. Database time and
+template rendering are collected automatically.
+
+Tracing is enabled with ``REQUEST_TIMING=true``. When it is off (or outside
+a request, e.g. in background jobs) ``span()`` returns a shared no-op object,
+so instrumented code costs one context variable lookup.
+"""
+
+import contextvars
+import functools
+import json
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+_current = contextvars.ContextVar('request_trace', default=None)
+
+
+class RequestTrace:
+    """
+    Span totals collected while handling one request.
+    """
+
+    __slots__ = ('started', 'spans')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans = {}  # name -> [total_ms, count]
+
+    def add(self, name, duration_ms):
+        """Add one span duration to the totals for ``name``."""
+        entry = self.spans.get(name)
+        if entry is None:
+            self.spans[name] = [duration_ms, 1]
+        else:
+            entry[0] += duration_ms
+            entry[1] += 1
+
+    def total_ms(self):
+        """Milliseconds since the request started."""
+        return (time.perf_counter() - self.started) * 1000
+
+    def server_timing(self):
+        """
+        Format the spans as a ``Server-Timing`` header value.
+
+        Returns:
+            str: e.g. ``db;dur=3.1;desc="4 calls", total;dur=20.5``.
+        """
+        parts = [f'{name};dur={ms:.1f};desc="{count} calls"' if count > 1 else f'{name};dur={ms:.1f}'
+                 for name, (ms, count) in self.spans.items()]
+        parts.append(f'total;dur={self.total_ms():.1f}')
+        return ', '.join(parts)
+
+
+class _Span:
+    __slots__ = ('trace', 'name', 'started')
+
+    def __init__(self, trace, name):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.trace.add(self.name, (time.perf_counter() - self.started) * 1000)
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def span(name):
+    """
+    Time a block as part of the current request.
+
+    Args:
+        name (str): Span name; a token such as ``gemini`` or ``pdf_parse``.
+
+    Returns:
+        A context manager; a no-op when no request is being traced.
+    """
+    trace = _current.get()
+    if trace is None:
+        return _NOOP_SPAN
+    return _Span(trace, name)
+
+
+def traced(name):
+    """Decorator form of ``span``."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def current_trace():
+    """Return the trace of the current request, or None."""
+    return _current.get()
+
+
+def init_app(app):
+    """
+    Trace every request of ``app`` when ``REQUEST_TIMING`` is enabled.
+
+    Args:
+        app (Flask): The application.
+    """
+    enabled = app.config.get('REQUEST_TIMING')
+    if enabled is None:
+        enabled = os.environ.get('REQUEST_TIMING', 'false').lower() == 'true'
+        app.config['REQUEST_TIMING'] = enabled
+    if not enabled:
+        return
+
+    from flask import before_render_template, g, request, template_rendered
+
+    @app.before_request
+    def start_trace():
+        g._trace_token = _current.set(RequestTrace())
+
+    @app.after_request
+    def finish_trace(response):
+        trace = _current.get()
+        if trace is None:
+            return response
+        response.headers['Server-Timing'] = trace.server_timing()
+        logger.info(json.dumps({
+            'event': 'request_timing',
+            'method': request.method,
+            'path': request.path,
+            'endpoint': request.endpoint,
+            'status': response.status_code,
+            'total_ms': round(trace.total_ms(), 2),
+            'spans': {name: {'ms': round(ms, 2), 'count': count} for name, (ms, count) in trace.spans.items()},
+        }))
+        return response
+
+    @app.teardown_request
+    def clear_trace(exc):
+        token = g.pop('_trace_token', None)
+        if token is not None:
+            _current.reset(token)
+
+    def render_started(sender, template, context, **extra):
+        if _current.get() is not None:
+            g._render_started = time.perf_counter()
+
+    def render_finished(sender, template, context, **extra):
+        trace = _current.get()
+        started = g.pop('_render_started', None)
+        if trace is not None and started is not None:
+            trace.add('render', (time.perf_counter() - started) * 1000)
+
+    before_render_template.connect(render_started, app, weak=False)
+    template_rendered.connect(render_finished, app, weak=False)
+
+    # Database time arrives through add_query_time from query_monitor's cursor hook
+    import query_monitor
+    query_monitor.install_statement_hooks()
+
+
+def add_query_time(seconds):
+    """Add one statement's duration to the ``db`` span of the current trace, if any."""
+    trace = _current.get()
+    if trace is not None:
+        trace.add('db', seconds * 1000)
@@ -0,0 +1,134 @@
+"""
+Typo-tolerant term lookup for course search.
+
+A ``TrigramIndex`` maps every padded character trigram of the catalog
+vocabulary to the terms containing it. Looking up a misspelt word ("pyhton",
+"kubernets") only touches the posting lists of its own trigrams. Candidates
+that share enough trigrams are then verified with a bounded edit distance, so
+the cost depends on the word and the vocabulary size, not on the number of
+courses.
+"""
+
+from bisect import bisect_left
+from collections import Counter
+
+# Minimum Jaccard similarity of trigram sets for a term to be verified
+MIN_SIMILARITY = 0.2
+# Shorter words are too ambiguous to correct
+MIN_WORD_LENGTH = 4
+# Corrections returned per word
+MAX_CORRECTIONS = 3
+
+
+def trigrams(word):
+    """Distinct trigrams of ``word``, padded like pg_trgm (two spaces before, one after)."""
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def max_edits(word):
+    """Edits allowed for ``word``: one for short words, two otherwise."""
+    return 1 if len(word) <= 5 else 2
+
+
+def edit_distance(a, b, limit):
+    """
+    Optimal string alignment distance between ``a`` and ``b``, bounded by ``limit``.
+
+    Insertions, deletions, substitutions and adjacent transpositions ("pyhton")
+    each count as one edit. Only a band of ``limit`` cells around the diagonal
+    is filled, and the scan stops as soon as a row exceeds ``limit``.
+
+    Returns:
+        int: The distance, or ``limit + 1`` if it is larger than ``limit``.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    over = limit + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [over] * (len(b) + 1)
+        current[0] = i
+        for j in range(max(1, i - limit), min(len(b), i + limit) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, previous2[j - 2] + 1)
+            current[j] = value
+        if min(current) > limit:
+            return over
+        previous2, previous = previous, current
+    return min(previous[len(b)], over)
+
+
+class TrigramIndex:
+    """
+    Trigram postings over a fixed vocabulary.
+    """
+
+    __slots__ = ('terms', 'term_set', 'term_trigram_counts', 'postings')
+
+    def __init__(self, terms):
+        """
+        Args:
+            terms (iterable): Lower-cased vocabulary terms.
+        """
+        self.terms = tuple(sorted(set(terms)))
+        self.term_set = frozenset(self.terms)
+        self.term_trigram_counts = []
+        postings = {}
+        for term_id, term in enumerate(self.terms):
+            grams = trigrams(term)
+            self.term_trigram_counts.append(len(grams))
+            for gram in grams:
+                postings.setdefault(gram, []).append(term_id)
+        self.postings = {gram: tuple(term_ids) for gram, term_ids in postings.items()}
+
+    def __len__(self):
+        return len(self.terms)
+
+    def __contains__(self, term):
+        return term in self.term_set
+
+    def is_known(self, word):
+        """True if ``word`` is a vocabulary term or the start of one."""
+        if word in self.term_set:
+            return True
+        position = bisect_left(self.terms, word)
+        return position < len(self.terms) and self.terms[position].startswith(word)
+
+    def corrections(self, word, min_similarity=MIN_SIMILARITY, limit=MAX_CORRECTIONS):
+        """
+        Vocabulary terms ``word`` is probably a misspelling of.
+
+        Args:
+            word (str): Lower-cased query word.
+            min_similarity (float): Trigram similarity a candidate needs before
+                its edit distance is checked.
+            limit (int): Maximum number of corrections.
+
+        Returns:
+            list: The terms at the smallest edit distance found, at most
+            ``max_edits(word)``, most similar first. Empty for short words and
+            for words ``is_known`` accepts.
+        """
+        if len(word) < MIN_WORD_LENGTH or self.is_known(word):
+            return []
+        grams = trigrams(word)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self.postings.get(gram, ()))
+
+        allowed = max_edits(word)
+        found = []
+        for term_id, count in shared.items():
+            similarity = count / (len(grams) + self.term_trigram_counts[term_id] - count)
+            if similarity < min_similarity:
+                continue
+            term = self.terms[term_id]
+            distance = edit_distance(word, term, allowed)
+            if distance <= allowed:
+                found.append((distance, -similarity, term))
+        found.sort()
+        return [term for distance, _, term in found[:limit] if distance == found[0][0]]